@@ -0,0 +1,42 @@
+"""add_retrain_queue_pending_unique_index
+
+Revision ID: 0a509eaa4cd2
+Revises: 44e53c819552
+Create Date: 2026-10-18 10:41:52.917306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a509eaa4cd2'
+down_revision = '44e53c819552'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Allow at most one pending retrain queue entry per card"""
+
+    # Remove duplicate pending entries (keep the oldest) so the index can be built
+    op.execute("""
+        DELETE FROM retrain_queue rq
+        USING retrain_queue older
+        WHERE rq.card_id = older.card_id
+          AND rq.processed_at IS NULL
+          AND older.processed_at IS NULL
+          AND rq.id > older.id
+    """)
+
+    # Partial unique index used as the ON CONFLICT arbiter when queueing cards
+    # Supports queries: INSERT ... ON CONFLICT DO NOTHING (trigger_retraining)
+    op.create_index('ux_retrain_pending_card', 'retrain_queue', ['card_id'],
+                    unique=True,
+                    postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Remove pending unique index"""
+
+    op.drop_index('ux_retrain_pending_card', table_name='retrain_queue')
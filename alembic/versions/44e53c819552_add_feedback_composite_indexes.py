@@ -0,0 +1,39 @@
+"""add_feedback_composite_indexes
+
+Revision ID: 44e53c819552
+Revises: dec66259fe1c
+Create Date: 2026-10-18 10:03:17.284561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '44e53c819552'
+down_revision = 'dec66259fe1c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add composite indexes for filtered, recent-first feedback queries"""
+
+    # Composite index for per-user feedback windows and listing
+    # Supports queries: WHERE user_id=X AND created_at >= Y ORDER BY created_at DESC
+    op.create_index('idx_feedback_user_created', 'feedbacks', ['user_id', 'created_at'],
+                    postgresql_ops={'created_at': 'DESC'})
+
+    # Composite index for negative feedback lookup and rating filters
+    # Supports queries: WHERE rating <= 2 ORDER BY created_at DESC LIMIT N
+    op.create_index('idx_feedback_rating_created', 'feedbacks', ['rating', 'created_at'],
+                    postgresql_ops={'created_at': 'DESC'})
+
+    # created_at alone is already covered by idx_feedback_created
+
+
+def downgrade() -> None:
+    """Remove feedback composite indexes"""
+
+    op.drop_index('idx_feedback_rating_created', table_name='feedbacks')
+    op.drop_index('idx_feedback_user_created', table_name='feedbacks')
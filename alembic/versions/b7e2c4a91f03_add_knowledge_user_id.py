@@ -0,0 +1,38 @@
+"""add_knowledge_user_id
+
+Revision ID: b7e2c4a91f03
+Revises: 0a509eaa4cd2
+Create Date: 2026-10-18 14:22:09.418735
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c4a91f03'
+down_revision = '0a509eaa4cd2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add knowledge ownership and a per-user title lookup index"""
+
+    # Owner of the knowledge entry (queries filter by user_id)
+    op.add_column('knowledge', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_knowledge_user_id', 'knowledge', 'users', ['user_id'], ['id'])
+
+    # Composite index for per-user, per-book listing, newest first
+    # Supports queries: WHERE user_id=X AND book_title=Y ORDER BY created_at DESC LIMIT N
+    op.create_index('ix_knowledge_user_title_created', 'knowledge',
+                    ['user_id', 'book_title', 'created_at'],
+                    postgresql_ops={'created_at': 'DESC'})
+
+
+def downgrade() -> None:
+    """Remove knowledge ownership"""
+
+    op.drop_index('ix_knowledge_user_title_created', table_name='knowledge')
+    op.drop_constraint('fk_knowledge_user_id', 'knowledge', type_='foreignkey')
+    op.drop_column('knowledge', 'user_id')
@@ -0,0 +1,36 @@
+"""add_biz_card_content_trigram_index
+
+Revision ID: dec66259fe1c
+Revises: 173e95521004
+Create Date: 2026-10-18 09:12:41.503918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dec66259fe1c'
+down_revision = '173e95521004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add trigram index for substring search on biz_cards.content"""
+
+    # pg_trgm provides the gin_trgm_ops operator class
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # GIN trigram index for contains-matching on card content
+    # Supports queries: WHERE content ILIKE '%...%' (feedback -> retrain queue lookup)
+    op.create_index('idx_biz_card_content_trgm', 'biz_cards', ['content'],
+                    postgresql_using='gin',
+                    postgresql_ops={'content': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Remove trigram index"""
+
+    # The extension is left installed; other objects may depend on it
+    op.drop_index('idx_biz_card_content_trgm', table_name='biz_cards')
@@ -21,6 +21,7 @@ from app.schemas.feedback import (
     RetrainingTriggerResponse,
     FeedbackListRequest,
     FeedbackListResponse,
+    FeedbackCountResponse,
     LearningInsightsResponse,
     FeedbackErrorResponse
 )
@@ -161,6 +162,7 @@ async def list_feedbacks(
     rating: Optional[int] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user_or_default),
     service: FeedbackService = Depends(get_service)
 ):
@@ -171,6 +173,7 @@ async def list_feedbacks(
     - Filtering by user ID
     - Filtering by rating
     - Pagination with limit/offset
+    - Keyset pagination with cursor (pass next_cursor from the previous page)
 
     Useful for:
     - Reviewing user feedback
@@ -180,20 +183,27 @@ async def list_feedbacks(
     try:
         logger.info(
             f"Listing feedbacks: user_id={current_user.id}, rating={rating}, "
-            f"limit={limit}, offset={offset}"
+            f"limit={limit}, offset={offset}, cursor={cursor}"
         )
 
         result = service.list_feedbacks(
             user_id=current_user.id,
             rating=rating,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
 
         logger.info(f"Listed {result['count']}/{result['total']} feedbacks")
 
         return FeedbackListResponse(**result)
 
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to list feedbacks: {e}", exc_info=True)
         raise HTTPException(
@@ -202,6 +212,36 @@ async def list_feedbacks(
         )
 
 
+@router.get(
+    "/count",
+    response_model=FeedbackCountResponse,
+    summary="Count feedbacks",
+    description="Total feedback count for the list filters (cached briefly)"
+)
+async def count_feedbacks(
+    rating: Optional[int] = None,
+    current_user: User = Depends(get_current_user_or_default),
+    service: FeedbackService = Depends(get_service)
+):
+    """
+    Count feedbacks
+
+    Returns the total for cursor-paginated listings, which only
+    include it on the first page.
+    """
+    try:
+        total = service.count_feedbacks(user_id=current_user.id, rating=rating)
+
+        return FeedbackCountResponse(total=total)
+
+    except Exception as e:
+        logger.error(f"Failed to count feedbacks: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to count feedbacks: {str(e)}"
+        )
+
+
 # ========================================
 # Trigger Retraining
 # ========================================
@@ -99,7 +99,7 @@ async def extract_knowledge(
     # ナレッジ抽出
     try:
         service = KnowledgeService()
-        result = service.extract_knowledge(
+        result = await service.aextract_knowledge(
             text=text,
             book_title=book_title,
             language=request.language,
@@ -422,7 +422,7 @@ async def extract_entities(
         start_time = time.time()
 
         service = KnowledgeService()
-        entities = service.extract_entities(
+        entities = await service.aextract_entities(
             text=text,
             language=request.language,
             entity_types=request.entity_types,
@@ -506,7 +506,7 @@ async def extract_relationships(
     else:
         # エンティティを先に抽出
         service = KnowledgeService()
-        entities = service.extract_entities(
+        entities = await service.aextract_entities(
             text=text,
             language=request.language,
             min_confidence=request.min_confidence
@@ -524,7 +524,7 @@ async def extract_relationships(
         start_time = time.time()
 
         service = KnowledgeService()
-        relationships = service.extract_relationships(
+        relationships = await service.aextract_relationships(
             text=text,
             entities=entities,
             language=request.language,
@@ -604,13 +604,13 @@ async def build_knowledge_graph(
         if request.entities:
             entities = request.entities
         else:
-            entities = service.extract_entities(
+            entities = await service.aextract_entities(
                 text=text,
                 language=request.language,
                 min_confidence=request.min_confidence
             )
 
-        relationships = service.extract_relationships(
+        relationships = await service.aextract_relationships(
             text=text,
             entities=entities,
             language=request.language,
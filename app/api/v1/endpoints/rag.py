@@ -5,7 +5,9 @@ RAG（Retrieval Augmented Generation）機能のエンドポイント
 + Rate Limiting (Phase 1-8)
 """
 import logging
+import re
 import time
+from bisect import bisect_right
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
 from sqlalchemy.orm import Session
@@ -34,6 +36,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
+# チャンク境界の調整に使う空白
+_SPACE_RE = re.compile(" ")
+
 
 # ==================== RAG Query ====================
 
@@ -445,22 +450,24 @@ def _chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str
     if not text:
         return []
 
+    # 空白位置を一度だけ求め、各チャンクでは二分探索で最後の空白を探す
+    spaces = [m.start() for m in _SPACE_RE.finditer(text)]
+
     chunks = []
     start = 0
 
     while start < len(text):
         end = start + chunk_size
-        chunk = text[start:end]
 
         # 空白で区切られた完全な単語にする（可能な場合）
         if end < len(text):
-            last_space = chunk.rfind(" ")
-            if last_space > chunk_size // 2:  # チャンクの半分以上なら調整
-                chunk = chunk[:last_space]
-                end = start + last_space
+            idx = bisect_right(spaces, end - 1) - 1
+            if idx >= 0 and spaces[idx] - start > chunk_size // 2:  # チャンクの半分以上なら調整
+                end = spaces[idx]
 
-        chunks.append(chunk.strip())
-        start = end - overlap
+        chunks.append(text[start:end].strip())
+        # チャンクがオーバーラップより短いと先に進まないため、その場合は重ねない
+        start = end - overlap if end - overlap > start else end
 
     logger.debug(f"Text chunked: {len(chunks)} chunks, avg size: {len(text) / len(chunks):.0f}")
 
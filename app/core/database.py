@@ -32,6 +32,9 @@ engine = create_engine(
     pool_recycle=3600,               # 接続再利用時間（1時間）
     pool_pre_ping=True,              # 接続前にPing（切断検出）
 
+    # 一括INSERT設定（executemanyを1文あたり500行に分割）
+    insertmanyvalues_page_size=500,
+
     # その他のオプション
     echo=False,                      # SQLログ出力（本番はFalse）
     future=True,                     # SQLAlchemy 2.0スタイル
@@ -3,7 +3,7 @@ Knowledge Model
 
 ナレッジベースを管理するモデル
 """
-from sqlalchemy import String, Float, Text, LargeBinary, DateTime, func, Index
+from sqlalchemy import String, Float, Text, LargeBinary, DateTime, ForeignKey, func, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from app.models.base import Base, SerializeMixin
@@ -15,6 +15,7 @@ class Knowledge(Base, SerializeMixin):
     __tablename__ = "knowledge"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     book_title: Mapped[str] = mapped_column(String(255), nullable=False)
     format: Mapped[str] = mapped_column(String(10), nullable=False)
     score: Mapped[float | None] = mapped_column(Float)
@@ -3,7 +3,7 @@ Retrain Queue Model
 
 再学習キューを管理するモデル
 """
-from sqlalchemy import Float, DateTime, ForeignKey, func, Index
+from sqlalchemy import Float, DateTime, ForeignKey, func, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 from datetime import datetime
@@ -34,6 +34,7 @@ class RetrainQueue(Base, SerializeMixin):
         Index("idx_retrain_queued", "queued_at"),
         Index("idx_retrain_processed", "processed_at"),
         Index("idx_retrain_pending", "processed_at", postgresql_where=mapped_column("processed_at").is_(None)),
+        Index("ux_retrain_pending_card", "card_id", unique=True, postgresql_where=text("processed_at IS NULL")),
     )
 
     def __repr__(self) -> str:
@@ -118,17 +118,33 @@ class FeedbackListRequest(BaseModel):
     rating: Optional[int] = Field(default=None, ge=1, le=5, description="Filter by rating")
     limit: int = Field(default=100, ge=1, le=1000, description="Max results")
     offset: int = Field(default=0, ge=0, description="Pagination offset")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Keyset cursor (next_cursor of the previous page)"
+    )
 
 
 class FeedbackListResponse(BaseModel):
     """Response for feedback list"""
-    total: int = Field(..., description="Total feedback count")
+    total: Optional[int] = Field(
+        default=None,
+        description="Total feedback count (first page only; see /count)"
+    )
     count: int = Field(..., description="Returned feedback count")
     limit: int = Field(..., description="Limit parameter")
     offset: int = Field(..., description="Offset parameter")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page (None if no more results)"
+    )
     feedbacks: List[FeedbackItem] = Field(..., description="Feedback list")
 
 
+class FeedbackCountResponse(BaseModel):
+    """Response for feedback count"""
+    total: int = Field(..., description="Total feedback count")
+
+
 # ========================================
 # Learning Insights
 # ========================================
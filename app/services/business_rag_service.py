@@ -6,6 +6,8 @@ Supports PDF, DOCX, TXT files with automatic text extraction and chunking
 """
 import logging
 import os
+import re
+from bisect import bisect_right
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import io
@@ -20,6 +22,12 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sentence delimiters in priority order (first match wins when chunking)
+_CHUNK_DELIMITERS = ["。", ".", "！", "!", "？", "?", "\n\n"]
+
+# Lookahead so overlapping occurrences (e.g. "\n\n\n") are all found, like str.rfind
+_CHUNK_DELIMITER_RES = [(d, re.compile(f"(?={re.escape(d)})")) for d in _CHUNK_DELIMITERS]
+
 
 class BusinessRAGService:
     """Business RAG Service for document management and querying"""
@@ -279,6 +287,12 @@ class BusinessRAGService:
         if not text or len(text) <= self.chunk_size:
             return [text]
 
+        # Index every delimiter position once instead of rfind-scanning each window
+        delimiter_positions = [
+            (len(delim), [m.start() for m in pattern.finditer(text)])
+            for delim, pattern in _CHUNK_DELIMITER_RES
+        ]
+
         chunks = []
         start = 0
 
@@ -287,19 +301,22 @@ class BusinessRAGService:
 
             # Try to break at sentence boundary
             if end < len(text):
-                # Look for sentence endings
-                for delim in ["。", ".", "！", "!", "？", "?", "\n\n"]:
-                    last_delim = text.rfind(delim, start, end)
-                    if last_delim > start:
-                        end = last_delim + 1
+                # Last occurrence of each delimiter fully inside [start, end)
+                for delim_len, positions in delimiter_positions:
+                    idx = bisect_right(positions, end - delim_len) - 1
+                    if idx >= 0 and positions[idx] > start:
+                        end = positions[idx] + 1
                         break
 
             chunk = text[start:end].strip()
             if chunk:
                 chunks.append(chunk)
 
-            # Move to next chunk with overlap
-            start = end - self.chunk_overlap if end < len(text) else end
+            # Move to next chunk with overlap (none if the chunk is too short to advance past it)
+            if end < len(text) and end - self.chunk_overlap > start:
+                start = end - self.chunk_overlap
+            else:
+                start = end
 
         return chunks
 
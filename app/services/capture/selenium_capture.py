@@ -537,7 +537,8 @@ class SeleniumKindleCapture:
     def capture_all_pages(
         self,
         progress_callback: Optional[Callable[[int, int], None]] = None,
-        stop_check: Optional[Callable[[], bool]] = None
+        stop_check: Optional[Callable[[], bool]] = None,
+        page_callback: Optional[Callable[[Path], None]] = None
     ) -> SeleniumCaptureResult:
         """
         Kindle Cloud Readerで全ページキャプチャ
@@ -545,6 +546,8 @@ class SeleniumKindleCapture:
         Args:
             progress_callback: 進捗コールバック (current_page, total_pages)
             stop_check: 停止チェック関数 (True返却で中断)
+            page_callback: ページ画像保存直後のコールバック (image_path)
+                           キャプチャと並行してOCRを進める場合に使用
 
         Returns:
             SeleniumCaptureResult
@@ -618,6 +621,8 @@ class SeleniumKindleCapture:
                 screenshot_path = self.output_dir / f"page_{page:04d}.png"
                 self.driver.save_screenshot(str(screenshot_path))
                 image_paths.append(screenshot_path)
+                if page_callback:
+                    page_callback(screenshot_path)
 
                 # FIX: Calculate page hash for duplicate detection
                 # REASON: Detect if the same page is being captured repeatedly
@@ -5,13 +5,21 @@ Capture Service
 Phase 1-4 Implementation
 """
 import logging
+import queue
+import re
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Iterator, Optional, Callable
 from datetime import datetime
+import cv2
+import numpy as np
 import pytesseract
 from PIL import Image
 import io
+from sqlalchemy import delete, insert, update
 
 from app.core.database import SessionLocal
 from app.models import Job, OCRResult
@@ -19,6 +27,26 @@ from app.services.capture import SeleniumKindleCapture, SeleniumCaptureConfig
 
 logger = logging.getLogger(__name__)
 
+# テキストクリーニング用の正規表現（モジュール読み込み時に1回だけコンパイル）
+# 「Page X」/「ページ X」形式のページ番号、または4桁以下の数字のみの行にfullmatch
+_RE_PAGE_NUMBER_LINE = re.compile(r'(?i:page)\s+\d+|ページ\s*\d+|\d{1,4}')
+
+# image_blob保存設定: 通常はJPEGに再エンコードしてBLOBサイズを削減し、
+# 信頼度が低いページのみデバッグ用に元のPNGを保持する
+BLOB_JPEG_QUALITY = 85
+BLOB_KEEP_PNG_BELOW_CONFIDENCE = 0.5
+
+# 進捗コミットのデバウンス設定（秒 / %刻み）
+PROGRESS_COMMIT_INTERVAL = 2.0
+PROGRESS_COMMIT_STEP = 5
+
+# OCR中に先読みしておく後続ページ数
+OCR_PREFETCH_DEPTH = 4
+
+# ひらがな・カタカナ(U+3040-30FF)・漢字(U+4E00-9FFF)の変換テーブル
+# line.translate(_CJK_TABLE) != line で「日本語文字を含む」をCレベルの1パスで判定
+_CJK_TABLE = dict.fromkeys([*range(0x3040, 0x3100), *range(0x4E00, 0xA000)])
+
 
 class CaptureService:
     """自動キャプチャサービス"""
@@ -110,82 +138,69 @@ class CaptureService:
             # Seleniumキャプチャ開始
             capturer = SeleniumKindleCapture(config)
 
-            # 進捗コールバック
+            # 進捗コールバック（コミット回数を抑えるためデバウンス）
+            last_commit = {"ts": 0.0, "progress": -1}
+
             def progress_callback(current_page: int, total_pages: int):
                 """進捗更新コールバック"""
                 try:
                     progress = int((current_page / total_pages) * 100)
-                    job.progress = progress
+
+                    # 一定時間経過 or 5%の区切りを跨いだ時 or 最終ページのみ書き込む
+                    elapsed = time.monotonic() - last_commit["ts"]
+                    crossed_step = progress // PROGRESS_COMMIT_STEP != last_commit["progress"] // PROGRESS_COMMIT_STEP
+                    if elapsed < PROGRESS_COMMIT_INTERVAL and not crossed_step and current_page < total_pages:
+                        return
+
+                    # ORMのflushを介さないCore UPDATE
+                    db.execute(
+                        update(Job)
+                        .where(Job.id == job_id)
+                        .values(progress=progress)
+                        .execution_options(synchronize_session=False)
+                    )
                     db.commit()
+                    last_commit["ts"] = time.monotonic()
+                    last_commit["progress"] = progress
                     logger.info(f"📊 進捗更新: {progress}% ({current_page}/{total_pages})")
                 except Exception as e:
                     logger.error(f"❌ 進捗更新エラー: {e}")
 
-            # キャプチャ実行
-            result = capturer.capture_all_pages(progress_callback=progress_callback)
+            # OCRワーカー起動（キャプチャ済みページを順次OCR）
+            page_queue: queue.Queue = queue.Queue()
+            ocr_stats = {"processed": 0, "saved": 0, "errors": []}
+            ocr_thread = threading.Thread(
+                target=CaptureService._run_ocr_worker,
+                args=(job_id, book_title, page_queue, ocr_stats),
+                daemon=True
+            )
+            ocr_thread.start()
+            logger.info("🔍 OCRワーカー開始（キャプチャと並行処理）...")
+
+            # キャプチャ実行（保存されたページは即座にOCRキューへ）
+            try:
+                result = capturer.capture_all_pages(
+                    progress_callback=progress_callback,
+                    page_callback=page_queue.put
+                )
+            finally:
+                # 終端シグナルを送り、残りページのOCR完了を待機
+                page_queue.put(None)
+                ocr_thread.join()
 
             if not result.success:
                 raise Exception(result.error_message or "キャプチャ失敗")
 
             logger.info(f"✅ キャプチャ完了: {result.captured_pages}ページ")
+            logger.info(f"✅ OCR処理完了: {ocr_stats['saved']}/{ocr_stats['processed']}ページ保存")
 
-            # OCR処理
-            logger.info("🔍 OCR処理開始...")
-            ocr_count = 0
-            batch_size = 50  # バッチサイズ（メモリとトランザクションの最適化）
-            total_images = len(result.image_paths)
-
-            for idx, image_path in enumerate(result.image_paths, 1):
-                try:
-                    # ページ番号を抽出 (page_0001.png → 1)
-                    page_num = int(image_path.stem.split("_")[1])
-
-                    # OCR処理
-                    extracted_text, confidence = CaptureService._extract_text_from_image_file(image_path)
-
-                    # 画像データを読み込み
-                    with open(image_path, "rb") as f:
-                        image_data = f.read()
-
-                    # OCRResult保存
-                    ocr_result = OCRResult(
-                        job_id=job_id,
-                        book_title=book_title,
-                        page_num=page_num,
-                        text=extracted_text,
-                        confidence=confidence,
-                        image_blob=image_data
-                    )
-                    db.add(ocr_result)
-                    ocr_count += 1
-
-                    # バッチコミット（メモリとトランザクション管理）
-                    if idx % batch_size == 0:
-                        db.commit()
-                        logger.info(f"📝 OCRバッチ保存: {idx}/{total_images} ({idx/total_images*100:.1f}%) - {ocr_count}件保存")
-
-                except Exception as e:
-                    logger.error(f"❌ OCR処理エラー (ページ {image_path}): {e}", exc_info=True)
-                    # エラー時もコミットを試行（処理済みデータを保存）
-                    try:
-                        db.commit()
-                    except:
-                        db.rollback()
-                    continue
-
-            # 最終コミット（残りのデータ）
-            try:
-                db.commit()
-                logger.info(f"✅ OCR処理完了: {ocr_count}/{total_images}ページ保存")
-            except Exception as e:
-                logger.error(f"❌ 最終コミットエラー: {e}", exc_info=True)
-                # ロールバックしても一部はバッチ保存されている
-                db.rollback()
-
-            # Jobステータス更新: completed
+            # Jobステータス更新: completed（OCR失敗ページがあれば同じコミットで記録）
             job.status = "completed"
             job.progress = 100
             job.completed_at = datetime.utcnow()
+            if ocr_stats["errors"]:
+                job.error_message = CaptureService._summarize_ocr_errors(ocr_stats["errors"])
+                logger.warning(f"⚠️ OCR失敗ページ: {len(ocr_stats['errors'])}件")
             db.commit()
 
             logger.info(f"🎉 キャプチャタスク完了: job_id={job_id}")
@@ -200,6 +215,18 @@ class CaptureService:
 
             # Jobステータス更新: failed
             try:
+                db.rollback()
+
+                # キャプチャと並行して保存済みのOCR結果を削除
+                # （失敗ジョブの途中までのページがナレッジ抽出に使われないように）
+                deleted = db.execute(
+                    delete(OCRResult)
+                    .where(OCRResult.job_id == job_id)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if deleted:
+                    logger.info(f"🗑️ 失敗ジョブの途中OCR結果を削除: {deleted}件")
+
                 job = db.query(Job).filter(Job.id == job_id).first()
                 if job:
                     job.status = "failed"
@@ -223,12 +250,197 @@ class CaptureService:
             db.close()
 
     @staticmethod
-    def _extract_text_from_image_file(image_path: Path) -> tuple[str, float]:
+    def _run_ocr_worker(
+        job_id: str,
+        book_title: str,
+        page_queue: "queue.Queue[Optional[Path]]",
+        stats: dict
+    ) -> None:
+        """
+        OCRワーカー（キャプチャと並行して動作するコンシューマースレッド）
+
+        キューからページ画像パスを取り出してOCRし、バッチ単位でDBへ保存する。
+        Noneを受け取った時点で残りを保存して終了する。
+        DBセッションはスレッド間で共有できないため、専用のセッションを使用する。
+
+        Args:
+            job_id: ジョブID
+            book_title: 書籍タイトル
+            page_queue: ページ画像パスのキュー（None = 終端）
+            stats: 処理件数の集計先 ("processed", "saved", "errors")
+        """
+        db = SessionLocal()
+        batch_size = 50  # バッチサイズ（メモリとトランザクションの最適化）
+        pending_rows: list[dict] = []  # 未保存のOCR結果（バッチ単位で一括INSERT）
+
+        try:
+            for image_path, image_future in CaptureService._iter_prefetched_pages(page_queue):
+                stats["processed"] += 1
+                idx = stats["processed"]
+
+                try:
+                    # ページ番号を抽出 (page_0001.png → 1)
+                    page_num = int(image_path.stem.split("_")[1])
+
+                    # 先読み済みの画像データ（OCRとimage_blobで共用）
+                    image_data = image_future.result()
+
+                    # OCR処理
+                    extracted_text, confidence = CaptureService._extract_text_from_image_file(
+                        image_path, image_data
+                    )
+
+                    # OCRResult保存（ORMを経由せず行データとして蓄積）
+                    pending_rows.append({
+                        "job_id": job_id,
+                        "book_title": book_title,
+                        "page_num": page_num,
+                        "text": extracted_text,
+                        "confidence": confidence,
+                        "image_blob": CaptureService._encode_image_blob(image_data, confidence),
+                    })
+                    stats["saved"] += 1
+
+                    # バッチコミット（メモリとトランザクション管理）
+                    if idx % batch_size == 0:
+                        CaptureService._flush_ocr_rows(db, pending_rows)
+                        db.commit()
+                        logger.info(f"📝 OCRバッチ保存: {idx}ページ処理 - {stats['saved']}件保存")
+
+                except Exception as e:
+                    logger.error(f"❌ OCR処理エラー (ページ {image_path}): {e}", exc_info=True)
+                    # 失敗ページは記録のみ（DB往復はせず、ジョブ完了時にまとめて保存）
+                    db.rollback()
+                    stats["errors"].append((image_path.name, str(e)))
+                    continue
+
+            # 最終コミット（残りのデータ）
+            try:
+                CaptureService._flush_ocr_rows(db, pending_rows)
+                db.commit()
+            except Exception as e:
+                logger.error(f"❌ 最終コミットエラー: {e}", exc_info=True)
+                # ロールバックしても一部はバッチ保存されている
+                db.rollback()
+
+        finally:
+            db.close()
+
+    @staticmethod
+    def _summarize_ocr_errors(errors: list[tuple[str, str]], max_length: int = 500) -> str:
+        """
+        OCR失敗ページの一覧をerror_message用の要約文字列にまとめる
+
+        Args:
+            errors: (画像ファイル名, エラーメッセージ) のリスト
+            max_length: 最大文字数（データベースフィールドサイズ制限対応）
+
+        Returns:
+            str: 要約文字列
+        """
+        details = "; ".join(f"{name}: {message}" for name, message in errors)
+        return f"OCR失敗 {len(errors)}ページ - {details}"[:max_length]
+
+    @staticmethod
+    def _iter_prefetched_pages(
+        page_queue: "queue.Queue[Optional[Path]]"
+    ) -> Iterator[tuple[Path, Future]]:
+        """
+        キューのページ画像をバックグラウンドで先読みしながら順に返す
+
+        現在のページをOCRしている間に、キューに届いている後続ページ
+        （最大OCR_PREFETCH_DEPTH件）のread_bytes()を読み込みスレッドで進めておく。
+
+        Args:
+            page_queue: ページ画像パスのキュー（None = 終端）
+
+        Yields:
+            tuple[Path, Future]: (画像パス, 画像バイト列のFuture)
+        """
+        pending: deque[tuple[Path, Future]] = deque()
+        eof = False
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-prefetch") as prefetcher:
+            while True:
+                # 届いているページを先読み上限まで読み込み開始
+                # （先読み中のページが無い時だけ次のページをブロッキング待機）
+                while not eof and len(pending) < OCR_PREFETCH_DEPTH:
+                    try:
+                        image_path = page_queue.get(block=not pending)
+                    except queue.Empty:
+                        break
+                    if image_path is None:
+                        eof = True
+                        break
+                    pending.append((image_path, prefetcher.submit(image_path.read_bytes)))
+
+                if not pending:
+                    return
+
+                yield pending.popleft()
+
+    @staticmethod
+    def _encode_image_blob(image_data: bytes, confidence: float) -> bytes:
+        """
+        image_blob用に画像をJPEGへ再エンコード
+
+        テキストページのスクリーンショットはJPEG(品質85)で4〜8倍小さくなる。
+        信頼度が低いページはOCR調査用に元のPNGをそのまま保持する。
+
+        Args:
+            image_data: キャプチャした画像バイト列 (PNG)
+            confidence: OCR信頼度スコア
+
+        Returns:
+            bytes: 保存する画像バイト列（エンコード失敗時は元データ）
+        """
+        if confidence < BLOB_KEEP_PNG_BELOW_CONFIDENCE:
+            return image_data
+
+        img = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            return image_data
+
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, BLOB_JPEG_QUALITY])
+        if not ok:
+            logger.warning("⚠️ JPEGエンコード失敗: 元のPNGを保存します")
+            return image_data
+
+        return buf.tobytes()
+
+    @staticmethod
+    def _flush_ocr_rows(db, rows: list[dict]) -> None:
+        """
+        蓄積したOCR結果を1回のexecutemanyで一括INSERT
+
+        ORMのunit-of-workを経由しないため、行ごとのflushや
+        identity mapへのimage_blob保持が発生しない。
+        (行数が多い場合はエンジンのinsertmanyvalues_page_sizeで自動分割)
+
+        Args:
+            db: DBセッション
+            rows: OCRResultのカラム値dictのリスト（処理後に空になる）
+        """
+        if not rows:
+            return
+
+        try:
+            db.execute(insert(OCRResult.__table__), rows)
+        finally:
+            # 失敗したバッチを次回に持ち越さない（従来のrollback時と同じ挙動）
+            rows.clear()
+
+    @staticmethod
+    def _extract_text_from_image_file(
+        image_path: Path,
+        image_data: Optional[bytes] = None
+    ) -> tuple[str, float]:
         """
         画像ファイルからテキストを抽出 (高精度OCR with 前処理 + ヘッダー/フッター除去)
 
         Args:
             image_path: 画像ファイルパス
+            image_data: 読み込み済みの画像バイト列（指定時はディスクを再読込しない）
 
         Returns:
             tuple[str, float]: (抽出されたテキスト, 信頼度スコア)
@@ -245,7 +457,8 @@ class CaptureService:
                 lang='jpn+eng',
                 enable_header_footer_removal=True,
                 top_margin=0.10,      # 上部10%を除去（タイトル、ページ番号など）
-                bottom_margin=0.10    # 下部10%を除去（ページ番号、フッターなど）
+                bottom_margin=0.10,   # 下部10%を除去（ページ番号、フッターなど）
+                image_data=image_data
             )
 
             # さらにテキストクリーニング（本文以外の不要文字列を除去）
@@ -261,7 +474,7 @@ class CaptureService:
 
             # フォールバック: 従来のOCR（拡張OCRが失敗した場合）
             try:
-                image = Image.open(image_path)
+                image = Image.open(io.BytesIO(image_data) if image_data is not None else image_path)
                 custom_config = r'--oem 3 --psm 6'
                 text = pytesseract.image_to_string(
                     image,
@@ -305,47 +518,24 @@ class CaptureService:
         Returns:
             str: クリーニングされたテキスト
         """
-        import re
-
         if not text:
             return ""
 
-        # 行単位で処理
-        lines = text.split('\n')
-        cleaned_lines = []
-
-        for line in lines:
-            line = line.strip()
-
-            # 空行はスキップ
-            if not line:
-                continue
-
-            # 「Page X」形式のページ番号を除去
-            if re.match(r'^Page\s+\d+$', line, re.IGNORECASE):
-                continue
-
-            # 「ページ X」形式のページ番号を除去
-            if re.match(r'^ページ\s*\d+$', line):
-                continue
-
-            # 数字のみの行を除去（ページ番号の可能性）
-            if re.match(r'^\d+$', line) and len(line) <= 4:
-                continue
-
-            # 短すぎる行（ノイズの可能性）をスキップ
-            # ただし、日本語1文字でも意味がある場合があるので慎重に
-            if len(line) < 2 and not any('\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF' or '\u4E00' <= c <= '\u9FFF' for c in line):
-                continue
-
-            cleaned_lines.append(line)
+        # 行単位で処理（1回の内包表記でフィルタ）
+        # - 空行はスキップ（連続改行もこれで圧縮される）
+        # - ページ番号行（Page X / ページ X / 数字のみ）を除去
+        # - 短すぎる行（ノイズの可能性）をスキップ
+        #   ただし、日本語1文字でも意味がある場合があるので慎重に
+        cleaned_lines = [
+            line for line in map(str.strip, text.split('\n'))
+            if line
+            and not _RE_PAGE_NUMBER_LINE.fullmatch(line)
+            and (len(line) >= 2 or line.translate(_CJK_TABLE) != line)
+        ]
 
         # 改行で結合
         cleaned_text = '\n'.join(cleaned_lines)
 
-        # 3行以上の連続改行を2行に圧縮
-        cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
-
         return cleaned_text.strip()
 
 
@@ -4,9 +4,12 @@ Embedding Service for RAG
 sentence-transformers統合、日本語対応、ベクトル生成
 """
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import torch
 from functools import lru_cache
 import hashlib
 import json
@@ -24,11 +27,16 @@ class EmbeddingService:
         "all-MiniLM-L6-v2": "sentence-transformers/all-MiniLM-L6-v2",  # 384次元、英語
     }
 
+    # 推論精度（fp16/bf16はGPU時のみ有効、int8はCPU時の動的量子化）
+    SUPPORTED_PRECISIONS = ("fp32", "fp16", "bf16", "int8")
+
     def __init__(
         self,
         model_name: str = "multilingual-e5-large",
         cache_size: int = 1000,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        precision: str = "fp16",
+        warmup: bool = True
     ):
         """
         Embeddingサービス初期化
@@ -37,17 +45,28 @@ class EmbeddingService:
             model_name: モデル名（SUPPORTED_MODELSのキー）
             cache_size: キャッシュサイズ
             device: デバイス（"cuda", "cpu", None=自動選択）
+            precision: 推論精度（"fp32", "fp16", "bf16", "int8"）
+                       fp16/bf16はCUDA時のみ適用、int8はCPU時のみ適用
+            warmup: 初期化時にダミー入力でウォームアップする（初回リクエストの遅延を解消）
         """
         if model_name not in self.SUPPORTED_MODELS:
             raise ValueError(
                 f"Unsupported model: {model_name}. "
                 f"Supported models: {list(self.SUPPORTED_MODELS.keys())}"
             )
+        if precision not in self.SUPPORTED_PRECISIONS:
+            raise ValueError(
+                f"Unsupported precision: {precision}. "
+                f"Supported precisions: {list(self.SUPPORTED_PRECISIONS)}"
+            )
 
         self.model_name = model_name
         self.model_path = self.SUPPORTED_MODELS[model_name]
         self.cache_size = cache_size
-        self._cache: Dict[str, List[float]] = {}
+        # LRUキャッシュ: キー → _cache_matrixの行番号（並び順 = 使用順）
+        self._cache_index: "OrderedDict[bytes, int]" = OrderedDict()
+        # シングルトンは複数スレッドから呼ばれるため、索引と行列の更新を直列化する
+        self._cache_lock = threading.Lock()
 
         logger.info(f"Loading embedding model: {self.model_path}")
 
@@ -55,16 +74,50 @@ class EmbeddingService:
             # モデルロード
             self.model = SentenceTransformer(self.model_path, device=device)
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
+            self.precision = self._apply_precision(precision)
+
+            # キャッシュ本体（float32の連続行列、ベクトルごとのPythonオブジェクトを持たない）
+            self._cache_matrix = np.zeros(
+                (max(cache_size, 0), self.embedding_dim), dtype=np.float32
+            )
 
             logger.info(
                 f"Embedding model loaded successfully. "
-                f"Dimension: {self.embedding_dim}, Device: {self.model.device}"
+                f"Dimension: {self.embedding_dim}, Device: {self.model.device}, "
+                f"Precision: {self.precision}"
             )
 
         except Exception as e:
             logger.error(f"Failed to load embedding model: {e}")
             raise
 
+        if warmup:
+            self._warmup()
+
+    def _warmup(self):
+        """
+        ダミーバッチでモデルをウォームアップ
+
+        CUDAの遅延初期化やcuDNNのオートチューンを初回リクエスト前に済ませる。
+        短文・長文の2種類の形状で実行し、両方の実行計画をキャッシュさせる。
+        失敗しても初期化は継続する。
+        """
+        try:
+            if self.model.device.type == "cuda":
+                torch.backends.cudnn.benchmark = True
+
+            for warmup_text in ("warmup", "warmup " * 64):
+                self.model.encode(
+                    [warmup_text] * 8,
+                    batch_size=8,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            logger.info("Embedding model warmup completed")
+
+        except Exception as e:
+            logger.warning(f"Embedding model warmup failed: {e}")
+
     def generate_embedding(self, text: str, use_cache: bool = True) -> List[float]:
         """
         単一テキストのEmbedding生成
@@ -76,34 +129,42 @@ class EmbeddingService:
         Returns:
             Embeddingベクトル（List[float]）
         """
+        # 公開APIはList[float]を返す（pgvector保存用）
+        return self._get_embedding_ndarray(text, use_cache=use_cache).tolist()
+
+    def _get_embedding_ndarray(self, text: str, use_cache: bool = True) -> np.ndarray:
+        """
+        単一テキストのEmbeddingをnumpy配列のまま取得（内部用）
+
+        Args:
+            text: 入力テキスト
+            use_cache: キャッシュ使用有無
+
+        Returns:
+            Embeddingベクトル（float32）
+        """
         if not text or not text.strip():
             logger.warning("Empty text provided for embedding")
-            return [0.0] * self.embedding_dim
+            return np.zeros(self.embedding_dim, dtype=np.float32)
 
         # キャッシュチェック
         if use_cache:
             cache_key = self._get_cache_key(text)
-            if cache_key in self._cache:
+            cached = self._get_from_cache(cache_key)
+            if cached is not None:
                 logger.debug(f"Cache hit for text: {text[:50]}...")
-                return self._cache[cache_key]
+                return cached
 
         try:
             # Embedding生成
             logger.debug(f"Generating embedding for text: {text[:50]}...")
-            embedding = self.model.encode(
-                text,
-                convert_to_numpy=True,
-                normalize_embeddings=True  # コサイン類似度用に正規化
-            )
-
-            # numpy配列 -> list変換
-            embedding_list = embedding.tolist()
+            embedding = self._encode(text)
 
             # キャッシュ保存
             if use_cache:
-                self._add_to_cache(cache_key, embedding_list)
+                self._add_to_cache(cache_key, embedding)
 
-            return embedding_list
+            return embedding
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
@@ -132,48 +193,75 @@ class EmbeddingService:
             logger.warning("Empty texts list provided")
             return []
 
-        embeddings = []
+        # 公開APIの境界で1回だけlist変換
+        return self._get_embeddings_ndarray(
+            texts,
+            batch_size=batch_size,
+            use_cache=use_cache,
+            show_progress=show_progress
+        ).tolist()
+
+    def _get_embeddings_ndarray(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        use_cache: bool = True,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        複数テキストのEmbeddingを(len(texts), dim)のnumpy行列で取得（内部用）
+
+        Args:
+            texts: 入力テキストリスト
+            batch_size: バッチサイズ
+            use_cache: キャッシュ使用有無
+            show_progress: プログレスバー表示
+
+        Returns:
+            Embedding行列（float32、入力と同じ順序）
+        """
+        # 入力と同じ順序で結果を格納する連続行列（空テキストはゼロベクトルのまま）
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
         texts_to_encode = []
         indices_to_encode = []
+        keys_to_encode = []
 
         # キャッシュチェック
         for i, text in enumerate(texts):
             if not text or not text.strip():
-                embeddings.append([0.0] * self.embedding_dim)
                 continue
 
+            cache_key = None
             if use_cache:
                 cache_key = self._get_cache_key(text)
-                if cache_key in self._cache:
-                    embeddings.append(self._cache[cache_key])
+                cached = self._get_from_cache(cache_key)
+                if cached is not None:
+                    embeddings[i] = cached
                     continue
 
             # キャッシュミス → エンコード対象
             texts_to_encode.append(text)
             indices_to_encode.append(i)
+            keys_to_encode.append(cache_key)
 
         # バッチエンコード
         if texts_to_encode:
             try:
                 logger.info(f"Batch encoding {len(texts_to_encode)} texts...")
 
-                batch_embeddings = self.model.encode(
+                batch_embeddings = self._encode(
                     texts_to_encode,
                     batch_size=batch_size,
-                    convert_to_numpy=True,
-                    normalize_embeddings=True,
-                    show_progress_bar=show_progress
+                    show_progress=show_progress
                 )
 
                 # 結果を配列に格納
-                for idx, embedding in zip(indices_to_encode, batch_embeddings):
-                    embedding_list = embedding.tolist()
-                    embeddings.insert(idx, embedding_list)
+                embeddings[indices_to_encode] = batch_embeddings
 
-                    # キャッシュ保存
-                    if use_cache:
-                        cache_key = self._get_cache_key(texts[idx])
-                        self._add_to_cache(cache_key, embedding_list)
+                # キャッシュ保存
+                if use_cache:
+                    for cache_key, embedding in zip(keys_to_encode, batch_embeddings):
+                        self._add_to_cache(cache_key, embedding)
 
                 logger.info(f"Batch encoding completed. Total: {len(embeddings)}")
 
@@ -200,13 +288,11 @@ class EmbeddingService:
         Returns:
             コサイン類似度（0.0-1.0）
         """
-        emb1 = np.array(self.generate_embedding(text1, use_cache=use_cache))
-        emb2 = np.array(self.generate_embedding(text2, use_cache=use_cache))
+        emb1 = self._get_embedding_ndarray(text1, use_cache=use_cache)
+        emb2 = self._get_embedding_ndarray(text2, use_cache=use_cache)
 
         # コサイン類似度（既に正規化済みなので内積で計算可能）
-        similarity = np.dot(emb1, emb2)
-
-        return float(similarity)
+        return float(emb1 @ emb2)
 
     def most_similar(
         self,
@@ -231,18 +317,22 @@ class EmbeddingService:
             return []
 
         # クエリEmbedding
-        query_emb = np.array(self.generate_embedding(query, use_cache=use_cache))
+        query_emb = self._get_embedding_ndarray(query, use_cache=use_cache)
 
-        # 候補Embeddings
-        candidate_embs = np.array(
-            self.generate_embeddings(candidates, use_cache=use_cache)
-        )
+        # 候補Embeddings（float32連続行列なのでnp.dotはBLASのSGEMVを使う）
+        candidate_embs = self._get_embeddings_ndarray(candidates, use_cache=use_cache)
 
         # コサイン類似度計算（行列積）
         similarities = np.dot(candidate_embs, query_emb)
 
-        # 上位K件取得
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # 上位K件取得（全件ソートせず、argpartitionで選んだK件だけをソート）
+        if top_k <= 0:
+            return []
+        if top_k < len(similarities):
+            top_indices = np.argpartition(-similarities, top_k)[:top_k]
+        else:
+            top_indices = np.arange(len(similarities))
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
 
         results = [
             {
@@ -257,41 +347,144 @@ class EmbeddingService:
 
         return results
 
-    def _get_cache_key(self, text: str) -> str:
+    def _apply_precision(self, precision: str) -> str:
+        """
+        推論精度をモデルに適用
+
+        Args:
+            precision: 要求された推論精度
+
+        Returns:
+            実際に適用された推論精度
+        """
+        device_type = self.model.device.type
+
+        if device_type == "cuda" and precision == "fp16":
+            self.model.half()
+        elif device_type == "cuda" and precision == "bf16":
+            self.model.to(torch.bfloat16)
+        elif device_type == "cpu" and precision == "int8":
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        else:
+            # デバイスが対応しない精度指定はfp32のまま
+            return "fp32"
+
+        return precision
+
+    def _encode(
+        self,
+        texts,
+        batch_size: int = 32,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        モデルでエンコードしてfloat32のnumpy配列を返す
+
+        バッチごとにホストへ転送せず、デバイス上でまとめてから最後に1回だけ転送する。
+        リスト入力は長さ順に並べ替えてからエンコードし（ミニバッチ内のパディングを最小化）、
+        結果を元の順序に戻して返す。
+
+        Args:
+            texts: 入力テキスト（単一文字列またはリスト）
+            batch_size: バッチサイズ
+            show_progress: プログレスバー表示
+
+        Returns:
+            Embedding（float32、正規化済み）
+        """
+        if isinstance(texts, str):
+            order = None
+        else:
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            texts = [texts[i] for i in order]
+
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_tensor=True,
+            normalize_embeddings=True,  # コサイン類似度用に正規化
+            show_progress_bar=show_progress
+        )
+        embeddings = embeddings.float().cpu().numpy()
+
+        if order is None:
+            return embeddings
+
+        # 元の順序に戻す
+        restored = np.empty_like(embeddings)
+        restored[order] = embeddings
+        return restored
+
+    def _get_cache_key(self, text: str) -> bytes:
         """
         キャッシュキー生成（テキストのハッシュ）
 
+        16バイトの生ダイジェストをそのままキーにする
+        （16進文字列より小さく、dict内でのハッシュ計算も軽い）
+
         Args:
             text: テキスト
 
         Returns:
-            ハッシュキー
+            ハッシュキー（16バイト）
         """
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
 
-    def _add_to_cache(self, key: str, embedding: List[float]):
+    def _get_from_cache(self, key: bytes) -> Optional[np.ndarray]:
         """
-        キャッシュに追加（LRU戦略）
+        キャッシュ参照（ヒット時は最近使用として更新）
 
         Args:
             key: キャッシュキー
-            embedding: Embeddingベクトル
+
+        Returns:
+            キャッシュ行のコピー（ミス時はNone）
+            行は他スレッドの書き込みで再利用され得るため、ロック内でコピーして返す
+        """
+        with self._cache_lock:
+            row = self._cache_index.get(key)
+            if row is None:
+                return None
+
+            self._cache_index.move_to_end(key)
+            return self._cache_matrix[row].copy()
+
+    def _add_to_cache(self, key: bytes, embedding: np.ndarray):
         """
-        if len(self._cache) >= self.cache_size:
-            # 最も古いエントリを削除（簡易LRU）
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
+        キャッシュに追加（LRU戦略）
 
-        self._cache[key] = embedding
+        Args:
+            key: キャッシュキー
+            embedding: Embeddingベクトル（float32）
+        """
+        if self.cache_size <= 0:
+            return
+
+        with self._cache_lock:
+            if key in self._cache_index:
+                row = self._cache_index[key]
+                self._cache_index.move_to_end(key)
+            elif len(self._cache_index) < self.cache_size:
+                row = len(self._cache_index)
+                self._cache_index[key] = row
+            else:
+                # 最も長く使われていないエントリの行を再利用（O(1)）
+                _, row = self._cache_index.popitem(last=False)
+                self._cache_index[key] = row
+
+            self._cache_matrix[row] = embedding
 
     def clear_cache(self):
         """キャッシュクリア"""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache_index.clear()
         logger.info("Embedding cache cleared")
 
     def get_cache_size(self) -> int:
         """キャッシュサイズ取得"""
-        return len(self._cache)
+        return len(self._cache_index)
 
     def get_model_info(self) -> Dict[str, Any]:
         """
@@ -305,7 +498,8 @@ class EmbeddingService:
             "model_path": self.model_path,
             "embedding_dim": self.embedding_dim,
             "device": str(self.model.device),
-            "cache_size": len(self._cache),
+            "precision": self.precision,
+            "cache_size": len(self._cache_index),
             "max_cache_size": self.cache_size
         }
 
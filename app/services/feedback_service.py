@@ -4,12 +4,17 @@ Feedback Service
 Handles user feedback collection, analytics, and retraining queue management
 """
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+from typing import Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import Text, bindparam, case, desc, func, insert, literal, select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.feedback import Feedback
 from app.models.biz_card import BizCard
@@ -17,6 +22,52 @@ from app.models.retrain_queue import RetrainQueue
 
 logger = logging.getLogger(__name__)
 
+# Short-lived per-process cache for feedback stats and counts
+STATS_CACHE_TTL = 60.0  # seconds
+STATS_CACHE_MAX_SIZE = 256
+_stats_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+_stats_cache_lock = threading.Lock()
+
+
+# Statistics for a period without feedback (timestamp is added per call)
+_EMPTY_STATS_TEMPLATE: Dict[str, Any] = {
+    "total_feedbacks": 0,
+    "average_rating": 0.0,
+    "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
+    "positive_count": 0,
+    "negative_count": 0,
+    "neutral_count": 0,
+    "recent_feedbacks": 0,
+}
+
+# Leading part of a query used to find related cards
+RELATED_CARD_PREFIX_LENGTH = 50
+
+# Related card lookup for a single feedback, built once and reused with a bound pattern
+_RELATED_CARD_IDS_STMT = select(BizCard.id).where(
+    BizCard.content.ilike(bindparam("pattern"))
+).limit(5)
+
+
+# Retraining task dispatch (kept off the request path)
+RETRAIN_TASK_NAME = "app.tasks.schedule.process_retraining_queue"
+_dispatch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retrain-dispatch")
+
+
+def _dispatch_retraining(task_id: str) -> None:
+    """Send the retraining task to the broker"""
+    try:
+        from app.tasks.celery_app import celery_app
+        celery_app.send_task(RETRAIN_TASK_NAME, task_id=task_id)
+        logger.info(f"Triggered immediate retraining: task {task_id}")
+    except Exception as e:
+        logger.error(f"Failed to trigger immediate retraining: {e}")
+
+
+def _count_where(condition):
+    """Conditional COUNT expression (0 instead of NULL on empty input)"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
 
 class FeedbackService:
     """Service for managing user feedback and learning"""
@@ -61,16 +112,15 @@ class FeedbackService:
             if rating < 1 or rating > 5:
                 raise ValueError("Rating must be between 1 and 5")
 
-            # Create feedback record
-            feedback = Feedback(
-                query=query,
-                answer=answer,
-                rating=rating,
-                user_id=user_id
-            )
-
-            self.db.add(feedback)
-            self.db.flush()
+            # Create feedback record (ID and created_at come back from RETURNING)
+            feedback = self.db.execute(
+                insert(Feedback).values(
+                    query=query,
+                    answer=answer,
+                    rating=rating,
+                    user_id=user_id
+                ).returning(Feedback.id, Feedback.created_at)
+            ).one()
 
             logger.info(
                 f"Feedback submitted: ID {feedback.id}, rating {rating}, "
@@ -81,11 +131,14 @@ class FeedbackService:
             queued_for_retraining = False
             if rating <= self.RETRAIN_THRESHOLD:
                 queued_for_retraining = self._queue_negative_feedback(
-                    feedback, query, answer
+                    feedback.id, rating, query, answer
                 )
 
             self.db.commit()
 
+            # New feedback changes the stats; drop cached values
+            clear_stats_cache()
+
             return {
                 "feedback_id": feedback.id,
                 "status": "submitted",
@@ -101,7 +154,8 @@ class FeedbackService:
 
     def _queue_negative_feedback(
         self,
-        feedback: Feedback,
+        feedback_id: int,
+        rating: int,
         query: str,
         answer: str
     ) -> bool:
@@ -109,7 +163,8 @@ class FeedbackService:
         Queue negative feedback for retraining
 
         Args:
-            feedback: Feedback object
+            feedback_id: Feedback ID
+            rating: Feedback rating
             query: Query text
             answer: Answer text
 
@@ -123,32 +178,27 @@ class FeedbackService:
 
             # Extract potential card content from answer
             # This is a simplified approach - in production, track card IDs used
-            cards = self.db.query(BizCard).filter(
-                BizCard.content.ilike(f"%{query[:50]}%")
-            ).limit(5).all()
-
-            queued_count = 0
-            for card in cards:
-                # Check if already in retrain queue
-                existing = self.db.query(RetrainQueue).filter(
-                    RetrainQueue.card_id == card.id,
-                    RetrainQueue.processed_at.is_(None)
-                ).first()
-
-                if not existing:
-                    # Add to retrain queue
-                    retrain_item = RetrainQueue(
-                        card_id=card.id,
-                        score=float(feedback.rating)
-                    )
-                    self.db.add(retrain_item)
-                    queued_count += 1
-
-            self.db.flush()
+            # (contains-match is served by the idx_biz_card_content_trgm GIN index)
+            # Only IDs are needed, so no BizCard instances are loaded
+            prefix = query[:RELATED_CARD_PREFIX_LENGTH]
+            card_ids = self.db.execute(
+                _RELATED_CARD_IDS_STMT, {"pattern": f"%{prefix}%"}
+            ).scalars().all()
+
+            # Check which cards are already in retrain queue (single query)
+            pending = self._get_pending_card_ids(card_ids)
+
+            # Add to retrain queue (single bulk INSERT)
+            rows = [
+                {"card_id": card_id, "score": float(rating)}
+                for card_id in card_ids
+                if card_id not in pending
+            ]
+            queued_count = self._insert_retrain_rows(rows)
 
             logger.info(
                 f"Queued {queued_count} cards for retraining based on "
-                f"negative feedback {feedback.id}"
+                f"negative feedback {feedback_id}"
             )
 
             return queued_count > 0
@@ -157,6 +207,49 @@ class FeedbackService:
             logger.error(f"Failed to queue negative feedback: {e}", exc_info=True)
             return False
 
+    def _insert_retrain_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert retrain queue rows, skipping cards that became pending meanwhile
+
+        A concurrent caller can queue the same card between
+        _get_pending_card_ids and this INSERT; ON CONFLICT DO NOTHING on
+        ux_retrain_pending_card skips those rows instead of aborting the
+        transaction.
+
+        Args:
+            rows: Mappings with card_id and score
+
+        Returns:
+            int: Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+
+        stmt = pg_insert(RetrainQueue).values(rows).on_conflict_do_nothing().returning(
+            RetrainQueue.card_id
+        )
+        return len(self.db.execute(stmt).scalars().all())
+
+    def _get_pending_card_ids(self, card_ids: List[int]) -> Set[int]:
+        """
+        Get card IDs that are already waiting in the retrain queue
+
+        Args:
+            card_ids: Candidate card IDs
+
+        Returns:
+            set: Card IDs with an unprocessed retrain queue entry
+        """
+        if not card_ids:
+            return set()
+
+        rows = self.db.query(RetrainQueue.card_id).filter(
+            RetrainQueue.card_id.in_(set(card_ids)),
+            RetrainQueue.processed_at.is_(None)
+        ).all()
+
+        return {row[0] for row in rows}
+
     def get_feedback_stats(
         self,
         user_id: Optional[int] = None,
@@ -165,6 +258,33 @@ class FeedbackService:
         """
         Get feedback statistics
 
+        Args:
+            user_id: Optional user filter
+            days: Period in days
+
+        Returns:
+            dict: Statistics
+        """
+        cache_key = ("stats", user_id, days)
+        stats = _get_cached(cache_key)
+        if stats is None:
+            stats = self._compute_feedback_stats(user_id=user_id, days=days)
+            _set_cached(cache_key, stats)
+
+        # Copy the nested distribution too so callers never mutate the cache
+        return {
+            **stats,
+            "rating_distribution": dict(stats["rating_distribution"])
+        }
+
+    def _compute_feedback_stats(
+        self,
+        user_id: Optional[int],
+        days: int
+    ) -> Dict[str, Any]:
+        """
+        Compute feedback statistics from the database
+
         Args:
             user_id: Optional user filter
             days: Period in days
@@ -174,59 +294,51 @@ class FeedbackService:
         """
         try:
             # Date range
-            start_date = datetime.utcnow() - timedelta(days=days)
-
-            # Base query
-            query = self.db.query(Feedback).filter(
+            now = datetime.utcnow()
+            start_date = now - timedelta(days=days)
+            recent_date = now - timedelta(hours=24)
+
+            # Total, average, distribution, categories and recent count
+            # in one aggregate query
+            query = self.db.query(
+                func.count(Feedback.id),
+                func.avg(Feedback.rating),
+                *[
+                    _count_where(Feedback.rating == i)
+                    for i in range(1, 6)
+                ],
+                _count_where(Feedback.rating >= self.POSITIVE_THRESHOLD),
+                _count_where(Feedback.rating <= self.NEGATIVE_THRESHOLD),
+                _count_where(Feedback.created_at >= recent_date)
+            ).filter(
                 Feedback.created_at >= start_date
             )
 
             if user_id:
                 query = query.filter(Feedback.user_id == user_id)
 
-            # Total count
-            total_feedbacks = query.count()
+            (
+                total_feedbacks,
+                avg_rating,
+                *rating_counts,
+                positive_count,
+                negative_count,
+                recent_feedbacks
+            ) = query.one()
 
             if total_feedbacks == 0:
-                return self._empty_stats()
-
-            # Average rating
-            avg_rating = query.with_entities(
-                func.avg(Feedback.rating)
-            ).scalar()
-
-            # Rating distribution
-            rating_dist_raw = query.with_entities(
-                Feedback.rating,
-                func.count(Feedback.id)
-            ).group_by(Feedback.rating).all()
+                return self._empty_stats(now)
 
-            rating_distribution = {rating: count for rating, count in rating_dist_raw}
-
-            # Ensure all ratings are present
-            for i in range(1, 6):
-                if i not in rating_distribution:
-                    rating_distribution[i] = 0
+            # Rating distribution (all ratings present)
+            rating_distribution = {
+                rating: int(count) for rating, count in enumerate(rating_counts, start=1)
+            }
 
             # Categorize feedback
-            positive_count = sum(
-                count for rating, count in rating_distribution.items()
-                if rating >= self.POSITIVE_THRESHOLD
-            )
-
-            negative_count = sum(
-                count for rating, count in rating_distribution.items()
-                if rating <= self.NEGATIVE_THRESHOLD
-            )
-
+            positive_count = int(positive_count)
+            negative_count = int(negative_count)
             neutral_count = total_feedbacks - positive_count - negative_count
 
-            # Recent feedbacks (last 24 hours)
-            recent_date = datetime.utcnow() - timedelta(hours=24)
-            recent_feedbacks = query.filter(
-                Feedback.created_at >= recent_date
-            ).count()
-
             return {
                 "total_feedbacks": total_feedbacks,
                 "average_rating": float(avg_rating) if avg_rating else 0.0,
@@ -234,25 +346,20 @@ class FeedbackService:
                 "positive_count": positive_count,
                 "negative_count": negative_count,
                 "neutral_count": neutral_count,
-                "recent_feedbacks": recent_feedbacks,
-                "timestamp": datetime.utcnow().isoformat()
+                "recent_feedbacks": int(recent_feedbacks),
+                "timestamp": now.isoformat()
             }
 
         except Exception as e:
             logger.error(f"Failed to get feedback stats: {e}", exc_info=True)
             raise
 
-    def _empty_stats(self) -> Dict[str, Any]:
+    def _empty_stats(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """Return empty statistics"""
         return {
-            "total_feedbacks": 0,
-            "average_rating": 0.0,
-            "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
-            "positive_count": 0,
-            "negative_count": 0,
-            "neutral_count": 0,
-            "recent_feedbacks": 0,
-            "timestamp": datetime.utcnow().isoformat()
+            **_EMPTY_STATS_TEMPLATE,
+            "rating_distribution": dict(_EMPTY_STATS_TEMPLATE["rating_distribution"]),
+            "timestamp": (now or datetime.utcnow()).isoformat()
         }
 
     def list_feedbacks(
@@ -260,22 +367,38 @@ class FeedbackService:
         user_id: Optional[int] = None,
         rating: Optional[int] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         List feedbacks with filtering
 
+        Pages are ordered by (created_at, id) descending. Passing the
+        next_cursor of the previous page continues with keyset pagination,
+        which does not slow down for later pages like offset does.
+
         Args:
             user_id: Optional user filter
             rating: Optional rating filter
             limit: Max results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when cursor is given)
+            cursor: Keyset cursor from a previous page's next_cursor
+            include_total: Count total matches (first page only)
 
         Returns:
             dict: Feedback list
         """
         try:
-            query = self.db.query(Feedback)
+            # Column-projected rows (no ORM instances / identity map)
+            query = self.db.query(
+                Feedback.id,
+                Feedback.query,
+                Feedback.answer,
+                Feedback.rating,
+                Feedback.user_id,
+                Feedback.created_at
+            )
 
             # Apply filters
             if user_id:
@@ -284,31 +407,47 @@ class FeedbackService:
             if rating:
                 query = query.filter(Feedback.rating == rating)
 
-            # Count total
-            total = query.count()
+            # Count total (only on the first page; use count_feedbacks otherwise)
+            total = None
+            if include_total and cursor is None:
+                total = self.count_feedbacks(user_id=user_id, rating=rating)
 
             # Paginate
-            feedbacks = query.order_by(
-                desc(Feedback.created_at)
-            ).limit(limit).offset(offset).all()
+            query = query.order_by(desc(Feedback.created_at), desc(Feedback.id))
+            if cursor is not None:
+                cursor_created_at, cursor_id = self._decode_cursor(cursor)
+                query = query.filter(
+                    tuple_(Feedback.created_at, Feedback.id)
+                    < tuple_(cursor_created_at, cursor_id)
+                )
+                offset = 0
+            elif offset:
+                query = query.offset(offset)
 
-            # Build response
+            # Build response (rows are streamed in chunks)
             feedback_list = []
-            for feedback in feedbacks:
+            last_row = None
+            for row in query.limit(limit).yield_per(500):
                 feedback_list.append({
-                    "feedback_id": feedback.id,
-                    "query": feedback.query,
-                    "answer": feedback.answer,
-                    "rating": feedback.rating,
-                    "user_id": feedback.user_id,
-                    "created_at": feedback.created_at.isoformat()
+                    "feedback_id": row.id,
+                    "query": row.query,
+                    "answer": row.answer,
+                    "rating": row.rating,
+                    "user_id": row.user_id,
+                    "created_at": row.created_at.isoformat()
                 })
+                last_row = row
+
+            next_cursor = None
+            if last_row is not None and len(feedback_list) == limit:
+                next_cursor = self._encode_cursor(last_row)
 
             return {
                 "total": total,
                 "count": len(feedback_list),
                 "limit": limit,
                 "offset": offset,
+                "next_cursor": next_cursor,
                 "feedbacks": feedback_list
             }
 
@@ -316,6 +455,53 @@ class FeedbackService:
             logger.error(f"Failed to list feedbacks: {e}", exc_info=True)
             raise
 
+    def count_feedbacks(
+        self,
+        user_id: Optional[int] = None,
+        rating: Optional[int] = None
+    ) -> int:
+        """
+        Count feedbacks matching the list filters (cached for STATS_CACHE_TTL)
+
+        Args:
+            user_id: Optional user filter
+            rating: Optional rating filter
+
+        Returns:
+            int: Total feedback count
+        """
+        cache_key = ("count", user_id, rating)
+        total = _get_cached(cache_key)
+        if total is None:
+            query = self.db.query(func.count(Feedback.id))
+            if user_id:
+                query = query.filter(Feedback.user_id == user_id)
+            if rating:
+                query = query.filter(Feedback.rating == rating)
+            total = query.scalar()
+            _set_cached(cache_key, total)
+
+        return total
+
+    @staticmethod
+    def _encode_cursor(feedback: Any) -> str:
+        """Build a keyset cursor from the last feedback row of a page"""
+        return f"{feedback.created_at.isoformat()}_{feedback.id}"
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Parse a keyset cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            created_at, feedback_id = cursor.rsplit("_", 1)
+            return datetime.fromisoformat(created_at), int(feedback_id)
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+
     def trigger_retraining(
         self,
         card_ids: Optional[List[int]] = None,
@@ -334,84 +520,103 @@ class FeedbackService:
             dict: Trigger result
         """
         try:
+            rows: List[Dict[str, Any]] = []
             queued_items = 0
 
             if card_ids:
-                # Queue specific cards
-                for card_id in card_ids:
-                    # Check if card exists
-                    card = self.db.query(BizCard).filter(
-                        BizCard.id == card_id
-                    ).first()
-
-                    if not card:
-                        logger.warning(f"Card {card_id} not found, skipping")
-                        continue
-
-                    # Check if already queued
-                    existing = self.db.query(RetrainQueue).filter(
-                        RetrainQueue.card_id == card_id,
-                        RetrainQueue.processed_at.is_(None)
-                    ).first()
-
-                    if existing:
-                        logger.info(f"Card {card_id} already in queue, skipping")
-                        continue
-
-                    # Add to queue
-                    retrain_item = RetrainQueue(
-                        card_id=card_id,
-                        score=0.0
+                # Check which cards exist (single query)
+                requested = set(card_ids)
+                found = {
+                    row[0] for row in self.db.query(BizCard.id).filter(
+                        BizCard.id.in_(requested)
+                    ).all()
+                }
+
+                missing = requested - found
+                if missing:
+                    logger.warning(f"Cards not found, skipping: {sorted(missing)}")
+
+                # Queue specific cards in one statement, skipping ones already
+                # pending (ux_retrain_pending_card also makes concurrent
+                # callers safe via ON CONFLICT DO NOTHING)
+                already_pending = select(literal(1)).where(
+                    RetrainQueue.card_id == BizCard.id,
+                    RetrainQueue.processed_at.is_(None)
+                ).exists()
+
+                stmt = pg_insert(RetrainQueue).from_select(
+                    ["card_id", "score"],
+                    select(BizCard.id, literal(0.0)).where(
+                        BizCard.id.in_(found),
+                        ~already_pending
                     )
-                    self.db.add(retrain_item)
-                    queued_items += 1
+                ).on_conflict_do_nothing().returning(RetrainQueue.card_id)
+
+                queued_card_ids = self.db.execute(stmt).scalars().all() if found else []
+                queued_items = len(queued_card_ids)
+
+                already_queued = found.difference(queued_card_ids)
+                if already_queued:
+                    logger.info(f"Cards already in queue, skipping: {sorted(already_queued)}")
 
             else:
                 # Queue based on negative feedback
                 # Find cards associated with low-rated feedback
-                negative_feedbacks = self.db.query(Feedback).filter(
+                negative_feedbacks = self.db.query(
+                    Feedback.id,
+                    Feedback.rating,
+                    Feedback.created_at,
+                    func.left(
+                        Feedback.query, RELATED_CARD_PREFIX_LENGTH, type_=Text
+                    ).label("prefix")
+                ).filter(
                     Feedback.rating <= self.RETRAIN_THRESHOLD
-                ).order_by(desc(Feedback.created_at)).limit(batch_size).all()
+                ).order_by(desc(Feedback.created_at)).limit(batch_size).subquery("neg")
+
+                # Find related cards (simplified) - up to 3 per feedback via LATERAL join,
+                # so all feedbacks are matched in a single statement
+                related_cards = select(BizCard.id.label("card_id")).where(
+                    BizCard.content.ilike("%" + negative_feedbacks.c.prefix + "%")
+                ).limit(3).lateral("related")
+
+                matches = self.db.query(
+                    negative_feedbacks.c.rating,
+                    related_cards.c.card_id
+                ).join(
+                    related_cards, true()
+                ).order_by(desc(negative_feedbacks.c.created_at)).all()
 
                 logger.info(
-                    f"Found {len(negative_feedbacks)} negative feedbacks to process"
+                    f"Found {len(matches)} cards related to negative feedbacks"
                 )
 
-                for feedback in negative_feedbacks:
-                    # Find related cards (simplified)
-                    cards = self.db.query(BizCard).filter(
-                        BizCard.content.ilike(f"%{feedback.query[:50]}%")
-                    ).limit(3).all()
-
-                    for card in cards:
-                        # Check if already queued
-                        existing = self.db.query(RetrainQueue).filter(
-                            RetrainQueue.card_id == card.id,
-                            RetrainQueue.processed_at.is_(None)
-                        ).first()
-
-                        if not existing:
-                            retrain_item = RetrainQueue(
-                                card_id=card.id,
-                                score=float(feedback.rating)
-                            )
-                            self.db.add(retrain_item)
-                            queued_items += 1
+                # Check which cards are already queued (single query)
+                pending = self._get_pending_card_ids(
+                    [card_id for _, card_id in matches]
+                )
+
+                for rating, card_id in matches:
+                    if card_id not in pending:
+                        rows.append({
+                            "card_id": card_id,
+                            "score": float(rating)
+                        })
+                        pending.add(card_id)
+
+            # Add to queue (single bulk INSERT)
+            if rows:
+                queued_items = self._insert_retrain_rows(rows)
 
             self.db.commit()
 
             logger.info(f"Queued {queued_items} items for retraining")
 
             # If force, trigger immediate processing
+            # (task ID is generated up front; the broker publish runs in the background)
             task_id = None
             if force and queued_items > 0:
-                try:
-                    from app.tasks.schedule import process_retraining_queue
-                    result = process_retraining_queue.apply_async()
-                    task_id = result.id
-                    logger.info(f"Triggered immediate retraining: task {task_id}")
-                except Exception as e:
-                    logger.error(f"Failed to trigger immediate retraining: {e}")
+                task_id = str(uuid4())
+                _dispatch_executor.submit(_dispatch_retraining, task_id)
 
             return {
                 "status": "queued" if not force else "triggered",
@@ -426,6 +631,49 @@ class FeedbackService:
             logger.error(f"Failed to trigger retraining: {e}", exc_info=True)
             raise
 
+    def _get_insight_metrics(self, days: int) -> Dict[str, Any]:
+        """
+        Get the aggregates used by get_learning_insights (cached for STATS_CACHE_TTL)
+
+        Only the values the insight rules need are computed, in one query.
+
+        Args:
+            days: Period in days
+
+        Returns:
+            dict: total_feedbacks, average_rating, negative_count,
+                three_star_count, recent_feedbacks
+        """
+        cache_key = ("insights", days)
+        metrics = _get_cached(cache_key)
+        if metrics is not None:
+            return metrics
+
+        now = datetime.utcnow()
+        start_date = now - timedelta(days=days)
+        recent_date = now - timedelta(hours=24)
+
+        total, avg_rating, negative_count, three_star_count, recent = self.db.query(
+            func.count(Feedback.id),
+            func.avg(Feedback.rating),
+            _count_where(Feedback.rating <= self.NEGATIVE_THRESHOLD),
+            _count_where(Feedback.rating == 3),
+            _count_where(Feedback.created_at >= recent_date)
+        ).filter(
+            Feedback.created_at >= start_date
+        ).one()
+
+        metrics = {
+            "total_feedbacks": total,
+            "average_rating": float(avg_rating) if avg_rating else 0.0,
+            "negative_count": int(negative_count),
+            "three_star_count": int(three_star_count),
+            "recent_feedbacks": int(recent)
+        }
+        _set_cached(cache_key, metrics)
+
+        return metrics
+
     def get_learning_insights(self, days: int = 30) -> Dict[str, Any]:
         """
         Generate learning insights from feedback data
@@ -437,10 +685,8 @@ class FeedbackService:
             dict: Insights and recommendations
         """
         try:
-            start_date = datetime.utcnow() - timedelta(days=days)
-
-            # Get feedback stats
-            stats = self.get_feedback_stats(days=days)
+            # Get decision inputs (single aggregate query)
+            stats = self._get_insight_metrics(days=days)
 
             insights = []
             recommendations = []
@@ -502,12 +748,11 @@ class FeedbackService:
                 recommendations.append("Consider prompting users for feedback")
 
             # Insight 4: Rating distribution
-            distribution = stats["rating_distribution"]
-            if distribution.get(3, 0) > stats["total_feedbacks"] * 0.5:
+            if stats["three_star_count"] > stats["total_feedbacks"] * 0.5:
                 insights.append({
                     "insight_type": "polarization",
                     "description": "High neutral feedback - unclear user sentiment",
-                    "data": {"neutral_count": distribution.get(3, 0)},
+                    "data": {"neutral_count": stats["three_star_count"]},
                     "priority": "medium"
                 })
                 recommendations.append("Improve response quality to increase satisfaction")
@@ -524,6 +769,29 @@ class FeedbackService:
             raise
 
 
+def _get_cached(key: Tuple[Any, ...]) -> Optional[Any]:
+    """Return a cached value if it is still fresh"""
+    with _stats_cache_lock:
+        cached = _stats_cache.get(key)
+    if cached and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _set_cached(key: Tuple[Any, ...], value: Any) -> None:
+    """Store a value in the stats cache"""
+    with _stats_cache_lock:
+        if len(_stats_cache) >= STATS_CACHE_MAX_SIZE:
+            _stats_cache.clear()
+        _stats_cache[key] = (time.monotonic(), value)
+
+
+def clear_stats_cache() -> None:
+    """Clear cached feedback statistics"""
+    with _stats_cache_lock:
+        _stats_cache.clear()
+
+
 def get_feedback_service(db: Session) -> FeedbackService:
     """
     Factory function for FeedbackService
@@ -7,13 +7,25 @@ LLMベースのナレッジ抽出サービス
 - Phase 4-3: Entity extraction (NER)
 - Phase 4-4: Relationship extraction
 """
+import asyncio
+import csv
+import hashlib
+import io
 import logging
+import os
 import re
 import json
+import threading
 import yaml
 import time
-from typing import Optional, List, Dict, Any, Tuple
-from sqlalchemy.orm import Session
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Iterator
+from sqlalchemy import exists, insert, select
+from sqlalchemy.orm import Session, load_only
 
 from app.services.llm_service import LLMService
 from app.models.knowledge import Knowledge
@@ -39,6 +51,724 @@ from app.schemas.knowledge import (
 
 logger = logging.getLogger(__name__)
 
+# チャンク単位のLLM同時リクエスト数の上限
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# プロバイダ別のコンテキストウィンドウ（トークン）
+LLM_CONTEXT_LIMITS = {"anthropic": 200_000, "openai": 128_000}
+
+# ナレッジ抽出用LLMの最大出力トークン数
+KNOWLEDGE_MAX_OUTPUT_TOKENS = 4096
+
+# チャンク1件分の抽出結果に見込む出力トークン数（1リクエストに詰めるチャンク数の上限を決める）
+# バッチ化前の1チャンク1リクエスト時の出力上限と同じ
+KNOWLEDGE_RESPONSE_TOKENS_PER_CHUNK = 2048
+
+# LLMレスポンスからJSONを取り出すデコーダー（開き括弧から1パスでデコード）
+_JSON_DECODER = json.JSONDecoder()
+_JSON_START_RE = {"obj": re.compile(r'\{'), "arr": re.compile(r'\['), None: re.compile(r'[\[{]')}
+
+# JSON配列で次に来る要素オブジェクトの開始、または配列の終端
+_JSON_ARRAY_NEXT_RE = re.compile(r'[{\]]')
+
+# 前置きの文章に括弧が含まれる場合に試す開始位置の上限
+_JSON_MAX_ATTEMPTS = 8
+
+# LLMレスポンスキャッシュ（同一プロンプトの再抽出ではLLMを呼ばない）
+LLM_RESPONSE_CACHE_TTL = 86400.0
+LLM_RESPONSE_CACHE_MAX_SIZE = 1024
+_llm_response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_llm_response_cache_lock = threading.Lock()
+
+# 構造化ナレッジの項目ごとの最大件数
+KNOWLEDGE_LIST_LIMITS = {
+    "main_topics": 10,
+    "concepts": 20,
+    "facts": 30,
+    "processes": 10,
+    "insights": 15,
+    "action_items": 15,
+}
+
+# 重要度文字列 -> ImportanceLevel（未知の値は medium）
+_IMPORTANCE_LEVELS = {level.value: level for level in ImportanceLevel}
+
+# 日本語文字（ひらがな・カタカナ・漢字）
+_JP_CHAR_RE = re.compile(r'[\u3040-\u30FF\u4E00-\u9FFF]')
+
+# LibYAMLがあればC実装のDumperを使用
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# 関係性CSVのヘッダーと、クォートが必要な文字
+_CSV_HEADER = ("Subject", "Predicate", "Object", "Confidence", "Source Text")
+_CSV_UNSAFE_RE = re.compile(r'[",\r\n]')
+
+# チャンク分割で優先する文の区切り
+_SENTENCE_BOUNDARY_RE = re.compile(r'[。.\n]')
+
+# チャンク重複判定用の空白正規化
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 言語検出に使う先頭文字数
+LANGUAGE_DETECTION_SAMPLE_SIZE = 4096
+
+# 品質スコアの重み（カテゴリが1件以上あれば加点、並びはビット位置と対応）
+QUALITY_SCORE_WEIGHTS = (
+    ("main_topics", 0.15),
+    ("concepts", 0.25),
+    ("facts", 0.15),
+    ("processes", 0.1),
+    ("insights", 0.2),
+    ("action_items", 0.15),
+)
+
+# カテゴリ有無のビットマスク -> 品質スコア（全64通りを事前計算）
+_QUALITY_SCORE_TABLE = tuple(
+    min(sum((w for bit, (_, w) in enumerate(QUALITY_SCORE_WEIGHTS) if mask >> bit & 1), 0.0), 1.0)
+    for mask in range(1 << len(QUALITY_SCORE_WEIGHTS))
+)
+
+
+def _extract_json(text: str, kind: Optional[str] = None) -> Any:
+    """
+    LLMレスポンスから最初のJSON値を取り出す
+
+    Args:
+        text: LLMレスポンス
+        kind: 'obj'（オブジェクト）、'arr'（配列）、None（先に現れた方）
+
+    Returns:
+        デコードされた値（見つからない場合はNone）
+    """
+    pattern = _JSON_START_RE[kind]
+    pos = 0
+    for _ in range(_JSON_MAX_ATTEMPTS):
+        match = pattern.search(text, pos)
+        if match is None:
+            return None
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, match.start())
+            return value
+        except json.JSONDecodeError:
+            pos = match.start() + 1
+    return None
+
+
+def _scan_json_array(text: str, pos: int) -> Tuple[List[Any], int, bool]:
+    """
+    JSON配列の '[' の直後から、完結した要素オブジェクトを順に取り出す
+
+    途中で切れた要素の手前で止まるため、出力上限で打ち切られた配列からも
+    完結済みの要素をすべて回収できる
+
+    Args:
+        text: LLMレスポンス
+        pos: 走査開始位置（'[' の直後）
+
+    Returns:
+        (要素のリスト, 次の走査位置, 配列の ']' まで到達したか)
+    """
+    items = []
+    while True:
+        match = _JSON_ARRAY_NEXT_RE.search(text, pos)
+        if match is None:
+            return items, len(text), False
+        if match.group() == "]":
+            return items, match.end(), True
+        try:
+            item, pos = _JSON_DECODER.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            # 要素が未完了（打ち切り、またはストリーミング中）
+            return items, match.start(), False
+        items.append(item)
+
+
+def _scan_first_json_array(
+    text: str,
+    kind: Optional[str] = None
+) -> Optional[Tuple[List[Any], bool]]:
+    """
+    要素を含む最初のJSON配列を走査（前置きの文章中の "[see below]" 等は飛ばす）
+
+    Args:
+        text: LLMレスポンス
+        kind: 'arr'（配列）、None（先に現れた方）
+
+    Returns:
+        (完結した要素のリスト, 配列の ']' まで到達したか)
+        最初のJSON値が配列でない、または要素が1件も完結していない場合はNone
+    """
+    pos = 0
+    for _ in range(_JSON_MAX_ATTEMPTS):
+        match = _JSON_START_RE[kind].search(text, pos)
+        if match is None or match.group() != "[":
+            return None
+        items, _, closed = _scan_json_array(text, match.end())
+        if items:
+            return items, closed
+        if not closed:
+            return None
+        pos = match.end()
+    return None
+
+
+def _is_complete_json_response(text: str, kind: Optional[str] = None) -> bool:
+    """
+    LLMレスポンスのJSONが完結しているか（パーサーと同じ規則で判定）
+
+    配列が途中で打ち切られた応答やパースできない応答はキャッシュしない
+
+    Args:
+        text: LLMレスポンス
+        kind: 'obj'（オブジェクト）、'arr'（配列）、None（先に現れた方）
+
+    Returns:
+        完結したJSONを含む場合True
+    """
+    scanned = _scan_first_json_array(text, kind)
+    if scanned is not None:
+        return scanned[1]
+    return _extract_json(text, kind) is not None
+
+
+async def _iter_json_array_items(deltas: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """
+    ストリーミング中のJSON配列から、要素オブジェクトを閉じ括弧の到着ごとに返す
+
+    Args:
+        deltas: LLMレスポンスのテキスト差分
+
+    Yields:
+        配列内の各オブジェクト（トップレベルの ']' 以降の出力は無視する）
+    """
+    text = ""
+    pos: Optional[int] = None  # 走査中の配列内の位置（'[' が見つかるまではNone）
+    search_from = 0
+    attempts = 0
+    yielded = False
+    closed = False
+
+    async for delta in deltas:
+        if closed:
+            # 配列の後ろの説明文やJSONは要素として扱わず、ストリームだけ読み切る
+            continue
+
+        text += delta
+
+        while not closed:
+            if pos is None:
+                start = text.find("[", search_from)
+                if start < 0:
+                    break
+                attempts += 1
+                pos = search_from = start + 1
+
+            # 未完了のオブジェクトは残し、続きの差分を待つ
+            items, pos, closed = _scan_json_array(text, pos)
+            for item in items:
+                yielded = True
+                yield item
+
+            if closed and not yielded and attempts < _JSON_MAX_ATTEMPTS:
+                # 前置きの文章中の括弧（例: "[see below]"）だったため、次の '[' から探し直す
+                closed = False
+                pos = None
+                continue
+            break
+
+    if closed:
+        return
+
+    if not yielded:
+        # 差分単位では判定できない前置き（括弧内に '{' を含む等）は全文で取り出す
+        recovered = _extract_json(text, "arr")
+        if isinstance(recovered, list):
+            for item in recovered:
+                yield item
+            return
+
+    if pos is not None:
+        logger.warning("Incomplete JSON array in streamed response")
+
+
+def _importance(value: Any) -> ImportanceLevel:
+    """LLM出力の重要度を ImportanceLevel に変換"""
+    if isinstance(value, str):
+        return _IMPORTANCE_LEVELS.get(value.strip().lower(), ImportanceLevel.MEDIUM)
+    return ImportanceLevel.MEDIUM
+
+
+def _confidence(value: Any, default: float) -> float:
+    """LLM出力の信頼度を 0.0-1.0 の float に変換"""
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    """空でない値のみ文字列化"""
+    return str(value) if value else None
+
+
+def _dict_items(items: Any, limit: int) -> List[Dict[str, Any]]:
+    """リストのうち辞書の要素を先頭から limit 件まで返す"""
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict)][:limit]
+
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """エンティティ名の正規化（重複判定・出現判定で共有）"""
+    return name.casefold()
+
+
+@lru_cache(maxsize=4096)
+def _node_id(name: str) -> str:
+    """ノードID生成（ASCII安全、日本語などを含む場合は簡易ハッシュ）"""
+    return hashlib.md5(name.encode()).hexdigest()[:16]
+
+
+# ========== Markdown Sections ==========
+
+def _md_topics(topics: List[str]) -> Iterator[str]:
+    """主要トピックのMarkdown行"""
+    if topics:
+        yield "## 主要トピック"
+        yield from (f"- {topic}" for topic in topics)
+        yield ""
+
+
+def _md_concepts(concepts: List[Concept]) -> Iterator[str]:
+    """概念のMarkdown行"""
+    if concepts:
+        yield "## 概念"
+        for concept in concepts:
+            yield f"### {concept.name} ({concept.importance.value})"
+            yield concept.definition
+            yield ""
+
+
+def _md_facts(facts: List[Fact]) -> Iterator[str]:
+    """事実のMarkdown行"""
+    if facts:
+        yield "## 事実"
+        yield from (
+            f"- {fact.statement} (信頼度: {fact.confidence:.2f})" for fact in facts
+        )
+        yield ""
+
+
+def _md_processes(processes: List[Process]) -> Iterator[str]:
+    """プロセスのMarkdown行"""
+    if processes:
+        yield "## プロセス"
+        for process in processes:
+            yield f"### {process.name}"
+            if process.description:
+                yield process.description
+            yield from (f"{i}. {step}" for i, step in enumerate(process.steps, 1))
+            yield ""
+
+
+def _md_insights(insights: List[Insight]) -> Iterator[str]:
+    """洞察のMarkdown行"""
+    if insights:
+        yield "## 洞察"
+        yield from (
+            f"- **{insight.category}** ({insight.importance.value}): {insight.text}"
+            for insight in insights
+        )
+        yield ""
+
+
+def _md_action_items(action_items: List[ActionItem]) -> Iterator[str]:
+    """アクションアイテムのMarkdown行"""
+    if action_items:
+        yield "## アクションアイテム"
+        for action in action_items:
+            yield f"- [{action.priority.value}] {action.action}"
+            if action.context:
+                yield f"  - {action.context}"
+        yield ""
+
+
+async def _replay_deltas(content: str) -> AsyncIterator[str]:
+    """キャッシュ済みレスポンスを1つの差分として返す"""
+    yield content
+
+
+async def _record_deltas(
+    deltas: AsyncIterator[str],
+    parts: List[str]
+) -> AsyncIterator[str]:
+    """差分をそのまま返しつつ parts に記録"""
+    async for delta in deltas:
+        parts.append(delta)
+        yield delta
+
+
+def _response_cache_key(llm: LLMService, system_prompt: str, prompt: str) -> str:
+    """モデルとプロンプト全体から LLMレスポンスキャッシュのキーを生成"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (llm.provider, getattr(llm, "model", None) or "", system_prompt, prompt):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _get_cached_response(key: str) -> Optional[str]:
+    """キャッシュ済みのLLMレスポンスを取得（期限切れはNone）"""
+    with _llm_response_cache_lock:
+        entry = _llm_response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if expires_at < time.monotonic():
+            del _llm_response_cache[key]
+            return None
+        _llm_response_cache.move_to_end(key)
+        return content
+
+
+def _set_cached_response(key: str, content: str) -> None:
+    """LLMレスポンスをキャッシュ（上限超過時は最も古いものから削除）"""
+    with _llm_response_cache_lock:
+        _llm_response_cache[key] = (time.monotonic() + LLM_RESPONSE_CACHE_TTL, content)
+        _llm_response_cache.move_to_end(key)
+        while len(_llm_response_cache) > LLM_RESPONSE_CACHE_MAX_SIZE:
+            _llm_response_cache.popitem(last=False)
+
+
+def clear_llm_response_cache() -> None:
+    """LLMレスポンスキャッシュをクリア"""
+    with _llm_response_cache_lock:
+        _llm_response_cache.clear()
+
+
+def _unique_chunks(chunks: List[str]) -> List[str]:
+    """
+    内容が同一のチャンクを除外（順序は維持）
+
+    定型のヘッダー・フッターなどで同じチャンクが繰り返される場合に、
+    同じ内容をLLMへ重複して送らないようにする。空白の違いは無視する
+    """
+    seen = set()
+    unique = []
+    for chunk in chunks:
+        key = _WHITESPACE_RE.sub(" ", chunk).strip()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(chunk)
+
+    if len(unique) < len(chunks):
+        logger.debug(f"Skipped {len(chunks) - len(unique)} duplicate chunks")
+    return unique
+
+
+def _run_sync(coro):
+    """
+    コルーチンを同期的に実行
+
+    実行中のイベントループ内では asyncio.run を入れ子にできないため、別スレッドの
+    新しいループで実行する。呼び出し元スレッド（ループ）は完了までブロックされるので、
+    非同期コンテキストからは aextract_knowledge / aextract_entities /
+    aextract_relationships を直接 await すること
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# ========== Mock Data ==========
+# 内容は言語ごとに固定のため、生成済みオブジェクトを共有する（呼び出し側は読み取りのみ）
+
+@lru_cache(maxsize=2)
+def _mock_entities(language: str) -> Tuple[Entity, ...]:
+    """モックエンティティ（言語ごとにキャッシュ）"""
+    if language == "ja":
+        return (
+            Entity(
+                name="機械学習",
+                type=EntityType.TECHNICAL_TERM,
+                description="データから学習するアルゴリズム",
+                confidence=0.95
+            ),
+            Entity(
+                name="深層学習",
+                type=EntityType.TECHNICAL_TERM,
+                description="多層ニューラルネットワークを使用",
+                confidence=0.9
+            )
+        )
+    return (
+        Entity(
+            name="Machine Learning",
+            type=EntityType.TECHNICAL_TERM,
+            description="Algorithms that learn from data",
+            confidence=0.95
+        ),
+        Entity(
+            name="Deep Learning",
+            type=EntityType.TECHNICAL_TERM,
+            description="Uses multi-layer neural networks",
+            confidence=0.9
+        )
+    )
+
+
+@lru_cache(maxsize=32)
+def _mock_relationships(subject: str, language: str) -> Tuple[Relationship, ...]:
+    """モック関係性（主語・言語ごとにキャッシュ）"""
+    return (
+        Relationship(
+            subject=subject,
+            predicate=RelationType.IS_A,
+            object="人工知能" if language == "ja" else "Artificial Intelligence",
+            confidence=0.9,
+            source_text="機械学習は人工知能の一種である" if language == "ja" else "ML is a type of AI"
+        ),
+    )
+
+
+# ========== Prompt Templates ==========
+# str.format 用テンプレート（JSON例の波括弧は {{ }} でエスケープ）
+
+_KNOWLEDGE_SYSTEM_PROMPT_JA = """あなたは書籍や文書から重要なナレッジを抽出する専門家です。
+以下の情報を抽出してください：
+
+1. **主要トピック**: 文書の主要なテーマ（3-5個）
+2. **概念**: 重要な概念とその定義（重要度付き）
+3. **事実**: 重要な事実や統計データ
+4. **プロセス**: 説明されている手順やプロセス
+5. **洞察**: 重要な洞察や学び
+6. **アクションアイテム**: 実行可能な推奨事項
+
+日本語で正確に抽出し、構造化された形式で出力してください。"""
+
+_KNOWLEDGE_SYSTEM_PROMPT_EN = """You are an expert at extracting important knowledge from books and documents.
+Extract the following information:
+
+1. **Main Topics**: Key themes (3-5 topics)
+2. **Concepts**: Important concepts with definitions (with importance level)
+3. **Facts**: Important facts and statistics
+4. **Processes**: Described procedures or processes
+5. **Insights**: Key insights and learnings
+6. **Action Items**: Actionable recommendations
+
+Extract accurately and output in a structured format."""
+
+_KNOWLEDGE_USER_PROMPT_JA = """以下のテキストから重要なナレッジを抽出してください。
+
+【書籍タイトル】
+{book_title}
+
+【出力形式】
+以下のJSON形式で出力してください：
+
+{{
+  "main_topics": ["トピック1", "トピック2", ...],
+  "concepts": [
+    {{
+      "name": "概念名",
+      "definition": "定義",
+      "importance": "high|medium|low"
+    }}
+  ],
+  "facts": [
+    {{
+      "statement": "事実の記述",
+      "confidence": 0.9
+    }}
+  ],
+  "processes": [
+    {{
+      "name": "プロセス名",
+      "steps": ["ステップ1", "ステップ2"],
+      "description": "説明"
+    }}
+  ],
+  "insights": [
+    {{
+      "text": "洞察の内容",
+      "category": "カテゴリ",
+      "importance": "high|medium|low"
+    }}
+  ],
+  "action_items": [
+    {{
+      "action": "アクション内容",
+      "priority": "high|medium|low",
+      "context": "コンテキスト（冗長なら省略）"
+    }}
+  ]
+}}{instructions}
+
+【テキスト】
+{text}"""
+
+_KNOWLEDGE_USER_PROMPT_EN = """Extract important knowledge from the following text.
+
+【Book Title】
+{book_title}
+
+【Output Format】
+Output in the following JSON format:
+
+{{
+  "main_topics": ["Topic 1", "Topic 2", ...],
+  "concepts": [
+    {{
+      "name": "Concept name",
+      "definition": "Definition",
+      "importance": "high|medium|low"
+    }}
+  ],
+  "facts": [
+    {{
+      "statement": "Fact statement",
+      "confidence": 0.9
+    }}
+  ],
+  "processes": [
+    {{
+      "name": "Process name",
+      "steps": ["Step 1", "Step 2"],
+      "description": "Description"
+    }}
+  ],
+  "insights": [
+    {{
+      "text": "Insight content",
+      "category": "Category",
+      "importance": "high|medium|low"
+    }}
+  ],
+  "action_items": [
+    {{
+      "action": "Action content",
+      "priority": "high|medium|low",
+      "context": "Context (omit if redundant)"
+    }}
+  ]
+}}{instructions}
+
+【Text】
+{text}"""
+
+_ENTITY_SYSTEM_PROMPT_JA = """あなたは固有表現抽出（NER）の専門家です。
+以下のエンティティタイプを抽出してください: {types_str}
+タイプ: person(人物)|organization(組織・企業)|location(地名・国名)|date(日付)|time(時刻)|technical_term(専門用語)|metric(数値・統計)|concept(概念)|other(その他)
+各エンティティに信頼度（0.0-1.0）を付与してください。"""
+
+_ENTITY_SYSTEM_PROMPT_EN = """You are a Named Entity Recognition (NER) expert.
+Extract the following entity types: {types_str}
+Types: person|organization|location|date|time|technical_term|metric(numbers, statistics)|concept|other
+Assign confidence score (0.0-1.0) to each entity."""
+
+_ENTITY_USER_PROMPT_JA = """以下のテキストからエンティティを抽出してください。
+
+【出力形式】
+JSON配列で出力してください：
+
+[
+  {{
+    "name": "エンティティ名",
+    "type": "person|organization|location|date|time|technical_term|metric|concept|other",
+    "description": "短い説明（不要なら省略）",
+    "confidence": 0.9
+  }}
+]
+
+【テキスト】
+{text}"""
+
+_ENTITY_USER_PROMPT_EN = """Extract entities from the following text.
+
+【Output Format】
+Output as JSON array:
+
+[
+  {{
+    "name": "Entity name",
+    "type": "person|organization|location|date|time|technical_term|metric|concept|other",
+    "description": "Short description (omit if redundant)",
+    "confidence": 0.9
+  }}
+]
+
+【Text】
+{text}"""
+
+_RELATIONSHIP_SYSTEM_PROMPT_JA = """あなたは関係性抽出の専門家です。
+以下の関係性タイプを抽出してください: {types_str}
+タイプ（AとBの関係）: is_a(一種)|part_of(一部)|causes(原因)|precedes(先行)|similar_to(類似)|related_to(関連)|contains(包含)|opposite_of(反対)
+各関係性に信頼度（0.0-1.0）を付与してください。"""
+
+_RELATIONSHIP_SYSTEM_PROMPT_EN = """You are a relationship extraction expert.
+Extract the following relationship types: {types_str}
+Types (A to B): is_a|part_of|causes|precedes|similar_to|related_to|contains|opposite_of
+Assign confidence score (0.0-1.0) to each relationship."""
+
+_RELATIONSHIP_USER_PROMPT_JA = """以下のテキストから、指定されたエンティティ間の関係性を抽出してください。
+
+【エンティティ】
+{entities_str}
+
+【出力形式】
+JSON配列で出力してください：
+
+[
+  {{
+    "subject": "主語エンティティ",
+    "predicate": "is_a|part_of|causes|precedes|similar_to|related_to|contains|opposite_of",
+    "object": "目的語エンティティ",
+    "confidence": 0.9,
+    "source_text": "根拠となる短い引用（省略可）"
+  }}
+]
+
+【テキスト】
+{text}"""
+
+_RELATIONSHIP_USER_PROMPT_EN = """Extract relationships between the specified entities from the following text.
+
+【Entities】
+{entities_str}
+
+【Output Format】
+Output as JSON array:
+
+[
+  {{
+    "subject": "Subject entity",
+    "predicate": "is_a|part_of|causes|precedes|similar_to|related_to|contains|opposite_of",
+    "object": "Object entity",
+    "confidence": 0.9,
+    "source_text": "Short supporting quote (optional)"
+  }}
+]
+
+【Text】
+{text}"""
+
+_KNOWLEDGE_BATCH_INSTRUCTIONS_JA = """
+
+テキストは「=== CHUNK i ===」で区切られた{chunk_count}個のチャンクです。
+チャンクごとに上記形式のオブジェクトを作成し、"chunk_id" を加えたJSON配列で出力してください：
+[{{"chunk_id": 1, "main_topics": [...], "concepts": [...], ...}}, ...]"""
+
+_KNOWLEDGE_BATCH_INSTRUCTIONS_EN = """
+
+The text consists of {chunk_count} chunks delimited by "=== CHUNK i ===".
+Create one object in the format above per chunk, add "chunk_id", and output a JSON array:
+[{{"chunk_id": 1, "main_topics": [...], "concepts": [...], ...}}, ...]"""
+
 
 class KnowledgeService:
     """ナレッジ抽出サービス"""
@@ -50,7 +780,10 @@ class KnowledgeService:
         Args:
             llm_service: LLMサービスインスタンス（Noneの場合は新規作成）
         """
-        self.llm = llm_service or LLMService(provider="anthropic")
+        self.llm = llm_service or LLMService(
+            provider="anthropic",
+            max_tokens=KNOWLEDGE_MAX_OUTPUT_TOKENS
+        )
         self.is_mock = self.llm.is_mock
 
     # ========== Phase 4-1: Knowledge Extraction ==========
@@ -85,6 +818,21 @@ class KnowledgeService:
                 "token_usage": dict
             }
         """
+        return _run_sync(self.aextract_knowledge(
+            text, book_title, language,
+            include_entities, include_relationships, min_confidence
+        ))
+
+    async def aextract_knowledge(
+        self,
+        text: str,
+        book_title: str,
+        language: Optional[str] = None,
+        include_entities: bool = True,
+        include_relationships: bool = True,
+        min_confidence: float = 0.5
+    ) -> Dict[str, Any]:
+        """extract_knowledge() の非同期版（チャンク単位のLLM呼び出しを並行実行）"""
         start_time = time.time()
 
         # 言語検出
@@ -102,26 +850,29 @@ class KnowledgeService:
                 text, book_title, language, include_entities, include_relationships
             )
 
+        # 並行呼び出しの合計を返すため、共有トークンカウンターをリセット
+        self.llm.reset_token_counter()
+
         # 1. 構造化ナレッジ抽出（概念、事実、プロセス、洞察、アクション）
-        structured_data = self._extract_structured_knowledge(
+        structured_data = await self._aextract_structured_knowledge(
             text, book_title, language
         )
 
         # 2. エンティティ抽出（オプション）
         entities = []
         if include_entities:
-            entities = self._extract_entities_internal(
+            entities = await self._aextract_entities_internal(
                 text, language, min_confidence
             )
-            structured_data["entities"] = entities
+            structured_data.entities = entities
 
         # 3. 関係性抽出（オプション）
         relationships = []
         if include_relationships and entities:
-            relationships = self._extract_relationships_internal(
+            relationships = await self._aextract_relationships_internal(
                 text, entities, language, min_confidence
             )
-            structured_data["relationships"] = relationships
+            structured_data.relationships = relationships
 
         # 品質スコア計算
         quality_score = self._calculate_quality_score(structured_data)
@@ -143,7 +894,50 @@ class KnowledgeService:
             "processing_time": processing_time
         }
 
-    def _extract_structured_knowledge(
+    async def _agenerate_chunks(
+        self,
+        system_prompt: str,
+        user_prompts: List[str],
+        json_kind: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        チャンクごとのプロンプトを並行してLLMに送信
+
+        出力上限で打ち切られた応答や、JSONが完結していない応答はキャッシュしない
+
+        Args:
+            system_prompt: 全チャンク共通のシステムプロンプト
+            user_prompts: チャンクごとのユーザープロンプト
+            json_kind: 応答に期待するJSONの種類（_extract_json の kind）
+
+        Returns:
+            生成結果のリスト（user_promptsと同じ順序）
+        """
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+        async def generate_one(prompt: str) -> Dict[str, Any]:
+            cache_key = _response_cache_key(self.llm, system_prompt, prompt)
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                return {"content": cached, "is_mock": False, "cached": True}
+
+            async with semaphore:
+                result = await self.llm.agenerate(
+                    prompt=prompt,
+                    system_prompt=system_prompt
+                )
+
+            if (
+                not result.get("is_mock")
+                and not result.get("truncated")
+                and _is_complete_json_response(result["content"], json_kind)
+            ):
+                _set_cached_response(cache_key, result["content"])
+            return result
+
+        return await asyncio.gather(*(generate_one(p) for p in user_prompts))
+
+    async def _aextract_structured_knowledge(
         self,
         text: str,
         book_title: str,
@@ -161,7 +955,7 @@ class KnowledgeService:
             StructuredKnowledge
         """
         # チャンク分割（長文対応）
-        chunks = self._split_into_chunks(text, max_length=3000)
+        chunks = _unique_chunks(self._split_into_chunks(text, max_length=3000))
 
         all_concepts = []
         all_facts = []
@@ -170,26 +964,31 @@ class KnowledgeService:
         all_action_items = []
         all_topics = []
 
-        for i, chunk in enumerate(chunks):
-            logger.debug(f"Processing chunk {i+1}/{len(chunks)}")
-
-            # プロンプト構築
-            system_prompt = self._build_knowledge_extraction_system_prompt(language)
-            user_prompt = self._build_knowledge_extraction_user_prompt(
-                chunk, book_title, language
-            )
+        # プロンプト構築（複数チャンクを1リクエストにまとめる）
+        system_prompt = self._build_knowledge_extraction_system_prompt(language)
+        template_tokens = len(system_prompt) + len(
+            self._build_knowledge_extraction_user_prompt("", book_title, language)
+        )
+        batches = self._batch_chunks(
+            chunks,
+            context_limit=LLM_CONTEXT_LIMITS.get(self.llm.provider, 100_000),
+            sys_tokens=template_tokens,
+            resp_tokens=self.llm.max_tokens,
+            max_chunks=max(1, self.llm.max_tokens // KNOWLEDGE_RESPONSE_TOKENS_PER_CHUNK)
+        )
+        user_prompts = [
+            self._build_knowledge_extraction_batch_prompt(batch, book_title, language)
+            for batch in batches
+        ]
 
-            # LLM生成
-            result = self.llm.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt
-            )
+        logger.debug(
+            f"Processing {len(chunks)} chunks in {len(batches)} requests concurrently"
+        )
 
-            # パース
-            parsed = self._parse_knowledge_extraction_response(
-                result["content"], language
-            )
+        # LLM生成（並行実行）
+        results = await self._agenerate_chunks(system_prompt, user_prompts)
 
+        def collect(parsed: Dict[str, Any]) -> None:
             all_concepts.extend(parsed["concepts"])
             all_facts.extend(parsed["facts"])
             all_processes.extend(parsed["processes"])
@@ -197,153 +996,194 @@ class KnowledgeService:
             all_action_items.extend(parsed["action_items"])
             all_topics.extend(parsed["main_topics"])
 
+        retry_chunks: List[str] = []
+        for batch, result in zip(batches, results):
+            # パース（打ち切られた配列からも完結した要素は回収する）
+            items, complete = self._knowledge_response_items(result["content"])
+            if len(batch) > 1 and not complete:
+                retry_chunks.extend(self._missing_batch_chunks(batch, items))
+            collect(self._parse_knowledge_items(items, language))
+
+        # 応答が打ち切られたバッチの未抽出チャンクは1件ずつ再リクエスト
+        if retry_chunks:
+            retry_prompts = [
+                self._build_knowledge_extraction_user_prompt(chunk, book_title, language)
+                for chunk in retry_chunks
+            ]
+            for result in await self._agenerate_chunks(system_prompt, retry_prompts):
+                collect(self._parse_knowledge_extraction_response(result["content"], language))
+
         # 重複削除
         unique_topics = list(set(all_topics))
 
         return StructuredKnowledge(
             book_title=book_title,
-            main_topics=unique_topics[:10],  # 上位10トピック
-            concepts=all_concepts[:20],
-            facts=all_facts[:30],
-            processes=all_processes[:10],
-            insights=all_insights[:15],
-            action_items=all_action_items[:15],
+            main_topics=unique_topics[:KNOWLEDGE_LIST_LIMITS["main_topics"]],  # 上位10トピック
+            concepts=all_concepts[:KNOWLEDGE_LIST_LIMITS["concepts"]],
+            facts=all_facts[:KNOWLEDGE_LIST_LIMITS["facts"]],
+            processes=all_processes[:KNOWLEDGE_LIST_LIMITS["processes"]],
+            insights=all_insights[:KNOWLEDGE_LIST_LIMITS["insights"]],
+            action_items=all_action_items[:KNOWLEDGE_LIST_LIMITS["action_items"]],
             entities=[],
             relationships=[]
         )
 
-    def _build_knowledge_extraction_system_prompt(self, language: str) -> str:
-        """ナレッジ抽出用システムプロンプト"""
-        if language == "ja":
-            return """あなたは書籍や文書から重要なナレッジを抽出する専門家です。
-以下の情報を抽出してください：
+    def _batch_chunks(
+        self,
+        chunks: List[str],
+        context_limit: int = 100_000,
+        sys_tokens: int = 500,
+        resp_tokens: int = 4000,
+        max_chunks: Optional[int] = None
+    ) -> List[List[str]]:
+        """
+        チャンクを1リクエストに収まる単位へ貪欲に詰める
 
-1. **主要トピック**: 文書の主要なテーマ（3-5個）
-2. **概念**: 重要な概念とその定義（重要度付き）
-3. **事実**: 重要な事実や統計データ
-4. **プロセス**: 説明されている手順やプロセス
-5. **洞察**: 重要な洞察や学び
-6. **アクションアイテム**: 実行可能な推奨事項
+        トークン数は文字数で見積もる（日本語では概ね1文字1トークンのため安全側）
 
-日本語で正確に抽出し、構造化された形式で出力してください。"""
-        else:
-            return """You are an expert at extracting important knowledge from books and documents.
-Extract the following information:
+        Args:
+            chunks: チャンクのリスト
+            context_limit: コンテキストウィンドウ（トークン）
+            sys_tokens: システムプロンプト・テンプレート分のトークン
+            resp_tokens: レスポンス用に確保するトークン
+            max_chunks: 1バッチあたりの最大チャンク数（出力トークン上限による制約）
 
-1. **Main Topics**: Key themes (3-5 topics)
-2. **Concepts**: Important concepts with definitions (with importance level)
-3. **Facts**: Important facts and statistics
-4. **Processes**: Described procedures or processes
-5. **Insights**: Key insights and learnings
-6. **Action Items**: Actionable recommendations
+        Returns:
+            バッチ（チャンクのリスト）のリスト
+        """
+        budget = max(1, context_limit - sys_tokens - resp_tokens)
+        max_chunks = max_chunks or len(chunks) or 1
 
-Extract accurately and output in a structured format."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
 
-    def _build_knowledge_extraction_user_prompt(
+        for chunk in chunks:
+            chunk_tokens = len(chunk)
+            if current and (
+                current_tokens + chunk_tokens > budget
+                or len(current) >= max_chunks
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(chunk)
+            current_tokens += chunk_tokens
+
+        if current:
+            batches.append(current)
+
+        # 末尾の小さなバッチは、入る場合は直前のバッチに統合
+        if len(batches) >= 2:
+            last, prev = batches[-1], batches[-2]
+            if (
+                len(prev) + len(last) <= max_chunks
+                and sum(map(len, prev)) + sum(map(len, last)) <= budget
+            ):
+                batches[-2] = prev + last
+                batches.pop()
+
+        return batches
+
+    def _build_knowledge_extraction_batch_prompt(
         self,
-        text: str,
+        chunks: List[str],
         book_title: str,
         language: str
     ) -> str:
-        """ナレッジ抽出用ユーザープロンプト"""
+        """複数チャンクをまとめたナレッジ抽出用ユーザープロンプト"""
+        if len(chunks) == 1:
+            return self._build_knowledge_extraction_user_prompt(
+                chunks[0], book_title, language
+            )
+
+        text = "\n\n".join(
+            f"=== CHUNK {i} ===\n{chunk}" for i, chunk in enumerate(chunks, 1)
+        )
+
         if language == "ja":
-            return f"""以下のテキストから重要なナレッジを抽出してください。
+            instructions = _KNOWLEDGE_BATCH_INSTRUCTIONS_JA.format(chunk_count=len(chunks))
+        else:
+            instructions = _KNOWLEDGE_BATCH_INSTRUCTIONS_EN.format(chunk_count=len(chunks))
 
-【書籍タイトル】
-{book_title}
+        return self._build_knowledge_extraction_user_prompt(
+            text, book_title, language, instructions
+        )
 
-【テキスト】
-{text}
+    def _build_knowledge_extraction_system_prompt(self, language: str) -> str:
+        """ナレッジ抽出用システムプロンプト"""
+        if language == "ja":
+            return _KNOWLEDGE_SYSTEM_PROMPT_JA
+        else:
+            return _KNOWLEDGE_SYSTEM_PROMPT_EN
 
-【出力形式】
-以下のJSON形式で出力してください：
+    def _build_knowledge_extraction_user_prompt(
+        self,
+        text: str,
+        book_title: str,
+        language: str,
+        instructions: str = ""
+    ) -> str:
+        """
+        ナレッジ抽出用ユーザープロンプト
 
-{{
-  "main_topics": ["トピック1", "トピック2", ...],
-  "concepts": [
-    {{
-      "name": "概念名",
-      "definition": "定義",
-      "importance": "high|medium|low"
-    }}
-  ],
-  "facts": [
-    {{
-      "statement": "事実の記述",
-      "confidence": 0.9
-    }}
-  ],
-  "processes": [
-    {{
-      "name": "プロセス名",
-      "steps": ["ステップ1", "ステップ2"],
-      "description": "説明"
-    }}
-  ],
-  "insights": [
-    {{
-      "text": "洞察の内容",
-      "category": "カテゴリ",
-      "importance": "high|medium|low"
-    }}
-  ],
-  "action_items": [
-    {{
-      "action": "アクション内容",
-      "priority": "high|medium|low",
-      "context": "コンテキスト"
-    }}
-  ]
-}}"""
+        チャンクごとに変わるテキストを末尾に置き、それより前を共通の
+        プレフィックスとしてプロンプトキャッシュが効くようにする
+        """
+        if language == "ja":
+            return _KNOWLEDGE_USER_PROMPT_JA.format(book_title=book_title, instructions=instructions, text=text)
         else:
-            return f"""Extract important knowledge from the following text.
+            return _KNOWLEDGE_USER_PROMPT_EN.format(book_title=book_title, instructions=instructions, text=text)
+
+    def _knowledge_response_items(self, response: str) -> Tuple[List[Any], bool]:
+        """
+        ナレッジ抽出レスポンスからチャンクごとの結果オブジェクトを取り出す
+
+        複数チャンクをまとめた場合は配列。配列が途中で打ち切られていても
+        完結した要素はすべて返す
+
+        Args:
+            response: LLMレスポンス
 
-【Book Title】
-{book_title}
+        Returns:
+            (結果オブジェクトのリスト, レスポンスのJSONが完結しているか)
+        """
+        scanned = _scan_first_json_array(response)
+        if scanned is not None:
+            items, closed = scanned
+            if not closed:
+                logger.warning(
+                    f"Incomplete JSON array in knowledge extraction response "
+                    f"({len(items)} complete items recovered)"
+                )
+            return items, closed
 
-【Text】
-{text}
+        parsed = _extract_json(response)
+        if parsed is None:
+            logger.warning("Failed to parse JSON from response")
+            return [], False
+        return (parsed if isinstance(parsed, list) else [parsed]), True
 
-【Output Format】
-Output in the following JSON format:
+    def _missing_batch_chunks(self, batch: List[str], items: List[Any]) -> List[str]:
+        """
+        打ち切られたバッチ応答に結果が含まれないチャンク
 
-{{
-  "main_topics": ["Topic 1", "Topic 2", ...],
-  "concepts": [
-    {{
-      "name": "Concept name",
-      "definition": "Definition",
-      "importance": "high|medium|low"
-    }}
-  ],
-  "facts": [
-    {{
-      "statement": "Fact statement",
-      "confidence": 0.9
-    }}
-  ],
-  "processes": [
-    {{
-      "name": "Process name",
-      "steps": ["Step 1", "Step 2"],
-      "description": "Description"
-    }}
-  ],
-  "insights": [
-    {{
-      "text": "Insight content",
-      "category": "Category",
-      "importance": "high|medium|low"
-    }}
-  ],
-  "action_items": [
-    {{
-      "action": "Action content",
-      "priority": "high|medium|low",
-      "context": "Context"
-    }}
-  ]
-}}"""
+        chunk_id があればそれで判定し、なければ先頭から順に完結したとみなす
+        """
+        done = set()
+        for position, item in enumerate(items, 1):
+            chunk_id = item.get("chunk_id", position) if isinstance(item, dict) else position
+            try:
+                done.add(int(chunk_id))
+            except (TypeError, ValueError):
+                done.add(position)
+
+        missing = [chunk for i, chunk in enumerate(batch, 1) if i not in done]
+        if missing:
+            logger.warning(
+                f"Knowledge extraction response truncated: re-requesting "
+                f"{len(missing)}/{len(batch)} chunks individually"
+            )
+        return missing
 
     def _parse_knowledge_extraction_response(
         self,
@@ -357,65 +1197,95 @@ Output in the following JSON format:
             response: LLMレスポンス
             language: 言語
 
+        Returns:
+            パースされた辞書
+        """
+        items, _ = self._knowledge_response_items(response)
+        return self._parse_knowledge_items(items, language)
+
+    def _parse_knowledge_items(
+        self,
+        items: List[Any],
+        language: str
+    ) -> Dict[str, Any]:
+        """
+        チャンクごとの結果オブジェクトを1つに統合してパース
+
+        Args:
+            items: 結果オブジェクトのリスト
+            language: 言語
+
         Returns:
             パースされた辞書
         """
         try:
-            # JSON抽出
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
-                logger.warning("Failed to parse JSON from response")
+            if not items:
                 return self._empty_knowledge_response()
 
-            # Pydanticモデルに変換
+            # チャンクごとの結果を1つに統合（リストでない値はそのチャンクの分だけ捨てる）
+            data = self._empty_knowledge_response()
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                for key in data:
+                    value = item.get(key)
+                    if isinstance(value, list):
+                        data[key].extend(value)
+                    elif value is not None:
+                        logger.warning(
+                            f"Ignoring non-list '{key}' in knowledge extraction response"
+                        )
+
+            # Pydanticモデルに変換（最終的に残る件数分のみ、検証済みの値で構築）
             concepts = [
-                Concept(
-                    name=c.get("name", ""),
-                    definition=c.get("definition", ""),
-                    importance=ImportanceLevel(c.get("importance", "medium"))
+                Concept.model_construct(
+                    name=str(c.get("name") or ""),
+                    definition=str(c.get("definition") or ""),
+                    importance=_importance(c.get("importance")),
+                    page_number=None
                 )
-                for c in data.get("concepts", [])
+                for c in _dict_items(data["concepts"], KNOWLEDGE_LIST_LIMITS["concepts"])
             ]
 
             facts = [
-                Fact(
-                    statement=f.get("statement", ""),
-                    confidence=f.get("confidence", 0.8)
+                Fact.model_construct(
+                    statement=str(f.get("statement") or ""),
+                    source_page=None,
+                    confidence=_confidence(f.get("confidence"), 0.8)
                 )
-                for f in data.get("facts", [])
+                for f in _dict_items(data["facts"], KNOWLEDGE_LIST_LIMITS["facts"])
             ]
 
             processes = [
-                Process(
-                    name=p.get("name", ""),
-                    steps=p.get("steps", []),
-                    description=p.get("description")
+                Process.model_construct(
+                    name=str(p.get("name") or ""),
+                    steps=[str(step) for step in p.get("steps") or [] if step is not None]
+                    if isinstance(p.get("steps"), list) else [],
+                    description=_optional_str(p.get("description"))
                 )
-                for p in data.get("processes", [])
+                for p in _dict_items(data["processes"], KNOWLEDGE_LIST_LIMITS["processes"])
             ]
 
             insights = [
-                Insight(
-                    text=i.get("text", ""),
-                    category=i.get("category", "general"),
-                    importance=ImportanceLevel(i.get("importance", "medium"))
+                Insight.model_construct(
+                    text=str(i.get("text") or ""),
+                    category=str(i.get("category") or "general"),
+                    importance=_importance(i.get("importance"))
                 )
-                for i in data.get("insights", [])
+                for i in _dict_items(data["insights"], KNOWLEDGE_LIST_LIMITS["insights"])
             ]
 
             action_items = [
-                ActionItem(
-                    action=a.get("action", ""),
-                    priority=ImportanceLevel(a.get("priority", "medium")),
-                    context=a.get("context")
+                ActionItem.model_construct(
+                    action=str(a.get("action") or ""),
+                    priority=_importance(a.get("priority")),
+                    context=_optional_str(a.get("context"))
                 )
-                for a in data.get("action_items", [])
+                for a in _dict_items(data["action_items"], KNOWLEDGE_LIST_LIMITS["action_items"])
             ]
 
             return {
-                "main_topics": data.get("main_topics", []),
+                "main_topics": [t for t in data["main_topics"] if isinstance(t, str)],
                 "concepts": concepts,
                 "facts": facts,
                 "processes": processes,
@@ -459,6 +1329,18 @@ Output in the following JSON format:
         Returns:
             エンティティのリスト
         """
+        return _run_sync(self.aextract_entities(
+            text, language, entity_types, min_confidence
+        ))
+
+    async def aextract_entities(
+        self,
+        text: str,
+        language: Optional[str] = None,
+        entity_types: Optional[List[EntityType]] = None,
+        min_confidence: float = 0.5
+    ) -> List[Entity]:
+        """extract_entities() の非同期版（チャンク単位のLLM呼び出しを並行実行）"""
         if language is None:
             language = self._detect_language(text)
 
@@ -467,11 +1349,11 @@ Output in the following JSON format:
         if self.is_mock:
             return self._extract_entities_mock(text, language)
 
-        return self._extract_entities_internal(
+        return await self._aextract_entities_internal(
             text, language, min_confidence, entity_types
         )
 
-    def _extract_entities_internal(
+    async def _aextract_entities_internal(
         self,
         text: str,
         language: str,
@@ -480,26 +1362,53 @@ Output in the following JSON format:
     ) -> List[Entity]:
         """内部エンティティ抽出ロジック"""
         # チャンク分割
-        chunks = self._split_into_chunks(text, max_length=2000)
+        chunks = _unique_chunks(self._split_into_chunks(text, max_length=2000))
 
         all_entities = []
 
-        for chunk in chunks:
-            system_prompt = self._build_entity_extraction_system_prompt(
-                language, entity_types
-            )
-            user_prompt = self._build_entity_extraction_user_prompt(
-                chunk, language
-            )
+        system_prompt = self._build_entity_extraction_system_prompt(
+            language, entity_types
+        )
+        user_prompts = [
+            self._build_entity_extraction_user_prompt(chunk, language)
+            for chunk in chunks
+        ]
 
-            result = self.llm.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt
-            )
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
 
-            entities = self._parse_entity_extraction_response(
-                result["content"], language
-            )
+        async def extract_chunk(prompt: str) -> List[Entity]:
+            cache_key = _response_cache_key(self.llm, system_prompt, prompt)
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                return [
+                    entity
+                    async for entity in self._parse_entity_extraction_stream(
+                        _replay_deltas(cached), language
+                    )
+                ]
+
+            # ストリーミングで受信し、要素が閉じた時点でEntity化
+            parts: List[str] = []
+            async with semaphore:
+                deltas = _record_deltas(
+                    self.llm.astream(prompt=prompt, system_prompt=system_prompt),
+                    parts
+                )
+                entities = [
+                    entity
+                    async for entity in self._parse_entity_extraction_stream(
+                        deltas, language
+                    )
+                ]
+
+            content = "".join(parts)
+            if not self.is_mock and _is_complete_json_response(content, "arr"):
+                _set_cached_response(cache_key, content)
+            return entities
+
+        results = await asyncio.gather(*(extract_chunk(p) for p in user_prompts))
+
+        for entities in results:
             all_entities.extend(entities)
 
         # 信頼度フィルタリング
@@ -521,35 +1430,9 @@ Output in the following JSON format:
         types_str = ", ".join([et.value for et in entity_types]) if entity_types else "all types"
 
         if language == "ja":
-            return f"""あなたは固有表現抽出（NER）の専門家です。
-以下のエンティティタイプを抽出してください: {types_str}
-
-- person: 人物名
-- organization: 組織名、企業名
-- location: 地名、国名
-- date: 日付
-- time: 時刻
-- technical_term: 専門用語、キーワード
-- metric: 数値、統計
-- concept: 概念
-- other: その他
-
-各エンティティに信頼度（0.0-1.0）を付与してください。"""
+            return _ENTITY_SYSTEM_PROMPT_JA.format(types_str=types_str)
         else:
-            return f"""You are a Named Entity Recognition (NER) expert.
-Extract the following entity types: {types_str}
-
-- person: Person names
-- organization: Organization names
-- location: Locations
-- date: Dates
-- time: Times
-- technical_term: Technical terms
-- metric: Metrics, numbers
-- concept: Concepts
-- other: Other
-
-Assign confidence score (0.0-1.0) to each entity."""
+            return _ENTITY_SYSTEM_PROMPT_EN.format(types_str=types_str)
 
     def _build_entity_extraction_user_prompt(
         self,
@@ -558,82 +1441,36 @@ Assign confidence score (0.0-1.0) to each entity."""
     ) -> str:
         """エンティティ抽出用ユーザープロンプト"""
         if language == "ja":
-            return f"""以下のテキストからエンティティを抽出してください。
-
-【テキスト】
-{text}
-
-【出力形式】
-JSON配列で出力してください：
-
-[
-  {{
-    "name": "エンティティ名",
-    "type": "person|organization|location|date|time|technical_term|metric|concept|other",
-    "description": "説明（オプション）",
-    "confidence": 0.9
-  }}
-]"""
+            return _ENTITY_USER_PROMPT_JA.format(text=text)
         else:
-            return f"""Extract entities from the following text.
-
-【Text】
-{text}
-
-【Output Format】
-Output as JSON array:
-
-[
-  {{
-    "name": "Entity name",
-    "type": "person|organization|location|date|time|technical_term|metric|concept|other",
-    "description": "Description (optional)",
-    "confidence": 0.9
-  }}
-]"""
+            return _ENTITY_USER_PROMPT_EN.format(text=text)
 
-    def _parse_entity_extraction_response(
+    async def _parse_entity_extraction_stream(
         self,
-        response: str,
+        deltas: AsyncIterator[str],
         language: str
-    ) -> List[Entity]:
-        """エンティティ抽出レスポンスをパース"""
-        try:
-            # JSON配列抽出
-            json_match = re.search(r'\[[\s\S]*\]', response)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
-                logger.warning("Failed to parse JSON array from response")
-                return []
-
-            entities = []
-            for item in data:
-                try:
-                    entity = Entity(
-                        name=item.get("name", ""),
-                        type=EntityType(item.get("type", "other")),
-                        description=item.get("description"),
-                        confidence=item.get("confidence", 0.7),
-                        source_text=item.get("source_text")
-                    )
-                    entities.append(entity)
-                except Exception as e:
-                    logger.warning(f"Failed to parse entity: {e}")
-                    continue
-
-            return entities
-
-        except Exception as e:
-            logger.error(f"Failed to parse entity extraction response: {e}")
-            return []
+    ) -> AsyncIterator[Entity]:
+        """エンティティ抽出のストリーミングレスポンスをパース（要素ごとに返す）"""
+        async for item in _iter_json_array_items(deltas):
+            try:
+                yield Entity(
+                    name=item.get("name", ""),
+                    type=EntityType(item.get("type", "other")),
+                    description=item.get("description"),
+                    confidence=item.get("confidence", 0.7)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to parse entity: {e}")
+                continue
 
     def _deduplicate_entities(self, entities: List[Entity]) -> List[Entity]:
         """エンティティの重複削除"""
-        seen = {}
+        # 初出順を保ったまま、同一キーは信頼度の高い方を残す
+        seen: Dict[Tuple[str, str], Entity] = {}
         for entity in entities:
-            key = (entity.name.lower(), entity.type)
-            if key not in seen or entity.confidence > seen[key].confidence:
+            key = (_normalize_name(entity.name), entity.type.value)
+            kept = seen.get(key)
+            if kept is None or entity.confidence > kept.confidence:
                 seen[key] = entity
         return list(seen.values())
 
@@ -660,6 +1497,19 @@ Output as JSON array:
         Returns:
             関係性のリスト
         """
+        return _run_sync(self.aextract_relationships(
+            text, entities, language, relation_types, min_confidence
+        ))
+
+    async def aextract_relationships(
+        self,
+        text: str,
+        entities: List[Entity],
+        language: Optional[str] = None,
+        relation_types: Optional[List[RelationType]] = None,
+        min_confidence: float = 0.5
+    ) -> List[Relationship]:
+        """extract_relationships() の非同期版（チャンク単位のLLM呼び出しを並行実行）"""
         if language is None:
             language = self._detect_language(text)
 
@@ -671,11 +1521,11 @@ Output as JSON array:
         if self.is_mock:
             return self._extract_relationships_mock(entities, language)
 
-        return self._extract_relationships_internal(
+        return await self._aextract_relationships_internal(
             text, entities, language, min_confidence, relation_types
         )
 
-    def _extract_relationships_internal(
+    async def _aextract_relationships_internal(
         self,
         text: str,
         entities: List[Entity],
@@ -687,27 +1537,38 @@ Output as JSON array:
         if not entities:
             return []
 
-        # エンティティ名リスト
-        entity_names = [e.name for e in entities]
+        # エンティティ名リスト（照合用に小文字化したものと組で保持）
+        entity_names = [(e.name, _normalize_name(e.name)) for e in entities if e.name]
 
         # チャンク分割
-        chunks = self._split_into_chunks(text, max_length=2000)
+        chunks = _unique_chunks(self._split_into_chunks(text, max_length=2000))
 
         all_relationships = []
 
+        system_prompt = self._build_relationship_extraction_system_prompt(
+            language, relation_types
+        )
+
+        # チャンク内に出現するエンティティのみを渡し、2つ未満のチャンクは送信しない
+        user_prompts = []
         for chunk in chunks:
-            system_prompt = self._build_relationship_extraction_system_prompt(
-                language, relation_types
-            )
-            user_prompt = self._build_relationship_extraction_user_prompt(
-                chunk, entity_names, language
-            )
+            folded = chunk.casefold()
+            present = [name for name, key in entity_names if key in folded]
+            if len(present) >= 2:
+                user_prompts.append(
+                    self._build_relationship_extraction_user_prompt(
+                        chunk, present, language
+                    )
+                )
 
-            result = self.llm.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt
-            )
+        logger.debug(
+            f"Relationship extraction: {len(user_prompts)}/{len(chunks)} chunks "
+            f"contain two or more entities"
+        )
 
+        results = await self._agenerate_chunks(system_prompt, user_prompts, "arr")
+
+        for result in results:
             relationships = self._parse_relationship_extraction_response(
                 result["content"], language
             )
@@ -732,33 +1593,9 @@ Output as JSON array:
         types_str = ", ".join([rt.value for rt in relation_types]) if relation_types else "all types"
 
         if language == "ja":
-            return f"""あなたは関係性抽出の専門家です。
-以下の関係性タイプを抽出してください: {types_str}
-
-- is_a: AはBの一種
-- part_of: AはBの一部
-- causes: AによってBが起こる
-- precedes: AはBの前に起こる
-- similar_to: AはBに類似
-- related_to: AはBに関連
-- contains: AはBを含む
-- opposite_of: AはBの反対
-
-各関係性に信頼度（0.0-1.0）を付与してください。"""
+            return _RELATIONSHIP_SYSTEM_PROMPT_JA.format(types_str=types_str)
         else:
-            return f"""You are a relationship extraction expert.
-Extract the following relationship types: {types_str}
-
-- is_a: A is a type of B
-- part_of: A is part of B
-- causes: A causes B
-- precedes: A precedes B
-- similar_to: A is similar to B
-- related_to: A is related to B
-- contains: A contains B
-- opposite_of: A is opposite of B
-
-Assign confidence score (0.0-1.0) to each relationship."""
+            return _RELATIONSHIP_SYSTEM_PROMPT_EN.format(types_str=types_str)
 
     def _build_relationship_extraction_user_prompt(
         self,
@@ -770,47 +1607,9 @@ Assign confidence score (0.0-1.0) to each relationship."""
         entities_str = ", ".join(entity_names[:30])  # 最大30エンティティ
 
         if language == "ja":
-            return f"""以下のテキストから、指定されたエンティティ間の関係性を抽出してください。
-
-【エンティティ】
-{entities_str}
-
-【テキスト】
-{text}
-
-【出力形式】
-JSON配列で出力してください：
-
-[
-  {{
-    "subject": "主語エンティティ",
-    "predicate": "is_a|part_of|causes|precedes|similar_to|related_to|contains|opposite_of",
-    "object": "目的語エンティティ",
-    "confidence": 0.9,
-    "source_text": "抽出元のテキスト（オプション）"
-  }}
-]"""
+            return _RELATIONSHIP_USER_PROMPT_JA.format(entities_str=entities_str, text=text)
         else:
-            return f"""Extract relationships between the specified entities from the following text.
-
-【Entities】
-{entities_str}
-
-【Text】
-{text}
-
-【Output Format】
-Output as JSON array:
-
-[
-  {{
-    "subject": "Subject entity",
-    "predicate": "is_a|part_of|causes|precedes|similar_to|related_to|contains|opposite_of",
-    "object": "Object entity",
-    "confidence": 0.9,
-    "source_text": "Source text (optional)"
-  }}
-]"""
+            return _RELATIONSHIP_USER_PROMPT_EN.format(entities_str=entities_str, text=text)
 
     def _parse_relationship_extraction_response(
         self,
@@ -820,10 +1619,8 @@ Output as JSON array:
         """関係性抽出レスポンスをパース"""
         try:
             # JSON配列抽出
-            json_match = re.search(r'\[[\s\S]*\]', response)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
+            data = _extract_json(response, "arr")
+            if data is None:
                 logger.warning("Failed to parse JSON array from response")
                 return []
 
@@ -853,14 +1650,15 @@ Output as JSON array:
         relationships: List[Relationship]
     ) -> List[Relationship]:
         """関係性の重複削除"""
-        seen = {}
+        seen: Dict[Tuple[str, str, str], Relationship] = {}
         for rel in relationships:
             key = (
-                rel.subject.lower(),
-                rel.predicate,
-                rel.object.lower()
+                _normalize_name(rel.subject),
+                rel.predicate.value,
+                _normalize_name(rel.object)
             )
-            if key not in seen or rel.confidence > seen[key].confidence:
+            kept = seen.get(key)
+            if kept is None or rel.confidence > kept.confidence:
                 seen[key] = rel
         return list(seen.values())
 
@@ -888,12 +1686,14 @@ Output as JSON array:
             f"and {len(relationships)} edges"
         )
 
+        # エンティティ名 -> ノードID（エッジ作成でも再利用）
+        id_map = {e.name: _node_id(e.name) for e in entities}
+
         # ノード作成
         nodes = []
         for entity in entities:
-            node_id = self._sanitize_node_id(entity.name)
             node = KnowledgeGraphNode(
-                id=node_id,
+                id=id_map[entity.name],
                 label=entity.name,
                 type=entity.type,
                 properties={
@@ -905,14 +1705,13 @@ Output as JSON array:
 
         # エッジ作成
         edges = []
-        node_ids = {self._sanitize_node_id(e.name) for e in entities}
 
         for rel in relationships:
-            source_id = self._sanitize_node_id(rel.subject)
-            target_id = self._sanitize_node_id(rel.object)
+            source_id = id_map.get(rel.subject)
+            target_id = id_map.get(rel.object)
 
             # 両方のノードが存在する場合のみエッジ追加
-            if source_id in node_ids and target_id in node_ids:
+            if source_id and target_id:
                 edge = KnowledgeGraphEdge(
                     source=source_id,
                     target=target_id,
@@ -933,105 +1732,65 @@ Output as JSON array:
 
     def _sanitize_node_id(self, name: str) -> str:
         """ノードID生成（ASCII安全）"""
-        # 日本語などを含む場合は簡易ハッシュ
-        import hashlib
-        return hashlib.md5(name.encode()).hexdigest()[:16]
+        return _node_id(name)
 
     # ========== Phase 4-2: YAML/JSON Formatting ==========
 
     def format_as_yaml(self, structured_data: StructuredKnowledge) -> str:
         """YAML形式に変換"""
-        # Pydanticモデルを辞書に変換
-        data_dict = structured_data.model_dump()
-        return yaml.dump(data_dict, allow_unicode=True, sort_keys=False)
+        # Pydanticモデルを辞書に変換（Enumは値に変換してsafe_loadで読めるようにする）
+        data_dict = structured_data.model_dump(mode="json")
+        return yaml.dump(
+            data_dict, Dumper=_YAML_DUMPER, allow_unicode=True, sort_keys=False
+        )
 
     def format_as_json(self, structured_data: StructuredKnowledge) -> str:
         """JSON形式に変換"""
-        data_dict = structured_data.model_dump()
+        data_dict = structured_data.model_dump(mode="json")
         return json.dumps(data_dict, ensure_ascii=False, indent=2)
 
     def format_as_markdown(self, structured_data: StructuredKnowledge) -> str:
         """Markdown形式に変換"""
-        lines = [f"# {structured_data.book_title}", ""]
-
-        # Main Topics
-        if structured_data.main_topics:
-            lines.append("## 主要トピック")
-            for topic in structured_data.main_topics:
-                lines.append(f"- {topic}")
-            lines.append("")
-
-        # Concepts
-        if structured_data.concepts:
-            lines.append("## 概念")
-            for concept in structured_data.concepts:
-                lines.append(f"### {concept.name} ({concept.importance})")
-                lines.append(f"{concept.definition}")
-                lines.append("")
-
-        # Facts
-        if structured_data.facts:
-            lines.append("## 事実")
-            for fact in structured_data.facts:
-                lines.append(f"- {fact.statement} (信頼度: {fact.confidence:.2f})")
-            lines.append("")
-
-        # Processes
-        if structured_data.processes:
-            lines.append("## プロセス")
-            for process in structured_data.processes:
-                lines.append(f"### {process.name}")
-                if process.description:
-                    lines.append(f"{process.description}")
-                for i, step in enumerate(process.steps, 1):
-                    lines.append(f"{i}. {step}")
-                lines.append("")
-
-        # Insights
-        if structured_data.insights:
-            lines.append("## 洞察")
-            for insight in structured_data.insights:
-                lines.append(
-                    f"- **{insight.category}** ({insight.importance}): {insight.text}"
-                )
-            lines.append("")
-
-        # Action Items
-        if structured_data.action_items:
-            lines.append("## アクションアイテム")
-            for action in structured_data.action_items:
-                lines.append(f"- [{action.priority}] {action.action}")
-                if action.context:
-                    lines.append(f"  - {action.context}")
-            lines.append("")
-
-        return "\n".join(lines)
+        return "\n".join(chain(
+            (f"# {structured_data.book_title}", ""),
+            _md_topics(structured_data.main_topics),
+            _md_concepts(structured_data.concepts),
+            _md_facts(structured_data.facts),
+            _md_processes(structured_data.processes),
+            _md_insights(structured_data.insights),
+            _md_action_items(structured_data.action_items),
+        ))
 
     def format_relationships_as_csv(
         self,
         relationships: List[Relationship]
     ) -> str:
         """関係性をCSV形式に変換"""
-        import csv
-        import io
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # ヘッダー
-        writer.writerow([
-            "Subject", "Predicate", "Object", "Confidence", "Source Text"
-        ])
-
-        # データ
-        for rel in relationships:
-            writer.writerow([
+        rows = [
+            (
                 rel.subject,
                 rel.predicate.value,
                 rel.object,
                 f"{rel.confidence:.2f}",
                 rel.source_text or ""
-            ])
+            )
+            for rel in relationships
+        ]
+
+        # クォート不要な値のみの場合は結合のみで出力（csv.writerと同一の結果）
+        if not any(
+            _CSV_UNSAFE_RE.search(row[0]) or _CSV_UNSAFE_RE.search(row[2])
+            or _CSV_UNSAFE_RE.search(row[4])
+            for row in rows
+        ):
+            return "".join(
+                f"{','.join(row)}\r\n" for row in chain((_CSV_HEADER,), rows)
+            )
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(_CSV_HEADER)
+        writer.writerows(rows)
 
         return output.getvalue()
 
@@ -1039,13 +1798,10 @@ Output as JSON array:
 
     def _detect_language(self, text: str) -> str:
         """言語自動検出（簡易版）"""
-        # 日本語文字の割合をチェック
-        japanese_chars = sum(
-            1 for c in text if '\u3040' <= c <= '\u309F' or  # ひらがな
-            '\u30A0' <= c <= '\u30FF' or  # カタカナ
-            '\u4E00' <= c <= '\u9FFF'     # 漢字
-        )
-        total_chars = len(text)
+        # 先頭のサンプルで日本語文字の割合をチェック
+        sample = text[:LANGUAGE_DETECTION_SAMPLE_SIZE]
+        japanese_chars = len(_JP_CHAR_RE.findall(sample))
+        total_chars = len(sample)
 
         if total_chars > 0 and japanese_chars / total_chars > 0.1:
             return "ja"
@@ -1071,26 +1827,26 @@ Output as JSON array:
         if len(text) <= max_length:
             return [text]
 
+        # 文の区切り位置（区切り文字の直後）を一度だけ求める
+        bounds = [m.end() for m in _SENTENCE_BOUNDARY_RE.finditer(text)]
+
         chunks = []
         start = 0
 
-        while start < len(text):
+        while True:
             end = start + max_length
-            chunk = text[start:end]
-
-            # 文の途中で切れないように調整
-            if end < len(text):
-                last_period = max(
-                    chunk.rfind('。'),
-                    chunk.rfind('.'),
-                    chunk.rfind('\n')
-                )
-                if last_period > max_length // 2:
-                    chunk = chunk[:last_period + 1]
-                    end = start + last_period + 1
+            if end >= len(text):
+                chunks.append(text[start:])
+                break
+
+            # 文の途中で切れないように、範囲内で最後の区切り位置に調整
+            idx = bisect_right(bounds, end) - 1
+            if idx >= 0 and bounds[idx] - start > max_length // 2 + 1:
+                end = bounds[idx]
 
-            chunks.append(chunk)
-            start = end - overlap
+            chunks.append(text[start:end])
+            # チャンクがオーバーラップより短いと先に進まないため、その場合は重ねない
+            start = end - overlap if end - overlap > start else end
 
         return chunks
 
@@ -1107,31 +1863,17 @@ Output as JSON array:
         Returns:
             品質スコア (0.0-1.0)
         """
-        score = 0.0
-        weights = {
-            "main_topics": 0.15,
-            "concepts": 0.25,
-            "facts": 0.15,
-            "processes": 0.1,
-            "insights": 0.2,
-            "action_items": 0.15
-        }
+        # 各カテゴリの有無をビットに詰めて、事前計算したスコアを引く
+        mask = (
+            bool(structured_data.main_topics)
+            | bool(structured_data.concepts) << 1
+            | bool(structured_data.facts) << 2
+            | bool(structured_data.processes) << 3
+            | bool(structured_data.insights) << 4
+            | bool(structured_data.action_items) << 5
+        )
 
-        # 各カテゴリの存在をチェック
-        if structured_data.main_topics:
-            score += weights["main_topics"]
-        if structured_data.concepts:
-            score += weights["concepts"]
-        if structured_data.facts:
-            score += weights["facts"]
-        if structured_data.processes:
-            score += weights["processes"]
-        if structured_data.insights:
-            score += weights["insights"]
-        if structured_data.action_items:
-            score += weights["action_items"]
-
-        return min(score, 1.0)
+        return _QUALITY_SCORE_TABLE[mask]
 
     # ========== Mock Methods ==========
 
@@ -1204,36 +1946,7 @@ Output as JSON array:
         language: str
     ) -> List[Entity]:
         """モックエンティティ抽出"""
-        if language == "ja":
-            return [
-                Entity(
-                    name="機械学習",
-                    type=EntityType.TECHNICAL_TERM,
-                    description="データから学習するアルゴリズム",
-                    confidence=0.95
-                ),
-                Entity(
-                    name="深層学習",
-                    type=EntityType.TECHNICAL_TERM,
-                    description="多層ニューラルネットワークを使用",
-                    confidence=0.9
-                )
-            ]
-        else:
-            return [
-                Entity(
-                    name="Machine Learning",
-                    type=EntityType.TECHNICAL_TERM,
-                    description="Algorithms that learn from data",
-                    confidence=0.95
-                ),
-                Entity(
-                    name="Deep Learning",
-                    type=EntityType.TECHNICAL_TERM,
-                    description="Uses multi-layer neural networks",
-                    confidence=0.9
-                )
-            ]
+        return list(_mock_entities(language))
 
     def _extract_relationships_mock(
         self,
@@ -1244,15 +1957,7 @@ Output as JSON array:
         if len(entities) < 2:
             return []
 
-        return [
-            Relationship(
-                subject=entities[0].name,
-                predicate=RelationType.IS_A,
-                object="人工知能" if language == "ja" else "Artificial Intelligence",
-                confidence=0.9,
-                source_text="機械学習は人工知能の一種である" if language == "ja" else "ML is a type of AI"
-            )
-        ]
+        return list(_mock_relationships(entities[0].name, language))
 
 
 # ========== Database Operations ==========
@@ -1264,7 +1969,8 @@ def save_knowledge_to_db(
     format: str,
     yaml_text: str,
     content_blob: Optional[bytes],
-    score: float
+    score: float,
+    refresh: bool = False
 ) -> Knowledge:
     """
     ナレッジをDBに保存
@@ -1277,6 +1983,8 @@ def save_knowledge_to_db(
         yaml_text: YAMLテキスト
         content_blob: バイナリコンテンツ
         score: 品質スコア
+        refresh: コミット後にDBから全カラムを再読み込みする
+            （id と created_at は INSERT 時に取得済みのため通常は不要）
 
     Returns:
         保存されたKnowledgeモデル
@@ -1291,13 +1999,43 @@ def save_knowledge_to_db(
     )
     db.add(knowledge)
     db.commit()
-    db.refresh(knowledge)
+    if refresh:
+        db.refresh(knowledge)
 
     logger.info(f"Saved knowledge to DB: id={knowledge.id}, book_title={book_title}")
 
     return knowledge
 
 
+def save_knowledge_to_db_many(
+    db: Session,
+    rows: List[Dict[str, Any]]
+) -> List[int]:
+    """
+    複数のナレッジを1回のINSERT・1回のコミットで保存
+
+    Args:
+        db: DBセッション
+        rows: save_knowledge_to_db と同じキー（user_id, book_title, format,
+              yaml_text, content_blob, score）を持つ辞書のリスト
+
+    Returns:
+        保存されたナレッジIDのリスト（rowsと同じ順序）
+    """
+    if not rows:
+        return []
+
+    ids = list(db.execute(
+        insert(Knowledge).returning(Knowledge.id, sort_by_parameter_order=True),
+        rows
+    ).scalars())
+    db.commit()
+
+    logger.info(f"Saved {len(ids)} knowledge entries to DB")
+
+    return ids
+
+
 def get_knowledge_by_id(db: Session, knowledge_id: int, user_id: int) -> Optional[Knowledge]:
     """IDでナレッジ取得 (ユーザーフィルタリング)"""
     return db.query(Knowledge).filter(
@@ -1309,13 +2047,27 @@ def get_knowledge_by_id(db: Session, knowledge_id: int, user_id: int) -> Optiona
 def get_knowledge_by_book_title(
     db: Session,
     book_title: str,
-    user_id: int
+    user_id: int,
+    limit: int = 50
 ) -> List[Knowledge]:
-    """書籍タイトルでナレッジ取得 (ユーザーフィルタリング)"""
-    return db.query(Knowledge).filter(
-        Knowledge.book_title == book_title,
-        Knowledge.user_id == user_id
-    ).order_by(Knowledge.created_at.desc()).all()
+    """
+    書籍タイトルでナレッジ取得 (ユーザーフィルタリング)
+
+    一覧表示に使う列のみを読み込む（yaml_text・content_blobは未ロード）。
+    ix_knowledge_user_title_created により並べ替えなしで新しい順に取得する
+    """
+    return db.query(Knowledge).options(
+        load_only(
+            Knowledge.id,
+            Knowledge.book_title,
+            Knowledge.format,
+            Knowledge.score,
+            Knowledge.created_at
+        )
+    ).filter(
+        Knowledge.user_id == user_id,
+        Knowledge.book_title == book_title
+    ).order_by(Knowledge.created_at.desc()).limit(limit).all()
 
 
 def get_text_from_job(db: Session, job_id: str, user_id: int) -> Tuple[Optional[str], Optional[str]]:
@@ -1330,31 +2082,37 @@ def get_text_from_job(db: Session, job_id: str, user_id: int) -> Tuple[Optional[
     Returns:
         (text, book_title) または (None, None)
     """
-    job = db.query(Job).filter(
+    # OCRテキストのみを取得（ジョブの所有者チェックはJOINで同時に行う）
+    # ページ数が多い場合に備え、サーバーサイドカーソルで少しずつ読み込む
+    rows = iter(db.query(OCRResult.text).join(
+        Job, Job.id == OCRResult.job_id
+    ).filter(
         Job.id == job_id,
         Job.user_id == user_id
-    ).first()
-    if not job:
-        logger.warning(f"Job not found: {job_id}")
-        return None, None
-
-    # OCR結果を取得
-    ocr_results = db.query(OCRResult).filter(
-        OCRResult.job_id == job_id
-    ).order_by(OCRResult.page_number).all()
-
-    if not ocr_results:
-        logger.warning(f"No OCR results found for job: {job_id}")
+    ).order_by(OCRResult.page_num).yield_per(100))
+
+    first = next(rows, None)
+    if first is None:
+        # 結果が空の場合のみ、ジョブ自体の有無を確認してログを出し分ける
+        job_exists = db.scalar(select(exists().where(
+            Job.id == job_id,
+            Job.user_id == user_id
+        )))
+        if not job_exists:
+            logger.warning(f"Job not found: {job_id}")
+        else:
+            logger.warning(f"No OCR results found for job: {job_id}")
         return None, None
 
-    # テキスト結合
-    text = "\n\n".join([r.text for r in ocr_results if r.text])
+    # テキスト結合（行オブジェクトのリストは作らない）
+    first_text = first.text
+    text = "\n\n".join(t for t in chain((first_text,), (t for (t,) in rows)) if t)
 
     # 書籍タイトル（最初のOCR結果から推測、または空文字列）
     book_title = ""
-    if ocr_results and ocr_results[0].text:
+    if first_text:
         # 最初の行をタイトルとする（簡易版）
-        first_line = ocr_results[0].text.split('\n')[0]
+        first_line = first_text.partition('\n')[0]
         book_title = first_line[:100]  # 最大100文字
 
     return text, book_title
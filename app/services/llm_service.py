@@ -3,8 +3,15 @@ LLM Service for RAG
 
 LangChain統合、Claude/GPT-4クライアント設定、APIキー管理
 """
+import asyncio
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
@@ -15,22 +22,153 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# RAG用のデフォルトシステムプロンプト
+_DEFAULT_RAG_SYSTEM_PROMPT = (
+    "あなたは親切で正確なアシスタントです。"
+    "提供されたコンテキスト情報を基に、ユーザーの質問に答えてください。"
+    "コンテキストに情報がない場合は、正直にそう伝えてください。"
+)
+
+# RAG用のユーザープロンプト（str.format 用テンプレート）
+_RAG_USER_PROMPT = """以下のコンテキスト情報を参考にして、質問に答えてください。
+
+【コンテキスト】
+{context}
+
+【質問】
+{query}
+
+【回答】
+"""
+
+# 同一RAGリクエストの結果を共有する期間（秒）と件数上限
+RAG_RESULT_CACHE_TTL = 30.0
+RAG_RESULT_CACHE_MAX_SIZE = 256
+
+_rag_result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_rag_inflight: Dict[str, Future] = {}
+_rag_lock = threading.Lock()
+
+# RAGコンテキストのドキュメント区切りと見出し（よく使う件数分を事前生成）
+_CONTEXT_DOC_SEPARATOR = "\n\n---\n\n"
+_CONTEXT_DOC_HEADERS = tuple(f"Document {i + 1}:\n" for i in range(128))
+
 
 class TokenCounterCallback(BaseCallbackHandler):
-    """トークン数カウント用コールバック"""
+    """トークン数カウント用コールバック（スレッドセーフ）"""
 
     def __init__(self):
         self.total_tokens = 0
         self.prompt_tokens = 0
         self.completion_tokens = 0
+        self._lock = threading.Lock()
 
     def on_llm_end(self, response, **kwargs):
         """LLM完了時にトークン数を集計"""
         if hasattr(response, 'llm_output') and response.llm_output:
             token_usage = response.llm_output.get('token_usage', {})
-            self.total_tokens += token_usage.get('total_tokens', 0)
-            self.prompt_tokens += token_usage.get('prompt_tokens', 0)
-            self.completion_tokens += token_usage.get('completion_tokens', 0)
+            total = token_usage.get('total_tokens', 0)
+            prompt = token_usage.get('prompt_tokens', 0)
+            completion = token_usage.get('completion_tokens', 0)
+            with self._lock:
+                self.total_tokens += total
+                self.prompt_tokens += prompt
+                self.completion_tokens += completion
+
+    def usage(self) -> Dict[str, int]:
+        """集計済みトークン数"""
+        with self._lock:
+            return {
+                "total": self.total_tokens,
+                "prompt": self.prompt_tokens,
+                "completion": self.completion_tokens
+            }
+
+    def reset(self):
+        """集計をリセット"""
+        with self._lock:
+            self.total_tokens = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+
+def _backoff_delay(error: Exception, retry_delay: float, attempt: int) -> float:
+    """
+    リトライ待機秒数（指数バックオフ + フルジッター）
+
+    レート制限エラーで Retry-After ヘッダーがあればその値を優先する
+
+    Args:
+        error: 直前の例外
+        retry_delay: 基準待機秒数
+        attempt: 試行回数（0始まり）
+
+    Returns:
+        待機秒数
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+
+    return random.uniform(0, retry_delay * (2 ** attempt))
+
+
+def _is_truncated(response: Any) -> bool:
+    """出力トークン上限で生成が打ち切られたか（OpenAI: finish_reason, Anthropic: stop_reason）"""
+    metadata = getattr(response, "response_metadata", None) or {}
+    return (
+        metadata.get("finish_reason") == "length"
+        or metadata.get("stop_reason") == "max_tokens"
+    )
+
+
+@lru_cache(maxsize=256)
+def _mock_response(prompt_head: str) -> str:
+    """モックレスポンス本文（プロンプト先頭100文字ごとにキャッシュ）"""
+    return (
+        f"[MOCK RESPONSE]\n\n"
+        f"これはモックレスポンスです。実際のLLM APIキーが設定されていません。\n\n"
+        f"受信したプロンプト（最初の100文字）:\n"
+        f"{prompt_head}...\n\n"
+        f"本番環境では、ANTHROPIC_API_KEYまたはOPENAI_API_KEYを設定してください。"
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_client(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: int
+):
+    """
+    LangChainクライアント作成（設定ごとにキャッシュして接続を再利用）
+
+    トークンカウンターは呼び出しごとに config で渡すため、
+    クライアント自体には呼び出し単位の状態を持たせない
+    """
+    if provider == "anthropic":
+        return ChatAnthropic(
+            model=model,
+            anthropic_api_key=settings.ANTHROPIC_API_KEY,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+    return ChatOpenAI(
+        model=model,
+        openai_api_key=settings.OPENAI_API_KEY,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        request_timeout=timeout
+    )
 
 
 class LLMService:
@@ -88,24 +226,14 @@ class LLMService:
 
     def _create_anthropic_client(self) -> ChatAnthropic:
         """Anthropic (Claude) クライアント作成"""
-        return ChatAnthropic(
-            model=self.model,
-            anthropic_api_key=settings.ANTHROPIC_API_KEY,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            timeout=self.timeout,
-            callbacks=[self.token_callback]
+        return _build_client(
+            "anthropic", self.model, self.temperature, self.max_tokens, self.timeout
         )
 
     def _create_openai_client(self) -> ChatOpenAI:
         """OpenAI (GPT-4) クライアント作成"""
-        return ChatOpenAI(
-            model=self.model,
-            openai_api_key=settings.OPENAI_API_KEY,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            request_timeout=self.timeout,
-            callbacks=[self.token_callback]
+        return _build_client(
+            "openai", self.model, self.temperature, self.max_tokens, self.timeout
         )
 
     def generate(
@@ -129,7 +257,8 @@ class LLMService:
                 "content": "生成されたテキスト",
                 "tokens": {"total": 100, "prompt": 50, "completion": 50},
                 "model": "claude-3-sonnet-20240229",
-                "is_mock": False
+                "is_mock": False,
+                "truncated": False  # 出力上限で打ち切られた場合True
             }
         """
         # モックモード
@@ -154,42 +283,178 @@ class LLMService:
             try:
                 logger.debug(f"LLM generation attempt {attempt + 1}/{retry_count}")
 
-                # リセットトークンカウンター
-                self.token_callback.total_tokens = 0
-                self.token_callback.prompt_tokens = 0
-                self.token_callback.completion_tokens = 0
-
-                # 生成実行
-                response = self.client.invoke(messages)
+                # 呼び出し単位のトークンカウンター（共有カウンターにも加算する）
+                call_counter = TokenCounterCallback()
+                response = self.client.invoke(
+                    messages,
+                    config={"callbacks": [call_counter, self.token_callback]}
+                )
 
-                result = {
+                logger.info(
+                    f"LLM generation successful. Tokens: {call_counter.total_tokens}"
+                )
+                return {
                     "content": response.content,
-                    "tokens": {
-                        "total": self.token_callback.total_tokens,
-                        "prompt": self.token_callback.prompt_tokens,
-                        "completion": self.token_callback.completion_tokens
-                    },
+                    "tokens": call_counter.usage(),
                     "model": self.model,
-                    "is_mock": False
+                    "is_mock": False,
+                    "truncated": _is_truncated(response)
                 }
 
+            except Exception as e:
+                last_error = e
+                logger.warning(
+                    f"LLM generation failed (attempt {attempt + 1}/{retry_count}): {e}"
+                )
+
+                if attempt < retry_count - 1:
+                    time.sleep(_backoff_delay(e, retry_delay, attempt))  # 指数バックオフ
+                    continue
+
+        # 全リトライ失敗
+        logger.error(f"LLM generation failed after {retry_count} attempts: {last_error}")
+        raise Exception(f"LLM generation failed: {last_error}")
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        retry_count: int = 3,
+        retry_delay: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        非同期テキスト生成（リトライロジック付き）
+
+        generate() の非同期版。複数リクエストを並行実行できるよう、
+        共有トークンカウンターはリセットせず、呼び出しごとのカウンターで集計する
+
+        Args:
+            prompt: ユーザープロンプト
+            system_prompt: システムプロンプト
+            retry_count: リトライ回数
+            retry_delay: リトライ間隔（秒）
+
+        Returns:
+            generate() と同じ形式の辞書
+        """
+        # モックモード
+        if self.is_mock:
+            logger.warning("Using mock LLM response (API key not configured)")
+            return {
+                "content": self._generate_mock_response(prompt, system_prompt),
+                "tokens": {"total": 0, "prompt": 0, "completion": 0},
+                "model": "mock",
+                "is_mock": True
+            }
+
+        # メッセージ構築
+        messages = []
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+        messages.append(HumanMessage(content=prompt))
+
+        # リトライロジック
+        last_error = None
+        for attempt in range(retry_count):
+            try:
+                logger.debug(f"Async LLM generation attempt {attempt + 1}/{retry_count}")
+
+                # 呼び出し単位のトークンカウンター（共有カウンターにも加算する）
+                call_counter = TokenCounterCallback()
+                response = await self.client.ainvoke(
+                    messages,
+                    config={"callbacks": [call_counter, self.token_callback]}
+                )
+
                 logger.info(
-                    f"LLM generation successful. Tokens: {self.token_callback.total_tokens}"
+                    f"Async LLM generation successful. Tokens: {call_counter.total_tokens}"
                 )
-                return result
+                return {
+                    "content": response.content,
+                    "tokens": call_counter.usage(),
+                    "model": self.model,
+                    "is_mock": False,
+                    "truncated": _is_truncated(response)
+                }
 
             except Exception as e:
                 last_error = e
                 logger.warning(
-                    f"LLM generation failed (attempt {attempt + 1}/{retry_count}): {e}"
+                    f"Async LLM generation failed (attempt {attempt + 1}/{retry_count}): {e}"
                 )
 
                 if attempt < retry_count - 1:
-                    time.sleep(retry_delay * (attempt + 1))  # 指数バックオフ
+                    await asyncio.sleep(_backoff_delay(e, retry_delay, attempt))
                     continue
 
         # 全リトライ失敗
-        logger.error(f"LLM generation failed after {retry_count} attempts: {last_error}")
+        logger.error(f"Async LLM generation failed after {retry_count} attempts: {last_error}")
+        raise Exception(f"LLM generation failed: {last_error}")
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        retry_count: int = 3,
+        retry_delay: float = 1.0
+    ) -> AsyncIterator[str]:
+        """
+        ストリーミングテキスト生成
+
+        生成されたテキストを差分（delta）ごとに返す。
+        最初の差分を受信する前に失敗した場合のみリトライする
+
+        Args:
+            prompt: ユーザープロンプト
+            system_prompt: システムプロンプト
+            retry_count: リトライ回数
+            retry_delay: リトライ間隔（秒）
+
+        Yields:
+            生成テキストの差分
+        """
+        # モックモード
+        if self.is_mock:
+            logger.warning("Using mock LLM response (API key not configured)")
+            yield self._generate_mock_response(prompt, system_prompt)
+            return
+
+        # メッセージ構築
+        messages = []
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+        messages.append(HumanMessage(content=prompt))
+
+        last_error = None
+        for attempt in range(retry_count):
+            started = False
+            try:
+                logger.debug(f"LLM streaming attempt {attempt + 1}/{retry_count}")
+
+                async for chunk in self.client.astream(
+                    messages,
+                    config={"callbacks": [self.token_callback]}
+                ):
+                    if chunk.content:
+                        started = True
+                        yield chunk.content
+                return
+
+            except Exception as e:
+                # 出力済みの差分は取り消せないため、途中失敗はそのまま送出
+                if started:
+                    raise
+                last_error = e
+                logger.warning(
+                    f"LLM streaming failed (attempt {attempt + 1}/{retry_count}): {e}"
+                )
+
+                if attempt < retry_count - 1:
+                    await asyncio.sleep(_backoff_delay(e, retry_delay, attempt))
+                    continue
+
+        # 全リトライ失敗
+        logger.error(f"LLM streaming failed after {retry_count} attempts: {last_error}")
         raise Exception(f"LLM generation failed: {last_error}")
 
     def generate_with_context(
@@ -208,39 +473,223 @@ class LLMService:
 
         Returns:
             生成結果（generate()と同じ形式）
+            キャッシュ・実行中の同一リクエストから返した場合は "cached": True で、
+            トークン数は0（このリクエストでは消費していないため）
         """
-        # デフォルトシステムプロンプト
-        if system_prompt is None:
-            system_prompt = (
-                "あなたは親切で正確なアシスタントです。"
-                "提供されたコンテキスト情報を基に、ユーザーの質問に答えてください。"
-                "コンテキストに情報がない場合は、正直にそう伝えてください。"
+        full_prompt, system_prompt = self._build_context_prompt(
+            query, context_documents, system_prompt
+        )
+
+        logger.debug(f"RAG prompt length: {len(full_prompt)} chars")
+
+        if self.is_mock:
+            return self.generate(
+                prompt=full_prompt,
+                system_prompt=system_prompt
             )
 
-        # コンテキストドキュメントを整形
-        context_text = "\n\n---\n\n".join([
-            f"Document {i+1}:\n{doc}"
-            for i, doc in enumerate(context_documents)
-        ])
+        # 同一リクエストは実行中の呼び出しか直近の結果を共有する
+        key = self._rag_request_key(system_prompt, full_prompt)
+        with _rag_lock:
+            entry = _rag_result_cache.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                logger.debug("RAG result served from cache")
+                return self._shared_rag_result(entry[1])
+
+            future = _rag_inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                _rag_inflight[key] = future
+
+        if not is_owner:
+            logger.debug("Waiting for identical in-flight RAG request")
+            return self._shared_rag_result(future.result())
+
+        try:
+            result = self.generate(
+                prompt=full_prompt,
+                system_prompt=system_prompt
+            )
+        except Exception as e:
+            with _rag_lock:
+                _rag_inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with _rag_lock:
+            _rag_inflight.pop(key, None)
+            _rag_result_cache[key] = (time.monotonic() + RAG_RESULT_CACHE_TTL, result)
+            _rag_result_cache.move_to_end(key)
+            while len(_rag_result_cache) > RAG_RESULT_CACHE_MAX_SIZE:
+                _rag_result_cache.popitem(last=False)
+        future.set_result(result)
+
+        return {**result, "tokens": dict(result["tokens"])}
+
+    def _shared_rag_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """共有したRAG結果のコピー（消費していないトークン数は0として返す）"""
+        return {
+            **result,
+            "tokens": {"total": 0, "prompt": 0, "completion": 0},
+            "cached": True
+        }
 
-        # プロンプト構築
-        full_prompt = f"""以下のコンテキスト情報を参考にして、質問に答えてください。
+    def _rag_request_key(self, system_prompt: str, full_prompt: str) -> str:
+        """生成設定とプロンプト全体から RAGリクエストの重複判定キーを生成"""
+        digest = hashlib.sha256()
+        for part in (
+            self.provider, self.model, repr(self.temperature), str(self.max_tokens),
+            system_prompt, full_prompt
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def generate_with_context_batch(
+        self,
+        queries: List[str],
+        contexts: List[List[str]],
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        コンテキスト付き生成のバッチ版（RAG用）
 
-【コンテキスト】
-{context_text}
+        Args:
+            queries: ユーザークエリのリスト
+            contexts: クエリごとの取得ドキュメントのリスト
+            system_prompt: 全クエリ共通のシステムプロンプト
+            max_concurrency: 同時リクエスト数の上限
 
-【質問】
-{query}
+        Returns:
+            生成結果のリスト（queriesと同じ順序）
+        """
+        if len(queries) != len(contexts):
+            raise ValueError("queries and contexts must have the same length")
+
+        prompts = []
+        system_prompts = []
+        for query, context_documents in zip(queries, contexts):
+            full_prompt, query_system_prompt = self._build_context_prompt(
+                query, context_documents, system_prompt
+            )
+            prompts.append(full_prompt)
+            system_prompts.append(query_system_prompt)
 
-【回答】
-"""
+        return self.generate_batch(prompts, system_prompts, max_concurrency=max_concurrency)
 
-        logger.debug(f"RAG prompt length: {len(full_prompt)} chars")
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompts: Optional[List[Optional[str]]] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        複数プロンプトの一括生成
 
-        return self.generate(
-            prompt=full_prompt,
-            system_prompt=system_prompt
-        )
+        LangChainの batch() で並行実行し、失敗したプロンプトのみ
+        generate() のリトライロジックで再実行する
+
+        Args:
+            prompts: ユーザープロンプトのリスト
+            system_prompts: プロンプトごとのシステムプロンプト（Noneの場合はなし）
+            max_concurrency: 同時リクエスト数の上限
+
+        Returns:
+            generate() と同じ形式の辞書のリスト（promptsと同じ順序）
+        """
+        if system_prompts is None:
+            system_prompts = [None] * len(prompts)
+        elif len(system_prompts) != len(prompts):
+            raise ValueError("prompts and system_prompts must have the same length")
+
+        if not prompts:
+            return []
+
+        # モックモード
+        if self.is_mock:
+            return [
+                self.generate(prompt, system_prompt)
+                for prompt, system_prompt in zip(prompts, system_prompts)
+            ]
+
+        # メッセージ構築
+        messages_list = []
+        for prompt, system_prompt in zip(prompts, system_prompts):
+            messages = []
+            if system_prompt:
+                messages.append(SystemMessage(content=system_prompt))
+            messages.append(HumanMessage(content=prompt))
+            messages_list.append(messages)
+
+        # プロンプト単位のトークンカウンター（共有カウンターにも加算する）
+        counters = [TokenCounterCallback() for _ in prompts]
+        configs = [
+            {"callbacks": [counter, self.token_callback], "max_concurrency": max_concurrency}
+            for counter in counters
+        ]
+
+        logger.debug(f"LLM batch generation: {len(prompts)} prompts")
+        responses = self.client.batch(messages_list, config=configs, return_exceptions=True)
+
+        results = []
+        for prompt, system_prompt, counter, response in zip(
+            prompts, system_prompts, counters, responses
+        ):
+            if isinstance(response, Exception):
+                logger.warning(f"LLM batch item failed, retrying individually: {response}")
+                results.append(self.generate(prompt, system_prompt))
+                continue
+
+            results.append({
+                "content": response.content,
+                "tokens": counter.usage(),
+                "model": self.model,
+                "is_mock": False,
+                "truncated": _is_truncated(response)
+            })
+
+        logger.info(f"LLM batch generation completed: {len(results)} results")
+        return results
+
+    def _build_context_prompt(
+        self,
+        query: str,
+        context_documents: List[str],
+        system_prompt: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        RAG用のプロンプトを構築
+
+        Args:
+            query: ユーザークエリ
+            context_documents: 取得したドキュメントのリスト
+            system_prompt: システムプロンプト（Noneの場合はデフォルト）
+
+        Returns:
+            (ユーザープロンプト, システムプロンプト)
+        """
+        # デフォルトシステムプロンプト
+        if system_prompt is None:
+            system_prompt = _DEFAULT_RAG_SYSTEM_PROMPT
+
+        # コンテキストドキュメントを整形
+        parts = []
+        for i, doc in enumerate(context_documents):
+            if i:
+                parts.append(_CONTEXT_DOC_SEPARATOR)
+            parts.append(
+                _CONTEXT_DOC_HEADERS[i] if i < len(_CONTEXT_DOC_HEADERS)
+                else f"Document {i + 1}:\n"
+            )
+            parts.append(doc)
+        context_text = "".join(parts)
+
+        # プロンプト構築
+        full_prompt = _RAG_USER_PROMPT.format(context=context_text, query=query)
+
+        return full_prompt, system_prompt
 
     def _generate_mock_response(
         self,
@@ -257,36 +706,31 @@ class LLMService:
         Returns:
             モック回答文字列
         """
-        return (
-            f"[MOCK RESPONSE]\n\n"
-            f"これはモックレスポンスです。実際のLLM APIキーが設定されていません。\n\n"
-            f"受信したプロンプト（最初の100文字）:\n"
-            f"{prompt[:100]}...\n\n"
-            f"本番環境では、ANTHROPIC_API_KEYまたはOPENAI_API_KEYを設定してください。"
-        )
+        return _mock_response(prompt[:100])
 
     def get_token_usage(self) -> Dict[str, int]:
         """
-        トークン使用量取得
+        トークン使用量取得（前回のリセット以降の累計）
 
         Returns:
             {"total": 100, "prompt": 50, "completion": 50}
         """
-        return {
-            "total": self.token_callback.total_tokens,
-            "prompt": self.token_callback.prompt_tokens,
-            "completion": self.token_callback.completion_tokens
-        }
+        return self.token_callback.usage()
 
     def reset_token_counter(self):
         """トークンカウンターリセット"""
-        self.token_callback.total_tokens = 0
-        self.token_callback.prompt_tokens = 0
-        self.token_callback.completion_tokens = 0
+        self.token_callback.reset()
 
 
-# シングルトンインスタンス（オプション）
-_llm_service_instance: Optional[LLMService] = None
+def clear_rag_result_cache() -> None:
+    """RAG結果キャッシュをクリア"""
+    with _rag_lock:
+        _rag_result_cache.clear()
+
+
+# プロバイダごとのシングルトンインスタンス
+_llm_service_instances: Dict[str, LLMService] = {}
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service(
@@ -294,7 +738,7 @@ def get_llm_service(
     force_new: bool = False
 ) -> LLMService:
     """
-    LLMサービスインスタンス取得（シングルトン）
+    LLMサービスインスタンス取得（プロバイダごとのシングルトン、スレッドセーフ）
 
     Args:
         provider: "anthropic" or "openai"
@@ -303,12 +747,13 @@ def get_llm_service(
     Returns:
         LLMServiceインスタンス
     """
-    global _llm_service_instance
-
-    if force_new or _llm_service_instance is None:
-        _llm_service_instance = LLMService(provider=provider)
+    with _llm_service_lock:
+        instance = _llm_service_instances.get(provider)
+        if force_new or instance is None:
+            instance = LLMService(provider=provider)
+            _llm_service_instances[provider] = instance
 
-    return _llm_service_instance
+    return instance
 
 
 # 使用例
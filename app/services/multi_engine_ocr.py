@@ -8,22 +8,310 @@ This module implements a cascading multi-engine OCR pipeline:
 
 Target: 99% accuracy on Japanese Kindle book pages
 """
+import asyncio
 import base64
+import copy
+import hashlib
 import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Awaitable, Callable
 from PIL import Image
 import io
+import pytesseract
+from pytesseract import Output
 
-from anthropic import Anthropic
-from openai import OpenAI
+import anthropic
+import httpx
+import openai
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI
 
 # Import existing Tesseract OCR
-from app.services.ocr_preprocessing import enhanced_ocr_with_preprocessing
+from app.services.ocr_preprocessing import enhanced_ocr_with_preprocessing, remove_headers_footers
 from app.core.config import settings
 
+# SIMD base64 encoder when installed; the stdlib encoder is used otherwise
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Vision models used by the API engines
+CLAUDE_VISION_MODEL = "claude-3-5-sonnet-20241022"
+OPENAI_VISION_MODEL = "gpt-4-vision-preview"
+
+# Images processed concurrently by abatch_process_images
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "8"))
+
+# Low-resolution Tesseract probe run ahead of the full preprocessing pass:
+# clearly good pages are accepted from the probe, clearly bad pages go
+# straight to the vision engines, only borderline pages get the full pass
+TESSERACT_PROBE_SIZE = (1024, 1024)
+TESSERACT_PROBE_ACCEPT = 0.95
+TESSERACT_PROBE_SKIP = 0.50
+TESSERACT_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+
+# Header/footer margins excluded from the probe, matching the full pass defaults
+TESSERACT_PAGE_MARGIN = 0.08
+
+# Line-break threshold (pixels at full resolution) of remove_headers_footers
+TESSERACT_LINE_BREAK_THRESHOLD = 15
+
+# Claude is started alongside the full Tesseract pass when recent Tesseract
+# confidences (exponential moving average) sit this close to the threshold
+TESSERACT_CONFIDENCE_EMA_ALPHA = 0.3
+TESSERACT_SPECULATE_MARGIN = 0.05
+
+# Images sent to the vision APIs are downscaled to Claude's internal working
+# size (long edge) and re-encoded as JPEG; larger uploads add no accuracy
+VISION_MAX_LONG_EDGE = 1568
+VISION_JPEG_QUALITY = 85
+
+# Retry policy for transient vision API errors (rate limits, 5xx, timeouts)
+OCR_API_MAX_ATTEMPTS = 3
+OCR_API_RETRY_BASE = 1.0
+OCR_API_RETRY_CAP = 30.0
+
+# Connection pool of each vision API client, shared by batch worker threads so
+# keep-alive connections (and their TLS sessions) are reused across pages
+OCR_HTTP_MAX_CONNECTIONS = 32
+OCR_HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+
+# Request rate per vision API, shared by every worker thread and coroutine in
+# the process (0 disables the limit)
+OCR_CLAUDE_RPS = float(os.getenv("OCR_CLAUDE_RPS", "5"))
+OCR_OPENAI_RPS = float(os.getenv("OCR_OPENAI_RPS", "3"))
+
+# Network-level failures that are worth retrying; HTTP errors are classified by status code
+_TRANSIENT_API_ERRORS = (anthropic.APIConnectionError, openai.APIConnectionError)
+
+# Prompt shared by the vision engines
+_OCR_PROMPT = (
+    "このKindle本のページ画像からテキストを正確に抽出してください。\n\n"
+    "要件:\n"
+    "1. ヘッダーとフッター（ページ番号など）は除外\n"
+    "2. 本文のみを抽出\n"
+    "3. 改行と段落構造を保持\n"
+    "4. 日本語の文字を正確に認識\n"
+    "5. 余計な説明は不要で、抽出したテキストのみを出力\n\n"
+    "Please extract text from this Kindle book page image accurately.\n\n"
+    "Requirements:\n"
+    "1. Exclude headers and footers (page numbers, etc.)\n"
+    "2. Extract only the main content\n"
+    "3. Preserve line breaks and paragraph structure\n"
+    "4. Accurately recognize Japanese characters\n"
+    "5. Output only the extracted text without any explanation"
+)
+
+# Bump when _OCR_PROMPT changes so cached results from the old prompt are not reused
+OCR_PROMPT_VERSION = 1
+
+# Vision engine -> (display name, position in the cascade)
+_VISION_ENGINE_LABELS = {
+    'claude': ('Claude', 2),
+    'openai': ('OpenAI', 3)
+}
+
+# Content-addressed OCR result cache (identical image bytes skip the engine call)
+OCR_RESULT_CACHE_TTL = 7 * 24 * 3600.0
+OCR_RESULT_CACHE_MAX_SIZE = 2048
+
+_ocr_result_cache: "OrderedDict[Tuple[str, ...], Tuple[float, Tuple[str, float, Dict[str, Any]]]]" = OrderedDict()
+_ocr_result_cache_lock = threading.Lock()
+
+# Cascades currently running per cache key; identical images processed at the
+# same time (e.g. repeated pages in a batch) wait for the first one
+_ocr_inflight: Dict[Tuple[str, ...], Future] = {}
+_ocr_inflight_lock = threading.Lock()
+
+# Worker threads for engines started speculatively by the sync cascade
+_speculative_executor = ThreadPoolExecutor(max_workers=OCR_MAX_CONCURRENCY, thread_name_prefix='ocr-speculative')
+
+
+def _get_cached_ocr(key: Tuple[str, ...]) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+    """Return a cached engine result, or None if missing or expired"""
+    with _ocr_result_cache_lock:
+        entry = _ocr_result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del _ocr_result_cache[key]
+            return None
+        _ocr_result_cache.move_to_end(key)
+        return result
+
+
+def _set_cached_ocr(key: Tuple[str, ...], result: Tuple[str, float, Dict[str, Any]]) -> None:
+    """Cache an engine result, evicting the least recently used entries over the limit"""
+    with _ocr_result_cache_lock:
+        _ocr_result_cache[key] = (time.monotonic() + OCR_RESULT_CACHE_TTL, result)
+        _ocr_result_cache.move_to_end(key)
+        while len(_ocr_result_cache) > OCR_RESULT_CACHE_MAX_SIZE:
+            _ocr_result_cache.popitem(last=False)
+
+
+def _copy_ocr_result(
+    result: Tuple[str, float, Dict[str, Any]],
+    **extra: Any
+) -> Tuple[str, float, Dict[str, Any]]:
+    """Independent copy of an OCR result so callers never share nested metadata with the cache"""
+    text, confidence, metadata = result
+    return text, confidence, {**copy.deepcopy(metadata), **extra}
+
+
+def clear_ocr_result_cache() -> None:
+    """Clear the OCR result cache"""
+    with _ocr_result_cache_lock:
+        _ocr_result_cache.clear()
+
+
+def _is_transient_api_error(error: Exception) -> bool:
+    """True for rate limits, server errors and connection problems; False for hard 4xx"""
+    if isinstance(error, _TRANSIENT_API_ERRORS):
+        return True
+    status = getattr(error, 'status_code', None)
+    return isinstance(status, int) and (status in (408, 409, 429) or status >= 500)
+
+
+def _api_retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After if given, else capped full-jitter backoff"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if headers:
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), OCR_API_RETRY_CAP)
+            except ValueError:
+                pass
+    return random.uniform(0, min(OCR_API_RETRY_CAP, OCR_API_RETRY_BASE * (2 ** attempt)))
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket shared by sync and async callers
+
+    Each acquire reserves a token up front (the bucket may go negative), so
+    concurrent callers are spaced out at the configured rate instead of all
+    waking up at once. The lock is only held to update the bucket, never while
+    waiting.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the time waited"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """Async version of acquire"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_api_rate_limiters = {
+    'claude': _TokenBucket(OCR_CLAUDE_RPS),
+    'openai': _TokenBucket(OCR_OPENAI_RPS)
+}
+
+
+# Hiragana, katakana and CJK ideographs (expected on Japanese Kindle pages)
+_JAPANESE_CHAR_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+
+
+# Substrings that indicate garbled OCR output
+_ERROR_INDICATORS = ('???', '□□□', '■■■', '��')
+
+
+def _count_japanese_chars(text: str) -> int:
+    """Number of Japanese characters in text"""
+    return len(_JAPANESE_CHAR_RE.findall(text))
+
+
+# File extension -> media type for the vision APIs (fallback when the header is not recognized)
+_MEDIA_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif'
+}
+
+
+def _sniff_media_type(head: bytes) -> Optional[str]:
+    """Media type from the file's magic bytes, or None if not a supported format"""
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    return None
+
+
+@dataclass
+class _ImageContext:
+    """
+    Image loaded once per process_image_file call and shared by every engine
+
+    The file is read and hashed once; the vision payload (resized, base64) is
+    built on first use (see MultiEngineOCR._vision_payload) and reused by the
+    next vision engine.
+    """
+    path: str
+    data: bytes = field(repr=False)
+    sha256: str
+    media_type: str
+    vision_payload: Optional[Tuple[str, str]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_path(cls, image_path: str) -> "_ImageContext":
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        return cls(
+            path=image_path,
+            data=data,
+            sha256=hashlib.sha256(data).hexdigest(),
+            media_type=(
+                _sniff_media_type(data[:12])
+                or _MEDIA_TYPES.get(Path(image_path).suffix.lower(), 'image/png')
+            )
+        )
+
 
 class MultiEngineOCR:
     """
@@ -63,13 +351,26 @@ class MultiEngineOCR:
         self.enable_claude = enable_claude
         self.enable_openai = enable_openai
 
+        # Moving average of full-pass Tesseract confidence for pages seen by this instance
+        self._tesseract_confidence_ema: Optional[float] = None
+        self._tesseract_confidence_lock = threading.Lock()
+
         # Initialize API clients
         self.anthropic_client = None
         self.openai_client = None
+        self.async_anthropic_client = None
+        self.async_openai_client = None
 
         if self.enable_claude and settings.ANTHROPIC_API_KEY:
             try:
-                self.anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+                self.anthropic_client = Anthropic(
+                    api_key=settings.ANTHROPIC_API_KEY,
+                    http_client=httpx.Client(limits=self._http_limits())
+                )
+                self.async_anthropic_client = AsyncAnthropic(
+                    api_key=settings.ANTHROPIC_API_KEY,
+                    http_client=httpx.AsyncClient(limits=self._http_limits())
+                )
                 logger.info("✅ Claude Vision API initialized")
             except Exception as e:
                 logger.warning(f"⚠️ Claude API init failed: {e}")
@@ -77,7 +378,14 @@ class MultiEngineOCR:
 
         if self.enable_openai and settings.OPENAI_API_KEY:
             try:
-                self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+                self.openai_client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=httpx.Client(limits=self._http_limits())
+                )
+                self.async_openai_client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=httpx.AsyncClient(limits=self._http_limits())
+                )
                 logger.info("✅ OpenAI Vision API initialized")
             except Exception as e:
                 logger.warning(f"⚠️ OpenAI API init failed: {e}")
@@ -90,26 +398,176 @@ class MultiEngineOCR:
             f"OpenAI={self.enable_openai}"
         )
 
-    def _encode_image_to_base64(self, image_path: str) -> str:
+    @staticmethod
+    def _http_limits() -> httpx.Limits:
+        """Connection pool limits for the vision API HTTP clients"""
+        return httpx.Limits(
+            max_connections=OCR_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=OCR_HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+
+    def _encode_image_to_base64(self, image_data: bytes) -> str:
         """
-        Encode image file to base64 for API transmission
+        Encode image bytes to base64 for API transmission
 
         Args:
-            image_path: Path to image file
+            image_data: Raw image file contents
 
         Returns:
             str: Base64-encoded image data
         """
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
-        return base64.b64encode(image_data).decode('utf-8')
+        if PYBASE64_AVAILABLE:
+            return pybase64.b64encode_as_string(image_data)
+        return base64.b64encode(image_data).decode('ascii')
 
-    def _tesseract_ocr(self, image_path: str) -> Tuple[str, float, Dict[str, Any]]:
+    def _prepare_vision_image(
+        self,
+        image: _ImageContext,
+        max_long_edge: int = VISION_MAX_LONG_EDGE,
+        quality: int = VISION_JPEG_QUALITY
+    ) -> Tuple[bytes, str]:
+        """
+        Downscale the image for the vision APIs and re-encode it as JPEG
+
+        Images already within max_long_edge are sent unchanged.
+
+        Args:
+            image: Loaded image
+            max_long_edge: Max size of the longer side in pixels
+            quality: JPEG quality
+
+        Returns:
+            Tuple[bytes, str]: (image bytes, media type)
+        """
+        try:
+            with Image.open(io.BytesIO(image.data)) as img:
+                if max(img.size) <= max_long_edge:
+                    return image.data, image.media_type
+
+                original_size = img.size
+                resized = img.convert('RGB')
+            resized.thumbnail((max_long_edge, max_long_edge), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            resized.save(buffer, format='JPEG', quality=quality, optimize=True)
+            data = buffer.getvalue()
+
+            logger.info(
+                f"🗜️ Resized for vision API: {original_size[0]}x{original_size[1]} -> "
+                f"{resized.size[0]}x{resized.size[1]}, {len(image.data)} -> {len(data)} bytes"
+            )
+            return data, 'image/jpeg'
+
+        except Exception as e:
+            logger.warning(f"⚠️ Could not resize image, sending original: {e}")
+            return image.data, image.media_type
+
+    def _vision_payload(self, image: _ImageContext) -> Tuple[str, str]:
+        """(media_type, base64 data) for the vision APIs, built once per image"""
+        if image.vision_payload is None:
+            data, media_type = self._prepare_vision_image(image)
+            image.vision_payload = (media_type, self._encode_image_to_base64(data))
+        return image.vision_payload
+
+    def _engine_cache_key(self, engine: str, image: _ImageContext) -> Tuple[str, ...]:
+        """Cache key for an engine result: image contents + engine configuration"""
+        if engine in ('tesseract', 'tesseract_probe'):
+            variant = self.tesseract_lang
+        elif engine == 'claude':
+            variant = CLAUDE_VISION_MODEL
+        else:
+            variant = OPENAI_VISION_MODEL
+        return (image.sha256, engine, variant, str(OCR_PROMPT_VERSION))
+
+    def _cached_engine_result(
+        self,
+        engine: str,
+        key: Tuple[str, ...]
+    ) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        """Cached engine result for the key, marked as a cache hit"""
+        cached = _get_cached_ocr(key)
+        if cached is None:
+            return None
+        logger.info(f"♻️ {engine}: cached result for identical image ({cached[1]:.2%} confidence)")
+        return _copy_ocr_result(cached, cache_hit=True)
+
+    def _run_engine(
+        self,
+        engine: str,
+        image: _ImageContext,
+        force_refresh: bool = False
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run a single OCR engine, reusing a cached result for identical image bytes
+
+        Args:
+            engine: 'tesseract', 'claude' or 'openai'
+            image: Loaded image
+            force_refresh: Ignore any cached result and call the engine
+
+        Returns:
+            Tuple[str, float, Dict]: (text, confidence, metadata)
+        """
+        key = self._engine_cache_key(engine, image)
+        if not force_refresh:
+            cached = self._cached_engine_result(engine, key)
+            if cached is not None:
+                return cached
+
+        if engine == 'tesseract':
+            text, confidence, metadata = self._tesseract_ocr(image)
+        elif engine == 'tesseract_probe':
+            text, confidence, metadata = self._tesseract_probe(image)
+        elif engine == 'claude':
+            text, confidence, metadata = self._claude_vision_ocr(image)
+        else:
+            text, confidence, metadata = self._openai_vision_ocr(image)
+
+        # Only successful results are cached; failures may be transient
+        if metadata.get('success'):
+            _set_cached_ocr(key, _copy_ocr_result((text, confidence, metadata)))
+
+        return text, confidence, metadata
+
+    async def _arun_engine(
+        self,
+        engine: str,
+        image: _ImageContext,
+        force_refresh: bool = False
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Async version of _run_engine
+
+        Vision engines use the async API clients; Tesseract is CPU-bound and
+        runs in a worker thread so it does not block the event loop.
+        """
+        key = self._engine_cache_key(engine, image)
+        if not force_refresh:
+            cached = self._cached_engine_result(engine, key)
+            if cached is not None:
+                return cached
+
+        if engine == 'tesseract':
+            text, confidence, metadata = await asyncio.to_thread(self._tesseract_ocr, image)
+        elif engine == 'tesseract_probe':
+            text, confidence, metadata = await asyncio.to_thread(self._tesseract_probe, image)
+        elif engine == 'claude':
+            text, confidence, metadata = await self._aclaude_vision_ocr(image)
+        else:
+            text, confidence, metadata = await self._aopenai_vision_ocr(image)
+
+        # Only successful results are cached; failures may be transient
+        if metadata.get('success'):
+            _set_cached_ocr(key, _copy_ocr_result((text, confidence, metadata)))
+
+        return text, confidence, metadata
+
+    def _tesseract_ocr(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
         """
         Run Tesseract OCR
 
         Args:
-            image_path: Path to image file
+            image: Loaded image
 
         Returns:
             Tuple[str, float, Dict]: (text, confidence, metadata)
@@ -118,8 +576,9 @@ class MultiEngineOCR:
 
         try:
             text, confidence = enhanced_ocr_with_preprocessing(
-                image_path,
-                lang=self.tesseract_lang
+                image.path,
+                lang=self.tesseract_lang,
+                image_data=image.data
             )
 
             metadata = {
@@ -141,202 +600,297 @@ class MultiEngineOCR:
             logger.error(f"❌ Tesseract OCR failed: {e}")
             return "", 0.0, {'engine': 'tesseract', 'success': False, 'error': str(e)}
 
-    def _claude_vision_ocr(self, image_path: str) -> Tuple[str, float, Dict[str, Any]]:
+    def _tesseract_probe(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
         """
-        Run Claude Vision API for OCR
+        Quick Tesseract pass on a downscaled grayscale copy of the image
+
+        Skips the preprocessing pipeline; the mean word confidence decides
+        whether the full Tesseract pass is worth running. Text and confidence
+        cover the main text region only, with headers/footers removed the same
+        way as the full pass, since a confident probe is returned as the result.
 
         Args:
-            image_path: Path to image file
+            image: Loaded image
 
         Returns:
             Tuple[str, float, Dict]: (text, confidence, metadata)
         """
-        logger.info("🔍 Running Claude Vision OCR (Engine 2/3)...")
-
-        if not self.anthropic_client:
-            logger.warning("⚠️ Claude API not available")
-            return "", 0.0, {'engine': 'claude', 'success': False, 'error': 'API not initialized'}
+        logger.info("🔍 Running Tesseract probe (low resolution)...")
 
         try:
-            # Encode image
-            base64_image = self._encode_image_to_base64(image_path)
-
-            # Determine image type
-            image_ext = Path(image_path).suffix.lower()
-            media_type_map = {
-                '.png': 'image/png',
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.webp': 'image/webp',
-                '.gif': 'image/gif'
-            }
-            media_type = media_type_map.get(image_ext, 'image/png')
-
-            # Call Claude Vision API
-            message = self.anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",  # Latest model with vision
-                max_tokens=4096,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": base64_image
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": (
-                                    "このKindle本のページ画像からテキストを正確に抽出してください。\n\n"
-                                    "要件:\n"
-                                    "1. ヘッダーとフッター（ページ番号など）は除外\n"
-                                    "2. 本文のみを抽出\n"
-                                    "3. 改行と段落構造を保持\n"
-                                    "4. 日本語の文字を正確に認識\n"
-                                    "5. 余計な説明は不要で、抽出したテキストのみを出力\n\n"
-                                    "Please extract text from this Kindle book page image accurately.\n\n"
-                                    "Requirements:\n"
-                                    "1. Exclude headers and footers (page numbers, etc.)\n"
-                                    "2. Extract only the main content\n"
-                                    "3. Preserve line breaks and paragraph structure\n"
-                                    "4. Accurately recognize Japanese characters\n"
-                                    "5. Output only the extracted text without any explanation"
-                                )
-                            }
-                        ]
-                    }
-                ]
+            with Image.open(io.BytesIO(image.data)) as img:
+                probe_img = img.convert('L')
+                original_height = img.height
+            probe_img.thumbnail(TESSERACT_PROBE_SIZE)
+            height = probe_img.height
+
+            ocr_data = pytesseract.image_to_data(
+                probe_img,
+                lang=self.tesseract_lang,
+                config=TESSERACT_CONFIG,
+                output_type=Output.DICT
             )
 
-            # Extract text from response
-            text = message.content[0].text.strip()
-
-            # Estimate confidence based on text characteristics
-            # Claude doesn't provide explicit confidence, so we estimate
-            confidence = self._estimate_confidence_claude(text)
+            # Same header/footer filtering and line reconstruction as the full pass,
+            # with the pixel line-break threshold scaled to the probe resolution
+            text = remove_headers_footers(
+                ocr_data, height,
+                top_threshold=TESSERACT_PAGE_MARGIN,
+                bottom_threshold=1.0 - TESSERACT_PAGE_MARGIN,
+                line_break_threshold=max(1, round(TESSERACT_LINE_BREAK_THRESHOLD * height / original_height))
+            ).strip()
+
+            main_text_top = int(height * TESSERACT_PAGE_MARGIN)
+            main_text_bottom = int(height * (1.0 - TESSERACT_PAGE_MARGIN))
+            confidences = [
+                float(conf) for i, conf in enumerate(ocr_data['conf'])
+                if float(conf) >= 0 and ocr_data['text'][i].strip()
+                and main_text_top <= ocr_data['top'][i] <= main_text_bottom
+            ]
+            confidence = sum(confidences) / len(confidences) / 100.0 if confidences else 0.0
 
             metadata = {
-                'engine': 'claude',
-                'model': 'claude-3-5-sonnet-20241022',
+                'engine': 'tesseract',
+                'lang': self.tesseract_lang,
+                'probe': True,
+                'probe_size': probe_img.size,
                 'char_count': len(text),
-                'word_count': len(text.split()),
-                'input_tokens': message.usage.input_tokens,
-                'output_tokens': message.usage.output_tokens,
+                'word_count': len(confidences),
                 'success': True
             }
 
-            logger.info(
-                f"✅ Claude: {len(text)} chars, "
-                f"{confidence:.2%} confidence (estimated)"
-            )
+            logger.info(f"✅ Tesseract probe: {len(text)} chars, {confidence:.2%} confidence")
 
             return text, confidence, metadata
 
         except Exception as e:
-            logger.error(f"❌ Claude Vision OCR failed: {e}")
-            return "", 0.0, {'engine': 'claude', 'success': False, 'error': str(e)}
+            logger.error(f"❌ Tesseract probe failed: {e}")
+            return "", 0.0, {'engine': 'tesseract', 'probe': True, 'success': False, 'error': str(e)}
 
-    def _openai_vision_ocr(self, image_path: str) -> Tuple[str, float, Dict[str, Any]]:
+    def _call_api(self, engine: str, call: Callable[[], Any]) -> Tuple[Any, int]:
         """
-        Run OpenAI GPT-4 Vision API for OCR
+        Call a vision API, retrying transient errors with exponential backoff
+
+        Every attempt first takes a token from the engine's shared rate limiter.
+        Hard errors (auth, invalid request) and the last failed attempt are
+        raised so the cascade can fall back to the next engine.
+
+        Returns:
+            Tuple[Any, int]: (API response, number of retries used)
+        """
+        limiter = _api_rate_limiters[engine]
+        for attempt in range(OCR_API_MAX_ATTEMPTS):
+            limiter.acquire()
+            try:
+                return call(), attempt
+            except Exception as e:
+                if attempt + 1 >= OCR_API_MAX_ATTEMPTS or not _is_transient_api_error(e):
+                    raise
+                delay = _api_retry_delay(e, attempt)
+                logger.warning(
+                    f"⚠️ {engine} API transient error (attempt {attempt + 1}/{OCR_API_MAX_ATTEMPTS}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+
+    async def _acall_api(self, engine: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, int]:
+        """Async version of _call_api"""
+        limiter = _api_rate_limiters[engine]
+        for attempt in range(OCR_API_MAX_ATTEMPTS):
+            await limiter.aacquire()
+            try:
+                return await call(), attempt
+            except Exception as e:
+                if attempt + 1 >= OCR_API_MAX_ATTEMPTS or not _is_transient_api_error(e):
+                    raise
+                delay = _api_retry_delay(e, attempt)
+                logger.warning(
+                    f"⚠️ {engine} API transient error (attempt {attempt + 1}/{OCR_API_MAX_ATTEMPTS}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+    def _vision_request(self, engine: str, payload: Tuple[str, str]) -> Dict[str, Any]:
+        """Build the messages.create / chat.completions.create arguments for a vision engine"""
+        media_type, image_base64 = payload
+
+        if engine == 'claude':
+            model = CLAUDE_VISION_MODEL  # Latest model with vision
+            image_part = {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": image_base64
+                }
+            }
+        else:
+            model = OPENAI_VISION_MODEL
+            image_part = {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{media_type};base64,{image_base64}"
+                }
+            }
+
+        return {
+            "model": model,
+            "max_tokens": 4096,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        image_part,
+                        {"type": "text", "text": _OCR_PROMPT}
+                    ]
+                }
+            ]
+        }
+
+    def _claude_result(self, message: Any) -> Tuple[str, float, Dict[str, Any]]:
+        """Turn a Claude Vision response into (text, confidence, metadata)"""
+        # Extract text from response
+        text = message.content[0].text.strip()
+
+        # Estimate confidence based on text characteristics
+        # Claude doesn't provide explicit confidence, so we estimate
+        confidence = self._estimate_confidence_claude(text)
+
+        metadata = {
+            'engine': 'claude',
+            'model': CLAUDE_VISION_MODEL,
+            'char_count': len(text),
+            'word_count': len(text.split()),
+            'input_tokens': message.usage.input_tokens,
+            'output_tokens': message.usage.output_tokens,
+            'success': True
+        }
+
+        logger.info(
+            f"✅ Claude: {len(text)} chars, "
+            f"{confidence:.2%} confidence (estimated)"
+        )
+
+        return text, confidence, metadata
+
+    def _openai_result(self, response: Any) -> Tuple[str, float, Dict[str, Any]]:
+        """Turn an OpenAI Vision response into (text, confidence, metadata)"""
+        # Extract text from response
+        text = response.choices[0].message.content.strip()
+
+        # Estimate confidence
+        confidence = self._estimate_confidence_openai(text, response)
+
+        metadata = {
+            'engine': 'openai',
+            'model': OPENAI_VISION_MODEL,
+            'char_count': len(text),
+            'word_count': len(text.split()),
+            'prompt_tokens': response.usage.prompt_tokens,
+            'completion_tokens': response.usage.completion_tokens,
+            'total_tokens': response.usage.total_tokens,
+            'finish_reason': response.choices[0].finish_reason,
+            'success': True
+        }
+
+        logger.info(
+            f"✅ OpenAI: {len(text)} chars, "
+            f"{confidence:.2%} confidence (estimated)"
+        )
+
+        return text, confidence, metadata
+
+    def _vision_create(self, engine: str, client: Any) -> Callable[..., Any]:
+        """The client's create method for a vision engine (sync or async client)"""
+        if engine == 'claude':
+            return client.messages.create
+        return client.chat.completions.create
+
+    def _vision_result(self, engine: str, response: Any) -> Tuple[str, float, Dict[str, Any]]:
+        """Turn a vision API response into (text, confidence, metadata)"""
+        if engine == 'claude':
+            return self._claude_result(response)
+        return self._openai_result(response)
+
+    def _vision_ocr(
+        self,
+        engine: str,
+        image: _ImageContext,
+        client: Any
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run a vision API engine for OCR
 
         Args:
-            image_path: Path to image file
+            engine: 'claude' or 'openai'
+            image: Loaded image
+            client: API client for the engine (None if not initialized)
 
         Returns:
             Tuple[str, float, Dict]: (text, confidence, metadata)
         """
-        logger.info("🔍 Running OpenAI Vision OCR (Engine 3/3)...")
+        name, position = _VISION_ENGINE_LABELS[engine]
+        logger.info(f"🔍 Running {name} Vision OCR (Engine {position}/3)...")
 
-        if not self.openai_client:
-            logger.warning("⚠️ OpenAI API not available")
-            return "", 0.0, {'engine': 'openai', 'success': False, 'error': 'API not initialized'}
+        if not client:
+            logger.warning(f"⚠️ {name} API not available")
+            return "", 0.0, {'engine': engine, 'success': False, 'error': 'API not initialized'}
 
         try:
-            # Encode image
-            base64_image = self._encode_image_to_base64(image_path)
-
-            # Determine image type
-            image_ext = Path(image_path).suffix.lower()
-            mime_type_map = {
-                '.png': 'image/png',
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.webp': 'image/webp',
-                '.gif': 'image/gif'
-            }
-            mime_type = mime_type_map.get(image_ext, 'image/png')
-
-            # Call OpenAI Vision API
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-vision-preview",
-                max_tokens=4096,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{mime_type};base64,{base64_image}"
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": (
-                                    "このKindle本のページ画像からテキストを正確に抽出してください。\n\n"
-                                    "要件:\n"
-                                    "1. ヘッダーとフッター（ページ番号など）は除外\n"
-                                    "2. 本文のみを抽出\n"
-                                    "3. 改行と段落構造を保持\n"
-                                    "4. 日本語の文字を正確に認識\n"
-                                    "5. 余計な説明は不要で、抽出したテキストのみを出力\n\n"
-                                    "Please extract text from this Kindle book page image accurately.\n\n"
-                                    "Requirements:\n"
-                                    "1. Exclude headers and footers (page numbers, etc.)\n"
-                                    "2. Extract only the main content\n"
-                                    "3. Preserve line breaks and paragraph structure\n"
-                                    "4. Accurately recognize Japanese characters\n"
-                                    "5. Output only the extracted text without any explanation"
-                                )
-                            }
-                        ]
-                    }
-                ]
-            )
-
-            # Extract text from response
-            text = response.choices[0].message.content.strip()
+            create = self._vision_create(engine, client)
+            request = self._vision_request(engine, self._vision_payload(image))
+            response, retries = self._call_api(engine, lambda: create(**request))
+            text, confidence, metadata = self._vision_result(engine, response)
+            metadata['retries'] = retries
+            return text, confidence, metadata
 
-            # Estimate confidence
-            confidence = self._estimate_confidence_openai(text, response)
+        except Exception as e:
+            logger.error(f"❌ {name} Vision OCR failed: {e}")
+            return "", 0.0, {'engine': engine, 'success': False, 'error': str(e)}
 
-            metadata = {
-                'engine': 'openai',
-                'model': 'gpt-4-vision-preview',
-                'char_count': len(text),
-                'word_count': len(text.split()),
-                'prompt_tokens': response.usage.prompt_tokens,
-                'completion_tokens': response.usage.completion_tokens,
-                'total_tokens': response.usage.total_tokens,
-                'finish_reason': response.choices[0].finish_reason,
-                'success': True
-            }
+    async def _avision_ocr(
+        self,
+        engine: str,
+        image: _ImageContext,
+        client: Any
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """Async version of _vision_ocr using an async API client"""
+        name, position = _VISION_ENGINE_LABELS[engine]
+        logger.info(f"🔍 Running {name} Vision OCR (Engine {position}/3, async)...")
 
-            logger.info(
-                f"✅ OpenAI: {len(text)} chars, "
-                f"{confidence:.2%} confidence (estimated)"
-            )
+        if not client:
+            logger.warning(f"⚠️ {name} API not available")
+            return "", 0.0, {'engine': engine, 'success': False, 'error': 'API not initialized'}
 
+        try:
+            create = self._vision_create(engine, client)
+            # Decode/resize/encode is CPU-bound; keep it off the event loop
+            payload = image.vision_payload or await asyncio.to_thread(self._vision_payload, image)
+            request = self._vision_request(engine, payload)
+            response, retries = await self._acall_api(engine, lambda: create(**request))
+            text, confidence, metadata = self._vision_result(engine, response)
+            metadata['retries'] = retries
             return text, confidence, metadata
 
         except Exception as e:
-            logger.error(f"❌ OpenAI Vision OCR failed: {e}")
-            return "", 0.0, {'engine': 'openai', 'success': False, 'error': str(e)}
+            logger.error(f"❌ {name} Vision OCR failed: {e}")
+            return "", 0.0, {'engine': engine, 'success': False, 'error': str(e)}
+
+    def _claude_vision_ocr(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
+        """Run Claude Vision API for OCR"""
+        return self._vision_ocr('claude', image, self.anthropic_client)
+
+    async def _aclaude_vision_ocr(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
+        """Async version of _claude_vision_ocr using the async Anthropic client"""
+        return await self._avision_ocr('claude', image, self.async_anthropic_client)
+
+    def _openai_vision_ocr(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
+        """Run OpenAI GPT-4 Vision API for OCR"""
+        return self._vision_ocr('openai', image, self.openai_client)
+
+    async def _aopenai_vision_ocr(self, image: _ImageContext) -> Tuple[str, float, Dict[str, Any]]:
+        """Async version of _openai_vision_ocr using the async OpenAI client"""
+        return await self._avision_ocr('openai', image, self.async_openai_client)
 
     def _estimate_confidence_claude(self, text: str) -> float:
         """
@@ -365,13 +919,12 @@ class MultiEngineOCR:
             confidence += 0.05
 
         # Check for Japanese characters (expected for Kindle books)
-        japanese_chars = sum(1 for c in text if '\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF' or '\u4E00' <= c <= '\u9FFF')
+        japanese_chars = _count_japanese_chars(text)
         if japanese_chars > 0:
             confidence += 0.02
 
         # Check for OCR error indicators
-        error_indicators = ['???', '□□□', '■■■', '��']
-        if any(indicator in text for indicator in error_indicators):
+        if any(indicator in text for indicator in _ERROR_INDICATORS):
             confidence -= 0.10
 
         return min(0.99, max(0.70, confidence))
@@ -403,13 +956,12 @@ class MultiEngineOCR:
             confidence += 0.05
 
         # Check for Japanese characters
-        japanese_chars = sum(1 for c in text if '\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF' or '\u4E00' <= c <= '\u9FFF')
+        japanese_chars = _count_japanese_chars(text)
         if japanese_chars > 0:
             confidence += 0.02
 
         # Check for OCR error indicators
-        error_indicators = ['???', '□□□', '■■■', '��']
-        if any(indicator in text for indicator in error_indicators):
+        if any(indicator in text for indicator in _ERROR_INDICATORS):
             confidence -= 0.10
 
         return min(0.99, max(0.70, confidence))
@@ -417,26 +969,224 @@ class MultiEngineOCR:
     def process_image_file(
         self,
         image_path: str,
-        force_engine: Optional[str] = None
+        force_engine: Optional[str] = None,
+        force_refresh: bool = False
     ) -> Tuple[str, float, Dict[str, Any]]:
         """
         Process image with cascading multi-engine OCR
 
         Pipeline:
-        1. Try Tesseract (fast, free)
+        1. Try Tesseract (fast, free; low-res probe first, full pass only for borderline pages)
         2. If confidence < threshold, try Claude Vision
         3. If still < threshold, try OpenAI Vision
 
         Args:
             image_path: Path to image file
             force_engine: Force specific engine ('tesseract', 'claude', 'openai')
+            force_refresh: Bypass the OCR result cache
+
+        Returns:
+            Tuple[str, float, Dict]: (best_text, best_confidence, full_metadata)
+        """
+        logger.info(f"📸 Processing image: {image_path}")
+
+        results = self._new_results()
+
+        # Read and hash the image once; every engine works from the same bytes
+        try:
+            image = _ImageContext.from_path(image_path)
+        except OSError as e:
+            logger.error(f"❌ Could not read image {image_path}: {e}")
+            results['selected_engine'] = 'none'
+            results['error'] = str(e)
+            return "", 0.0, results
+
+        # Identical image already processed (or being processed) with the same settings
+        key = self._cascade_cache_key(image, force_engine)
+        cached, future, is_owner = self._begin_cascade(key, force_refresh)
+        if cached is not None:
+            return cached
+        if not is_owner:
+            logger.info("⏳ Waiting for identical image already being processed")
+            return _copy_ocr_result(future.result())
+
+        cascade = self._cascade(results, force_engine)
+        speculative: Dict[str, Future] = {}
+        try:
+            step = next(cascade)
+            while True:
+                engine, speculate = step if isinstance(step, tuple) else (step, None)
+                if speculate and speculate not in speculative:
+                    speculative[speculate] = _speculative_executor.submit(
+                        self._run_engine, speculate, image, force_refresh
+                    )
+                if engine in speculative:
+                    step = cascade.send(speculative.pop(engine).result())
+                else:
+                    step = cascade.send(self._run_engine(engine, image, force_refresh))
+        except StopIteration as done:
+            result = done.value
+        except BaseException as e:
+            self._finish_cascade(key, future, error=e)
+            raise
+        finally:
+            # Speculative engines the cascade did not need (already running ones finish and are cached)
+            for pending in speculative.values():
+                pending.cancel()
+
+        self._finish_cascade(key, future, result)
+        return result
+
+    async def aprocess_image_file(
+        self,
+        image_path: str,
+        force_engine: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Async version of process_image_file (same cascade, async API clients)
+
+        Args:
+            image_path: Path to image file
+            force_engine: Force specific engine ('tesseract', 'claude', 'openai')
+            force_refresh: Bypass the OCR result cache
 
         Returns:
             Tuple[str, float, Dict]: (best_text, best_confidence, full_metadata)
         """
         logger.info(f"📸 Processing image: {image_path}")
 
-        results = {
+        results = self._new_results()
+
+        # Read and hash the image once; every engine works from the same bytes
+        try:
+            image = await asyncio.to_thread(_ImageContext.from_path, image_path)
+        except OSError as e:
+            logger.error(f"❌ Could not read image {image_path}: {e}")
+            results['selected_engine'] = 'none'
+            results['error'] = str(e)
+            return "", 0.0, results
+
+        # Identical image already processed (or being processed) with the same settings
+        key = self._cascade_cache_key(image, force_engine)
+        cached, future, is_owner = self._begin_cascade(key, force_refresh)
+        if cached is not None:
+            return cached
+        if not is_owner:
+            logger.info("⏳ Waiting for identical image already being processed")
+            return _copy_ocr_result(await asyncio.wrap_future(future))
+
+        cascade = self._cascade(results, force_engine)
+        speculative: Dict[str, asyncio.Task] = {}
+        try:
+            step = next(cascade)
+            while True:
+                engine, speculate = step if isinstance(step, tuple) else (step, None)
+                if speculate and speculate not in speculative:
+                    speculative[speculate] = asyncio.ensure_future(
+                        self._arun_engine(speculate, image, force_refresh)
+                    )
+                if engine in speculative:
+                    step = cascade.send(await speculative.pop(engine))
+                else:
+                    step = cascade.send(await self._arun_engine(engine, image, force_refresh))
+        except StopIteration as done:
+            result = done.value
+        except BaseException as e:
+            self._finish_cascade(key, future, error=e)
+            raise
+        finally:
+            # Speculative engines the cascade did not need
+            for pending in speculative.values():
+                pending.cancel()
+
+        self._finish_cascade(key, future, result)
+        return result
+
+    def _cascade_cache_key(self, image: _ImageContext, force_engine: Optional[str]) -> Tuple[str, ...]:
+        """Cache key for a whole cascade: image contents + every setting that affects the result"""
+        settings_key = (
+            force_engine or '',
+            self.tesseract_lang, self.tesseract_threshold, self.claude_threshold,
+            self.enable_tesseract, self.enable_claude, self.enable_openai,
+            CLAUDE_VISION_MODEL, OPENAI_VISION_MODEL, OCR_PROMPT_VERSION
+        )
+        return (image.sha256, 'cascade', repr(settings_key))
+
+    def _begin_cascade(
+        self,
+        key: Tuple[str, ...],
+        force_refresh: bool
+    ) -> Tuple[Optional[Tuple[str, float, Dict[str, Any]]], Optional[Future], bool]:
+        """
+        Look up a finished or in-flight cascade for the key
+
+        Returns:
+            Tuple: (cached result or None, future to wait on or set, whether this call runs the cascade)
+        """
+        if force_refresh:
+            return None, None, True
+
+        cached = _get_cached_ocr(key)
+        if cached is not None:
+            logger.info(f"♻️ Cached OCR result for identical image ({cached[1]:.2%} confidence)")
+            return _copy_ocr_result(cached, cache_hit=True), None, False
+
+        with _ocr_inflight_lock:
+            future = _ocr_inflight.get(key)
+            if future is not None:
+                return None, future, False
+            future = Future()
+            _ocr_inflight[key] = future
+            return None, future, True
+
+    def _finish_cascade(
+        self,
+        key: Tuple[str, ...],
+        future: Optional[Future],
+        result: Optional[Tuple[str, float, Dict[str, Any]]] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Cache a successful cascade result and hand it to any waiting duplicates"""
+        if result is not None:
+            # Snapshot before the owner returns its result; the caller may mutate it
+            result = _copy_ocr_result(result)
+            results = result[2]
+            selected = results.get(results['selected_engine']) if results['selected_engine'] != 'none' else None
+            # Only cache when the selected engine succeeded; failures may be transient
+            if selected and selected.get('success'):
+                _set_cached_ocr(key, result)
+
+        if future is None:
+            return
+        with _ocr_inflight_lock:
+            _ocr_inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _should_speculate_claude(self) -> bool:
+        """True when recent Tesseract confidence is close enough to the threshold to start Claude early"""
+        if not (self.enable_claude and self.anthropic_client):
+            return False
+        with self._tesseract_confidence_lock:
+            ema = self._tesseract_confidence_ema
+        return ema is not None and abs(ema - self.tesseract_threshold) < TESSERACT_SPECULATE_MARGIN
+
+    def _record_tesseract_confidence(self, confidence: float) -> None:
+        """Fold a full-pass Tesseract confidence into the moving average"""
+        with self._tesseract_confidence_lock:
+            if self._tesseract_confidence_ema is None:
+                self._tesseract_confidence_ema = confidence
+            else:
+                self._tesseract_confidence_ema += TESSERACT_CONFIDENCE_EMA_ALPHA * (
+                    confidence - self._tesseract_confidence_ema
+                )
+
+    def _new_results(self) -> Dict[str, Any]:
+        """Empty per-image metadata filled in by the cascade"""
+        return {
             'engines_tried': [],
             'tesseract': None,
             'claude': None,
@@ -445,6 +1195,15 @@ class MultiEngineOCR:
             'fallback_used': False
         }
 
+    def _cascade(self, results: Dict[str, Any], force_engine: Optional[str] = None):
+        """
+        Engine selection for the cascade, shared by the sync and async entry points
+
+        Yields the name of the next engine to run and receives its
+        (text, confidence, metadata); returns (best_text, best_confidence, results).
+        A yielded (engine, speculative_engine) pair asks the driver to start the
+        second engine in parallel; its result is used if the cascade asks for it next.
+        """
         best_text = ""
         best_confidence = 0.0
         best_engine = "none"
@@ -452,21 +1211,21 @@ class MultiEngineOCR:
         # Force specific engine if requested
         if force_engine:
             if force_engine == 'tesseract' and self.enable_tesseract:
-                text, conf, meta = self._tesseract_ocr(image_path)
+                text, conf, meta = yield 'tesseract'
                 results['tesseract'] = meta
                 results['engines_tried'].append('tesseract')
                 results['selected_engine'] = 'tesseract'
                 return text, conf, results
 
             elif force_engine == 'claude' and self.enable_claude:
-                text, conf, meta = self._claude_vision_ocr(image_path)
+                text, conf, meta = yield 'claude'
                 results['claude'] = meta
                 results['engines_tried'].append('claude')
                 results['selected_engine'] = 'claude'
                 return text, conf, results
 
             elif force_engine == 'openai' and self.enable_openai:
-                text, conf, meta = self._openai_vision_ocr(image_path)
+                text, conf, meta = yield 'openai'
                 results['openai'] = meta
                 results['engines_tried'].append('openai')
                 results['selected_engine'] = 'openai'
@@ -474,10 +1233,31 @@ class MultiEngineOCR:
 
         # Strategy 1: Try Tesseract first (fast, free)
         if self.enable_tesseract:
-            text, conf, meta = self._tesseract_ocr(image_path)
-            results['tesseract'] = meta
+            text, conf, meta = yield 'tesseract_probe'
             results['engines_tried'].append('tesseract')
 
+            if meta.get('success') and conf >= TESSERACT_PROBE_ACCEPT:
+                logger.info(f"✅ Tesseract probe confidence {conf:.2%} accepted without full pass")
+                results['tesseract'] = meta
+                results['selected_engine'] = 'tesseract'
+                return text, conf, results
+
+            if meta.get('success') and conf < TESSERACT_PROBE_SKIP and (self.enable_claude or self.enable_openai):
+                logger.info(f"⚠️ Tesseract probe confidence {conf:.2%} too low, skipping full pass...")
+            else:
+                probe_confidence = conf
+                if self._should_speculate_claude():
+                    logger.info("⚡ Tesseract confidence near threshold recently, starting Claude in parallel")
+                    results['speculative_engine'] = 'claude'
+                    text, conf, meta = yield ('tesseract', 'claude')
+                else:
+                    text, conf, meta = yield 'tesseract'
+                if meta.get('success'):
+                    self._record_tesseract_confidence(conf)
+                meta = {**meta, 'probe_confidence': probe_confidence}
+
+            results['tesseract'] = meta
+
             if conf >= self.tesseract_threshold:
                 logger.info(f"✅ Tesseract confidence {conf:.2%} meets threshold {self.tesseract_threshold:.2%}")
                 results['selected_engine'] = 'tesseract'
@@ -489,7 +1269,7 @@ class MultiEngineOCR:
 
         # Strategy 2: Try Claude Vision (high accuracy)
         if self.enable_claude:
-            text, conf, meta = self._claude_vision_ocr(image_path)
+            text, conf, meta = yield 'claude'
             results['claude'] = meta
             results['engines_tried'].append('claude')
 
@@ -506,7 +1286,7 @@ class MultiEngineOCR:
 
         # Strategy 3: Try OpenAI Vision (final fallback)
         if self.enable_openai:
-            text, conf, meta = self._openai_vision_ocr(image_path)
+            text, conf, meta = yield 'openai'
             results['openai'] = meta
             results['engines_tried'].append('openai')
 
@@ -528,7 +1308,8 @@ class MultiEngineOCR:
         self,
         image_paths: list[str],
         force_engine: Optional[str] = None,
-        max_workers: int = 3
+        max_workers: int = 3,
+        force_refresh: bool = False
     ) -> list[Dict[str, Any]]:
         """
         Process multiple images with parallelization
@@ -537,6 +1318,7 @@ class MultiEngineOCR:
             image_paths: List of image file paths
             force_engine: Force specific engine
             max_workers: Maximum parallel workers
+            force_refresh: Bypass the OCR result cache
 
         Returns:
             list: List of results for each image
@@ -549,7 +1331,8 @@ class MultiEngineOCR:
             try:
                 text, confidence, metadata = self.process_image_file(
                     image_path,
-                    force_engine=force_engine
+                    force_engine=force_engine,
+                    force_refresh=force_refresh
                 )
                 return {
                     'image_path': image_path,
@@ -589,3 +1372,68 @@ class MultiEngineOCR:
         )
 
         return results
+
+    async def abatch_process_images(
+        self,
+        image_paths: list[str],
+        force_engine: Optional[str] = None,
+        max_concurrency: int = OCR_MAX_CONCURRENCY,
+        force_refresh: bool = False
+    ) -> list[Dict[str, Any]]:
+        """
+        Process multiple images concurrently on the event loop
+
+        Vision API calls use the async clients, so many requests can be in
+        flight without a thread per image; a semaphore bounds concurrency.
+
+        Args:
+            image_paths: List of image file paths
+            force_engine: Force specific engine
+            max_concurrency: Maximum images processed at once
+            force_refresh: Bypass the OCR result cache
+
+        Returns:
+            list: List of results for each image (same order as image_paths)
+        """
+        logger.info(f"📸 Async batch processing {len(image_paths)} images...")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_single(image_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    text, confidence, metadata = await self.aprocess_image_file(
+                        image_path,
+                        force_engine=force_engine,
+                        force_refresh=force_refresh
+                    )
+                    return {
+                        'image_path': image_path,
+                        'text': text,
+                        'confidence': confidence,
+                        'metadata': metadata,
+                        'success': True,
+                        'error': None
+                    }
+                except Exception as e:
+                    logger.error(f"❌ Failed to process {image_path}: {e}")
+                    return {
+                        'image_path': image_path,
+                        'text': '',
+                        'confidence': 0.0,
+                        'metadata': {},
+                        'success': False,
+                        'error': str(e)
+                    }
+
+        results = await asyncio.gather(*(process_single(path) for path in image_paths))
+
+        success_count = sum(1 for r in results if r['success'])
+        avg_confidence = sum(r['confidence'] for r in results if r['success']) / max(success_count, 1)
+
+        logger.info(
+            f"✅ Async batch complete: {success_count}/{len(image_paths)} successful, "
+            f"avg confidence: {avg_confidence:.2%}"
+        )
+
+        return list(results)
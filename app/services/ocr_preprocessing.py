@@ -27,46 +27,73 @@ class OCRPreprocessor:
     """Advanced image preprocessor for OCR accuracy improvement"""
 
     @staticmethod
-    def preprocess_image_for_ocr(image_path: str) -> Image.Image:
+    def preprocess_image_for_ocr(image_path: str,
+                                 image_data: Optional[bytes] = None) -> Image.Image:
         """
         Complete preprocessing pipeline for OCR
 
         Pipeline steps:
-        1. Load image with OpenCV
-        2. Convert to grayscale
-        3. Denoise (Non-local means)
-        4. Enhance contrast (CLAHE)
-        5. Adaptive binarization
-        6. Morphological operations (noise removal)
+        1. Load image with OpenCV (decoded directly to grayscale)
+        2. Denoise (Gaussian blur)
+        3. Enhance contrast (CLAHE)
+        4. Adaptive binarization
+        5. Morphological operations (noise removal)
 
         Args:
             image_path: Path to input image
+            image_data: Already-loaded image bytes (skips reading image_path from disk)
 
         Returns:
             PIL.Image: Preprocessed image ready for OCR
 
+        Raises:
+            FileNotFoundError: If image file doesn't exist
+            IOError: If image cannot be loaded
+        """
+        morph = OCRPreprocessor.preprocess_image_to_array(image_path, image_data)
+
+        # Convert back to PIL Image
+        return Image.fromarray(morph)
+
+    @staticmethod
+    def preprocess_image_to_array(image_path: str,
+                                  image_data: Optional[bytes] = None) -> np.ndarray:
+        """
+        Preprocessing pipeline returning the binarized image as a NumPy array
+
+        Same steps as preprocess_image_for_ocr, but stays in NumPy so callers that
+        feed Tesseract directly can skip the PIL round-trip.
+
+        Args:
+            image_path: Path to input image
+            image_data: Already-loaded image bytes (skips reading image_path from disk)
+
+        Returns:
+            np.ndarray: Preprocessed single-channel uint8 image
+
         Raises:
             FileNotFoundError: If image file doesn't exist
             IOError: If image cannot be loaded
         """
         logger.info(f"🖼️ Preprocessing image: {image_path}")
 
-        # Load image
-        img_path = Path(image_path)
-        if not img_path.exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
+        # Step 1: Load image straight into grayscale
+        # (C-level decode + grayscale in one step, no intermediate BGR buffer)
+        if image_data is not None:
+            gray = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        else:
+            img_path = Path(image_path)
+            if not img_path.exists():
+                raise FileNotFoundError(f"Image not found: {image_path}")
 
-        img = cv2.imread(str(img_path))
-        if img is None:
+            gray = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise IOError(f"Failed to load image: {image_path}")
-
-        # Step 1: Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        logger.debug("   Step 1: Grayscale conversion complete")
+        logger.debug("   Step 1: Grayscale load complete")
 
         # Step 2: Simple noise reduction (fast and effective)
-        # Gaussian blur with small kernel for speed
-        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+        # Gaussian blur with small kernel for speed (in-place, gray is not reused)
+        blurred = cv2.GaussianBlur(gray, (3, 3), 0, dst=gray)
         logger.debug("   Step 2: Gaussian blur complete")
 
         # Step 3: Contrast enhancement using CLAHE
@@ -89,14 +116,12 @@ class OCRPreprocessor:
 
         # Step 5: Light morphological operations to remove tiny noise
         kernel = np.ones((1, 1), np.uint8)
-        morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, dst=binary)
         logger.debug("   Step 5: Morphological operations complete")
 
-        # Convert back to PIL Image
-        pil_image = Image.fromarray(morph)
         logger.info("✅ Preprocessing complete")
 
-        return pil_image
+        return morph
 
     @staticmethod
     def extract_main_text_region(image: Image.Image,
@@ -204,18 +229,19 @@ class OCRPreprocessor:
         return '\n'.join(filtered_lines)
 
 
-def preprocess_image_for_ocr(image_path: str) -> Image.Image:
+def preprocess_image_for_ocr(image_path: str, image_data: Optional[bytes] = None) -> Image.Image:
     """
     Convenience function for preprocessing
 
     Args:
         image_path: Path to image file
+        image_data: Already-loaded image bytes (optional)
 
     Returns:
         PIL.Image: Preprocessed image
     """
     preprocessor = OCRPreprocessor()
-    return preprocessor.preprocess_image_for_ocr(image_path)
+    return preprocessor.preprocess_image_for_ocr(image_path, image_data)
 
 
 def extract_main_text_region(image: Image.Image) -> Image.Image:
@@ -258,7 +284,8 @@ def remove_headers_footers(ocr_data: dict, image_height: int,
 def enhanced_ocr_with_preprocessing(image_path: str, lang: str = 'jpn+eng',
                                    enable_header_footer_removal: bool = True,
                                    top_margin: float = 0.08,
-                                   bottom_margin: float = 0.08) -> Tuple[str, float]:
+                                   bottom_margin: float = 0.08,
+                                   image_data: Optional[bytes] = None) -> Tuple[str, float]:
     """
     Complete OCR pipeline with preprocessing
 
@@ -276,6 +303,7 @@ def enhanced_ocr_with_preprocessing(image_path: str, lang: str = 'jpn+eng',
         enable_header_footer_removal: Enable header/footer filtering (default: True)
         top_margin: Top margin percentage to exclude (header area, default: 0.08 = 8%)
         bottom_margin: Bottom margin percentage to exclude (footer area, default: 0.08 = 8%)
+        image_data: Already-loaded image bytes; avoids re-reading image_path (optional)
 
     Returns:
         Tuple[str, float]: (extracted_text, confidence_score)
@@ -292,8 +320,9 @@ def enhanced_ocr_with_preprocessing(image_path: str, lang: str = 'jpn+eng',
 
     try:
         # Step 1: Preprocess image
-        preprocessed_img = preprocess_image_for_ocr(image_path)
-        height = preprocessed_img.size[1]
+        # (kept as a NumPy array; pytesseract accepts it directly)
+        preprocessed_img = OCRPreprocessor.preprocess_image_to_array(image_path, image_data)
+        height = preprocessed_img.shape[0]
 
         # Step 2: Run OCR with optimized configuration
         custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
@@ -0,0 +1,61 @@
+"""
+Feedback Cursor Pagination Unit Tests
+
+キーセットページネーション用カーソルのエンコード・デコードと、
+不正なカーソルが400になることのテスト（DBは使用しない）
+"""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.api.v1.endpoints.feedback import list_feedbacks
+from app.services.feedback_service import FeedbackService
+
+
+@pytest.mark.parametrize("created_at,feedback_id", [
+    (datetime(2024, 1, 2, 3, 4, 5), 1),
+    (datetime(2024, 1, 2, 3, 4, 5, 123456), 987654321),          # マイクロ秒
+    (datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc), 42),  # タイムゾーン付き
+])
+def test_cursor_round_trip(created_at, feedback_id):
+    """エンコードしたカーソルをデコードすると同じ (created_at, id) に戻る"""
+    row = SimpleNamespace(created_at=created_at, id=feedback_id)
+    cursor = FeedbackService._encode_cursor(row)
+
+    assert FeedbackService._decode_cursor(cursor) == (created_at, feedback_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "abc",
+    "2024-01-02T03:04:05",
+    "2024-01-02T03:04:05_x",
+    "not-a-date_12",
+    None,
+])
+def test_decode_cursor_rejects_malformed(cursor):
+    """不正なカーソルは ValueError"""
+    with pytest.raises(ValueError):
+        FeedbackService._decode_cursor(cursor)
+
+
+def test_list_feedbacks_invalid_cursor_returns_400():
+    """不正なカーソルはエンドポイントで 400 Bad Request になる"""
+    service = FeedbackService(db=MagicMock())
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(list_feedbacks(
+            rating=None,
+            limit=10,
+            offset=0,
+            cursor="garbage",
+            current_user=SimpleNamespace(id=1),
+            service=service
+        ))
+
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Invalid cursor" in exc_info.value.detail
@@ -0,0 +1,177 @@
+"""
+Knowledge Batching / JSON Parsing Unit Tests
+
+複数チャンクのバッチ化、打ち切られたバッチ応答の回収、
+ストリーミングJSON配列の解析のテスト（LLM・DBは使用しない）
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.knowledge_service import (
+    KnowledgeService,
+    _iter_json_array_items,
+    _scan_json_array,
+)
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture(scope="module")
+def knowledge_service():
+    """ナレッジサービス（LLMは使用しない）"""
+    return KnowledgeService(llm_service=SimpleNamespace(is_mock=True))
+
+
+def _stream(text, size):
+    """テキストを size 文字ずつの差分として返す非同期イテレーター"""
+    async def deltas():
+        for i in range(0, len(text), size):
+            yield text[i:i + size]
+    return deltas()
+
+
+def _collect_stream(text, size):
+    async def collect():
+        return [item async for item in _iter_json_array_items(_stream(text, size))]
+    return asyncio.run(collect())
+
+
+# ==================== _batch_chunks ====================
+
+def test_batch_chunks_empty(knowledge_service):
+    """チャンクがなければバッチもない"""
+    assert knowledge_service._batch_chunks([]) == []
+
+
+def test_batch_chunks_fits_in_one_request(knowledge_service):
+    """予算内なら1バッチにまとめる"""
+    chunks = ["a" * 10, "b" * 10, "c" * 10]
+    assert knowledge_service._batch_chunks(
+        chunks, context_limit=100, sys_tokens=10, resp_tokens=10
+    ) == [chunks]
+
+
+def test_batch_chunks_splits_on_token_budget(knowledge_service):
+    """予算を超える手前で次のバッチに移り、順序を保つ"""
+    chunks = ["a" * 30, "b" * 30, "c" * 30, "d" * 30, "e" * 30]
+    batches = knowledge_service._batch_chunks(
+        chunks, context_limit=80, sys_tokens=10, resp_tokens=10
+    )
+
+    assert batches == [chunks[0:2], chunks[2:4], chunks[4:5]]
+    assert all(sum(map(len, batch)) <= 60 for batch in batches)
+
+
+def test_batch_chunks_respects_max_chunks(knowledge_service):
+    """出力上限による1バッチあたりのチャンク数を超えない"""
+    chunks = [str(i) for i in range(7)]
+    batches = knowledge_service._batch_chunks(chunks, max_chunks=3)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [chunk for batch in batches for chunk in batch] == chunks
+
+
+def test_batch_chunks_oversized_chunk_gets_own_batch(knowledge_service):
+    """予算より大きいチャンクも落とさず単独のバッチにする"""
+    chunks = ["a" * 5, "b" * 500, "c" * 5]
+    batches = knowledge_service._batch_chunks(
+        chunks, context_limit=100, sys_tokens=10, resp_tokens=10
+    )
+
+    assert batches == [[chunks[0]], [chunks[1]], [chunks[2]]]
+
+
+# ==================== _missing_batch_chunks ====================
+
+BATCH = ["chunk1", "chunk2", "chunk3", "chunk4"]
+
+
+@pytest.mark.parametrize("items,expected", [
+    ([], BATCH),
+    ([{"chunk_id": 1}, {"chunk_id": 2}, {"chunk_id": 3}, {"chunk_id": 4}], []),
+    ([{"chunk_id": 1}, {"chunk_id": 3}], ["chunk2", "chunk4"]),   # chunk_id で判定
+    ([{"chunk_id": "2"}], ["chunk1", "chunk3", "chunk4"]),          # 文字列の chunk_id
+    ([{"concepts": []}, {"concepts": []}], ["chunk3", "chunk4"]),   # chunk_id なしは先頭から
+    ([{"chunk_id": "x"}, "not a dict"], ["chunk3", "chunk4"]),      # 不正な値は位置で判定
+])
+def test_missing_batch_chunks(knowledge_service, items, expected):
+    """打ち切られた応答に結果がないチャンクだけを返す"""
+    assert knowledge_service._missing_batch_chunks(BATCH, items) == expected
+
+
+# ==================== _scan_json_array ====================
+
+def test_scan_json_array_complete():
+    """閉じた配列は全要素と ']' の直後の位置を返す"""
+    text = '[{"a": 1}, {"b": [1, 2]}] trailing'
+    items, pos, closed = _scan_json_array(text, 1)
+
+    assert items == [{"a": 1}, {"b": [1, 2]}]
+    assert closed
+    assert text[pos:] == " trailing"
+
+
+def test_scan_json_array_truncated():
+    """打ち切られた要素の手前で止まり、完結した要素は回収する"""
+    text = '[{"a": 1}, {"b": "cut'
+    items, pos, closed = _scan_json_array(text, 1)
+
+    assert items == [{"a": 1}]
+    assert not closed
+    assert text[pos:] == '{"b": "cut'
+
+
+def test_scan_json_array_bracket_inside_string():
+    """文字列中の ']' で配列の終端と誤認しない"""
+    items, _, closed = _scan_json_array('[{"t": "x]y"}, {"u": "]"}]', 1)
+
+    assert items == [{"t": "x]y"}, {"u": "]"}]
+    assert closed
+
+
+def test_scan_json_array_empty():
+    """空配列"""
+    assert _scan_json_array("[]", 1) == ([], 2, True)
+
+
+# ==================== _iter_json_array_items ====================
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_iter_json_array_items_stops_at_closing_bracket(size):
+    """配列の後ろの説明文やJSONは要素として返さない"""
+    text = '```json\n[{"name": "A"}, {"name": "B"}]\n```\nAlso: {"name": "C"} [{"name": "D"}]'
+    assert _collect_stream(text, size) == [{"name": "A"}, {"name": "B"}]
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_iter_json_array_items_skips_bracketed_preamble(size):
+    """前置きの文章中の括弧を配列の開始と誤認しない"""
+    text = 'Entities [see below]:\n[{"name": "a"}, {"name": "b"}]'
+    assert _collect_stream(text, size) == [{"name": "a"}, {"name": "b"}]
+
+
+def test_iter_json_array_items_truncated():
+    """打ち切られたストリームからも完結した要素は返す"""
+    assert _collect_stream('[{"name": "A"}, {"name": "B', 4) == [{"name": "A"}]
+
+
+def test_iter_json_array_items_no_array():
+    """配列がなければ何も返さない"""
+    assert _collect_stream("No entities found.", 5) == []
+
+
+# ==================== _parse_knowledge_items ====================
+
+def test_parse_knowledge_items_skips_non_list_values(knowledge_service):
+    """リストでないカテゴリ値はそのチャンク分だけ捨て、他のチャンクの結果は残す"""
+    parsed = knowledge_service._parse_knowledge_items([
+        {"main_topics": "AI", "facts": 5, "concepts": [{"name": "x", "definition": "d"}]},
+        {"main_topics": ["ML", {"bad": 1}], "concepts": [{"name": "y", "definition": "e"}]},
+        "not a dict",
+    ], "ja")
+
+    assert parsed["main_topics"] == ["ML"]
+    assert [concept.name for concept in parsed["concepts"]] == ["x", "y"]
+    assert parsed["facts"] == []
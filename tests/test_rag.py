@@ -110,6 +110,21 @@ def test_generate_batch_embeddings(embedding_service):
     logger.info(f"Generated {len(embeddings)} embeddings")
 
 
+def test_generate_batch_embeddings_preserves_order(embedding_service):
+    """キャッシュヒット・空文字・新規が混在しても入力順で返るテスト"""
+    cached_text = "キャッシュ済みのテキストです。"
+    cached_embedding = embedding_service.generate_embedding(cached_text)
+
+    texts = ["新しいテキストA", cached_text, "", "新しいテキストB"]
+    embeddings = embedding_service.generate_embeddings(texts)
+
+    assert len(embeddings) == len(texts)
+    assert embeddings[1] == cached_embedding
+    assert embeddings[2] == [0.0] * embedding_service.embedding_dim
+    assert embeddings[0] == embedding_service.generate_embedding(texts[0])
+    assert embeddings[3] == embedding_service.generate_embedding(texts[3])
+
+
 def test_embedding_similarity(embedding_service):
     """Embedding類似度計算テスト"""
     text1 = "Python is a programming language."
@@ -0,0 +1,246 @@
+"""
+Text Chunking / Cleaning Unit Tests
+
+チャンク分割・テキストクリーニングの最適化版が元の実装と同じ結果を返すかのテスト
+（比較用に元の実装をこのファイル内に残している）
+"""
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.v1.endpoints.rag import _chunk_text as rag_chunk_text
+from app.services.business_rag_service import BusinessRAGService
+from app.services.capture_service import CaptureService, _CJK_TABLE
+from app.services.knowledge_service import KnowledgeService
+
+
+# ==================== Reference Implementations ====================
+
+def _legacy_split_into_chunks(text, max_length, overlap):
+    """KnowledgeService._split_into_chunks の元の実装（3回のrfind）"""
+    if len(text) <= max_length:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + max_length
+        chunk = text[start:end]
+        if end < len(text):
+            last_period = max(chunk.rfind('。'), chunk.rfind('.'), chunk.rfind('\n'))
+            if last_period > max_length // 2:
+                chunk = chunk[:last_period + 1]
+                end = start + last_period + 1
+        chunks.append(chunk)
+        start = end - overlap
+    return chunks
+
+
+def _legacy_business_chunk_text(text, chunk_size, chunk_overlap):
+    """BusinessRAGService._chunk_text の元の実装（区切り文字ごとのrfind）"""
+    if not text or len(text) <= chunk_size:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            for delim in ["。", ".", "！", "!", "？", "?", "\n\n"]:
+                last_delim = text.rfind(delim, start, end)
+                if last_delim > start:
+                    end = last_delim + 1
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - chunk_overlap if end < len(text) else end
+    return chunks
+
+
+def _legacy_rag_chunk_text(text, chunk_size, overlap):
+    """rag._chunk_text の元の実装（チャンクごとのrfind）"""
+    if not text:
+        return []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunk = text[start:end]
+        if end < len(text):
+            last_space = chunk.rfind(" ")
+            if last_space > chunk_size // 2:
+                chunk = chunk[:last_space]
+                end = start + last_space
+        chunks.append(chunk.strip())
+        start = end - overlap
+    return chunks
+
+
+def _legacy_clean_extracted_text(text):
+    """CaptureService._clean_extracted_text の元の実装（行ごとに個別の正規表現）"""
+    if not text:
+        return ""
+
+    cleaned_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if re.match(r'^Page\s+\d+$', line, re.IGNORECASE):
+            continue
+        if re.match(r'^ページ\s*\d+$', line):
+            continue
+        if re.match(r'^\d+$', line) and len(line) <= 4:
+            continue
+        if len(line) < 2 and line.translate(_CJK_TABLE) == line:
+            continue
+        cleaned_lines.append(line)
+
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(cleaned_lines)).strip()
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture(scope="module")
+def knowledge_service():
+    """ナレッジサービス（LLMは使用しない）"""
+    return KnowledgeService(llm_service=SimpleNamespace(is_mock=True))
+
+
+def _business_chunk_text(text, chunk_size, chunk_overlap):
+    service = BusinessRAGService(
+        db=None, chunk_size=chunk_size, chunk_overlap=chunk_overlap, mock_mode=True
+    )
+    return service._chunk_text(text)
+
+
+def _assert_chunks_cover(text, chunks):
+    """各チャンクが元テキストの一部で、先頭から末尾までを覆っている"""
+    assert chunks
+    assert all(chunk in text for chunk in chunks)
+    assert text.strip().startswith(chunks[0].strip())
+    assert text.strip().endswith(chunks[-1].strip())
+
+
+# ==================== Test Inputs ====================
+
+SENTENCES_JA = "これは最初の文です。次の文が続きます。\n改行の後の文。最後の文です。"
+SENTENCES_EN = "One. Two! Three? Four. Five! Six? " * 4
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu"
+
+# (テキスト, チャンクサイズ, オーバーラップ)
+CHUNK_CASES = [
+    ("", 10, 2),
+    ("短い", 10, 2),
+    ("x" * 25, 10, 2),                        # 区切りなし
+    ("y" * 30, 10, 0),                        # 区切りなし・オーバーラップなし
+    (SENTENCES_JA, 12, 3),
+    (SENTENCES_JA, 20, 5),
+    (SENTENCES_EN, 30, 5),
+    ("abcde." * 6, 12, 2),                    # 区切りで終わる
+    ("一二三四五。六七八九十。" * 3, 12, 3),  # チャンク境界と区切りが一致
+    ("段落1\n\n段落2\n\n\n段落3" * 3, 15, 4),  # 連続改行
+    (WORDS, 20, 4),
+    (WORDS + " ", 16, 3),                     # 空白で終わる
+]
+
+# 元の実装が前に進まない（無限ループする）オーバーラップ設定
+OVERLAP_AT_LEAST_LENGTH_CASES = [
+    ("x" * 25, 10, 10),
+    ("x" * 25, 10, 15),
+    (SENTENCES_JA, 12, 12),
+    (WORDS, 20, 30),
+]
+
+
+# ==================== KnowledgeService._split_into_chunks ====================
+
+@pytest.mark.parametrize("text,max_length,overlap", CHUNK_CASES)
+def test_split_into_chunks_matches_legacy(knowledge_service, text, max_length, overlap):
+    """元の実装と一致（元の実装が末尾に追加していた重複チャンクのみ除く）"""
+    chunks = knowledge_service._split_into_chunks(text, max_length=max_length, overlap=overlap)
+    legacy = _legacy_split_into_chunks(text, max_length, overlap)
+
+    assert chunks == legacy[:len(chunks)]
+    # 残りは最後のチャンクに含まれるオーバーラップ部分のみ
+    assert all(chunks[-1].endswith(extra) for extra in legacy[len(chunks):])
+
+
+@pytest.mark.parametrize("text,max_length,overlap", OVERLAP_AT_LEAST_LENGTH_CASES)
+def test_split_into_chunks_overlap_at_least_length_terminates(
+    knowledge_service, text, max_length, overlap
+):
+    """オーバーラップがチャンク長以上でも終了し、全体を覆う"""
+    chunks = knowledge_service._split_into_chunks(text, max_length=max_length, overlap=overlap)
+
+    _assert_chunks_cover(text, chunks)
+    assert all(len(chunk) <= max_length for chunk in chunks)
+
+
+def test_split_into_chunks_ends_on_boundary(knowledge_service):
+    """チャンクがテキスト末尾で終わる場合、オーバーラップだけの重複チャンクを追加しない"""
+    text = "a" * 10 + "b" * 8
+    chunks = knowledge_service._split_into_chunks(text, max_length=10, overlap=2)
+
+    assert chunks == ["a" * 10, "aa" + "b" * 8]
+    assert _legacy_split_into_chunks(text, 10, 2) == chunks + ["bb"]
+
+
+# ==================== BusinessRAGService._chunk_text ====================
+
+@pytest.mark.parametrize("text,chunk_size,overlap", CHUNK_CASES)
+def test_business_chunk_text_matches_legacy(text, chunk_size, overlap):
+    """元の実装と一致"""
+    assert _business_chunk_text(text, chunk_size, overlap) == \
+        _legacy_business_chunk_text(text, chunk_size, overlap)
+
+
+@pytest.mark.parametrize("text,chunk_size,overlap", OVERLAP_AT_LEAST_LENGTH_CASES)
+def test_business_chunk_text_overlap_at_least_length_terminates(text, chunk_size, overlap):
+    """オーバーラップがチャンク長以上でも終了し、全体を覆う"""
+    _assert_chunks_cover(text, _business_chunk_text(text, chunk_size, overlap))
+
+
+def test_business_chunk_text_short_chunk_before_overlap_terminates():
+    """区切りで短く切ったチャンクがオーバーラップより短くても終了する"""
+    text = "a." + "b" * 40
+    chunks = _business_chunk_text(text, chunk_size=10, chunk_overlap=5)
+
+    assert chunks[0] == "a."
+    _assert_chunks_cover(text, chunks)
+
+
+# ==================== rag._chunk_text ====================
+
+@pytest.mark.parametrize("text,chunk_size,overlap", CHUNK_CASES)
+def test_rag_chunk_text_matches_legacy(text, chunk_size, overlap):
+    """元の実装と一致"""
+    assert rag_chunk_text(text, chunk_size, overlap) == \
+        _legacy_rag_chunk_text(text, chunk_size, overlap)
+
+
+@pytest.mark.parametrize("text,chunk_size,overlap", OVERLAP_AT_LEAST_LENGTH_CASES)
+def test_rag_chunk_text_overlap_at_least_length_terminates(text, chunk_size, overlap):
+    """オーバーラップがチャンク長以上でも終了し、全体を覆う"""
+    _assert_chunks_cover(text, rag_chunk_text(text, chunk_size, overlap))
+
+
+# ==================== CaptureService._clean_extracted_text ====================
+
+@pytest.mark.parametrize("text", [
+    "",
+    "\n\n\n",
+    "本文のみ",
+    "Page 12\n本文\npage  3\nPAGE 4",
+    "ページ5\nページ 6\n本文\n1234\n12345",
+    "a\nあ\n漢\nx\n.\n本文",
+    "  前後の空白  \n\t\n\n\n\n次の段落  ",
+    "Page\nページ\nPage 1a\n٣\n１２",
+    "末尾が改行\n\n",
+])
+def test_clean_extracted_text_matches_legacy(text):
+    """元の実装と一致"""
+    assert CaptureService._clean_extracted_text(text) == _legacy_clean_extracted_text(text)